@@ -11,8 +11,10 @@ from fastapi import APIRouter, HTTPException, status
 from ai.api.schemas import (
     ICRAPredictRequest,
     ICRAPredictResponse,
+    ICRAPredictBatchRequest,
+    ICRAPredictBatchResponse,
 )
-from ai.api.services.icra_service import predict_icra
+from ai.api.services.icra_service import predict_icra, predict_icra_batch
 
 
 # =====================================================
@@ -77,3 +79,44 @@ def predict_icra_endpoint(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno ao processar a predição ICRA.",
         )
+
+
+@router.post(
+    "/predict/batch",
+    response_model=ICRAPredictBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Predição de risco de alagamento (ICRA) em lote",
+    description=(
+        "Executa a inferência do modelo ICRA para vários vetores de features "
+        "em uma única chamada ao modelo. Os resultados seguem a ordem dos itens."
+    ),
+)
+def predict_icra_batch_endpoint(
+    payload: ICRAPredictBatchRequest,
+) -> ICRAPredictBatchResponse:
+    """
+    Endpoint de predição do índice ICRA em lote.
+
+    - Erros de validação de features (ou lote acima do limite) retornam 422
+    - Erros internos retornam 500
+    """
+
+    try:
+        return predict_icra_batch(payload)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Erro de validação do payload de inferência em lote.",
+                "error": str(e),
+            },
+        )
+
+    except Exception as e:
+        logger.exception("Erro interno na predição ICRA em lote")
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao processar a predição ICRA em lote.",
+        )
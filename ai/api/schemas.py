@@ -121,6 +121,46 @@ class ICRAPredictResponse(BaseModel):
     )
 
 
+# ================================
+# LOTE (BATCH)
+# ================================
+
+class ICRAPredictBatchRequest(BaseModel):
+    """
+    Payload de entrada para predição de vários vetores de features em uma chamada.
+    """
+
+    itens: List[ICRAPredictRequest] = Field(
+        ...,
+        min_length=1,
+        description="Itens a serem preditos (mesmo formato de /icra/predict)"
+    )
+
+
+class ICRAPredictBatchItem(ICRAPredictResponse):
+    """
+    Resposta de um item do lote (mesma ordem da requisição).
+    """
+
+    ponto: Optional[str] = Field(
+        None,
+        description="Identificador do ponto crítico informado no item"
+    )
+
+
+class ICRAPredictBatchResponse(BaseModel):
+    """
+    Resposta da predição em lote.
+    """
+
+    total: int = Field(..., description="Quantidade de itens preditos")
+
+    resultados: List[ICRAPredictBatchItem] = Field(
+        ...,
+        description="Resultados na mesma ordem dos itens da requisição"
+    )
+
+
 # ================================
 # METADATA / HEALTHCHECK
 # ================================
@@ -5,6 +5,8 @@ Serviço responsável por executar inferência do modelo ICRA
 e construir a resposta de risco para a API.
 """
 
+from typing import List, Optional, Sequence, Tuple
+
 import numpy as np
 
 from ai.api.loaders.model_loader import (
@@ -19,8 +21,12 @@ from ai.api.utils.risk_utils import (
 from ai.api.schemas import (
     ICRAPredictRequest,
     ICRAPredictResponse,
+    ICRAPredictBatchRequest,
+    ICRAPredictBatchResponse,
+    ICRAPredictBatchItem,
     ICRADetails,
 )
+from ai.api.settings import settings
 
 
 # ================================
@@ -44,14 +50,81 @@ def predict_icra(payload: ICRAPredictRequest) -> ICRAPredictResponse:
     # MONTAR VETOR DE FEATURES (ORDEM GARANTIDA)
     # =====================================================
 
+    X = _montar_matriz_features([payload], features_esperadas)
+
+    # =====================================================
+    # PREDIÇÃO + INCERTEZA (SE DISPONÍVEL)
+    # =====================================================
+
+    preds, stds = _predizer_matriz(model, X)
+    icra_pred = float(preds[0])
+    icra_std = float(stds[0]) if stds is not None else None
+
+    # =====================================================
+    # RESPOSTA FINAL
+    # =====================================================
+
+    return _montar_resposta(payload, icra_pred, icra_std, thresholds)
+
+
+def predict_icra_batch(payload: ICRAPredictBatchRequest) -> ICRAPredictBatchResponse:
+    """
+    Executa a predição de vários itens em uma única chamada ao modelo:
+    a matriz (n_itens x n_features) passa uma vez pelo modelo e uma vez
+    por estimador (incerteza), em vez de uma chamada por item.
+    """
+
+    itens = payload.itens
+    if len(itens) > settings.MAX_BATCH_SIZE:
+        raise ValueError(
+            f"Lote com {len(itens)} itens excede o máximo de {settings.MAX_BATCH_SIZE}."
+        )
+
+    model = get_icra_model()
+    features_esperadas = get_icra_features()
+    thresholds = get_icra_thresholds()
+
+    X = _montar_matriz_features(itens, features_esperadas)
+    preds, stds = _predizer_matriz(model, X)
+
+    resultados: List[ICRAPredictBatchItem] = []
+    for i, item in enumerate(itens):
+        resposta = _montar_resposta(
+            item,
+            float(preds[i]),
+            float(stds[i]) if stds is not None else None,
+            thresholds,
+        )
+        resultados.append(
+            ICRAPredictBatchItem(**resposta.model_dump(), ponto=item.ponto)
+        )
+
+    return ICRAPredictBatchResponse(
+        total=len(resultados),
+        resultados=resultados,
+    )
+
+
+# ================================
+# AUXILIARES
+# ================================
+
+def _montar_matriz_features(
+    itens: Sequence[ICRAPredictRequest],
+    features_esperadas: Sequence[str],
+) -> np.ndarray:
+    """
+    Matriz (n_itens x n_features) na ordem esperada pelo modelo.
+    """
+
     try:
-        X = np.array(
+        return np.array(
             [
-                getattr(payload.features, feature)
-                for feature in features_esperadas
+                [getattr(item.features, feature) for feature in features_esperadas]
+                for item in itens
             ],
             dtype=float
-        ).reshape(1, -1)
+        ).reshape(len(itens), len(features_esperadas))
 
     except AttributeError as e:
         raise ValueError(
@@ -63,23 +136,31 @@ def predict_icra(payload: ICRAPredictRequest) -> ICRAPredictResponse:
             f"Erro ao montar vetor de features para inferência: {e}"
         )
 
-    # =====================================================
-    # PREDIÇÃO
-    # =====================================================
 
-    icra_pred = float(model.predict(X)[0])
+def _predizer_matriz(model, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Predição + desvio padrão entre estimadores (ensembles), linha a linha.
+    """
 
-    # =====================================================
-    # INCERTEZA (SE DISPONÍVEL)
-    # =====================================================
+    preds = np.asarray(model.predict(X), dtype=float).reshape(-1)
 
-    icra_std = None
+    stds = None
     if hasattr(model, "estimators_"):
-        preds = np.array(
-            [est.predict(X)[0] for est in model.estimators_],
+        por_estimador = np.array(
+            [est.predict(X) for est in model.estimators_],
             dtype=float
-        )
-        icra_std = float(preds.std())
+        ).reshape(len(model.estimators_), -1)
+        stds = por_estimador.std(axis=0)
+
+    return preds, stds
+
+
+def _montar_resposta(
+    payload: ICRAPredictRequest,
+    icra_pred: float,
+    icra_std: Optional[float],
+    thresholds,
+) -> ICRAPredictResponse:
 
     # =====================================================
     # CLASSIFICAÇÕES
@@ -104,10 +185,6 @@ def predict_icra(payload: ICRAPredictRequest) -> ICRAPredictResponse:
         chuva_90d=payload.features.precipitacao_ma_90d,
     )
 
-    # =====================================================
-    # RESPOSTA FINAL
-    # =====================================================
-
     return ICRAPredictResponse(
         data=payload.data,
         icra=round(icra_pred, 3),
@@ -54,6 +54,9 @@ class Settings:
     DEBUG: bool = False
     PORT: int = 8000
 
+    # Quantidade máxima de itens por requisição em /icra/predict/batch
+    MAX_BATCH_SIZE: int = 1000
+
     # -------------------------------
     # MODELO (IMUTÁVEL)
     # -------------------------------
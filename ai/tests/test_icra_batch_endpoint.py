@@ -0,0 +1,127 @@
+"""
+test_icra_batch_endpoint.py
+
+Endpoint /icra/predict/batch da API de IA:
+- cada item do lote recebe exatamente a resposta de /icra/predict
+- a ordem (e o `ponto`) dos itens é preservada
+- lotes acima de MAX_BATCH_SIZE são rejeitados com 422
+
+Este teste:
+- NÃO carrega os artefatos reais (modelo em ensemble falso, sem lifespan)
+- Usa apenas o router de ICRA em uma aplicação FastAPI mínima
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai.api.routes.icra import router
+from ai.api.schemas import ICRAFeatures
+from ai.api.services import icra_service
+from ai.api.settings import settings
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+N_ITEMS = 25
+TARGET_DATE = date(2026, 2, 17)
+FEATURES = list(ICRAFeatures.model_fields)
+THRESHOLDS = {"baixo_max": 0.25, "moderado_max": 0.5, "alto_max": 0.75}
+
+
+class _Estimator:
+    def __init__(self, weights: np.ndarray) -> None:
+        self.weights = weights
+
+    def predict(self, X):
+        return 1.0 / (1.0 + np.exp(-(np.asarray(X) @ self.weights)))
+
+
+class _Ensemble:
+    """Ensemble falso (média dos estimadores), como um RandomForestRegressor."""
+
+    def __init__(self, n_estimators: int = 5, seed: int = 7) -> None:
+        rng = np.random.default_rng(seed)
+        self.estimators_ = [_Estimator(rng.normal(0.0, 0.05, len(FEATURES))) for _ in range(n_estimators)]
+
+    def predict(self, X):
+        return np.mean([est.predict(X) for est in self.estimators_], axis=0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    model = _Ensemble()
+    monkeypatch.setattr(icra_service, "get_icra_model", lambda: model)
+    monkeypatch.setattr(icra_service, "get_icra_features", lambda: FEATURES)
+    monkeypatch.setattr(icra_service, "get_icra_thresholds", lambda: THRESHOLDS)
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def _items(n: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "data": TARGET_DATE.isoformat(),
+            "ponto": f"P{i:03d}",
+            "features": {name: float(v) for name, v in zip(FEATURES, rng.gamma(1.0, 10.0, len(FEATURES)))},
+        }
+        for i in range(n)
+    ]
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_batch_matches_single_predictions(client):
+    items = _items(N_ITEMS)
+
+    response = client.post("/icra/predict/batch", json={"itens": items})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["total"] == N_ITEMS
+    assert [r["ponto"] for r in body["resultados"]] == [item["ponto"] for item in items]
+
+    for item, result in zip(items, body["resultados"]):
+        single = client.post("/icra/predict", json=item)
+        assert single.status_code == 200
+
+        result = dict(result)
+        result.pop("ponto")
+        assert result == single.json()
+
+
+def test_batch_at_limit_is_accepted(client):
+    items = _items(settings.MAX_BATCH_SIZE)
+
+    response = client.post("/icra/predict/batch", json={"itens": items})
+
+    assert response.status_code == 200
+    assert response.json()["total"] == settings.MAX_BATCH_SIZE
+
+
+def test_batch_over_limit_is_rejected(client):
+    items = _items(settings.MAX_BATCH_SIZE + 1)
+
+    response = client.post("/icra/predict/batch", json={"itens": items})
+
+    assert response.status_code == 422
+    assert str(settings.MAX_BATCH_SIZE) in response.json()["detail"]["error"]
+
+
+def test_batch_with_missing_feature_is_rejected(client):
+    items = _items(3)
+    del items[1]["features"][FEATURES[0]]
+
+    response = client.post("/icra/predict/batch", json={"itens": items})
+
+    assert response.status_code == 422
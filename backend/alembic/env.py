@@ -8,6 +8,7 @@ from backend.app.models.point import Point
 from backend.app.models.risk_snapshot import RiskSnapshot
 from backend.app.models.municipality import Municipality
 from backend.app.models.risk_surface import RiskSurface
+from backend.app.models.municipality_grid_mask import MunicipalityGridMask
 from backend.app.database import Base
 from backend.app.settings import settings
 
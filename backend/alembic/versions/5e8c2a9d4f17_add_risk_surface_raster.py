@@ -0,0 +1,37 @@
+"""add risk_surfaces.raster and make geojson optional
+
+Revision ID: 5e8c2a9d4f17
+Revises: b3d1f0a7c2e4
+Create Date: 2026-10-17 10:03:21.774102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8c2a9d4f17'
+down_revision: Union[str, Sequence[str], None] = 'b3d1f0a7c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('risk_surfaces', sa.Column('raster', sa.LargeBinary(), nullable=True))
+    op.alter_column('risk_surfaces', 'geojson',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Superfícies somente-raster não têm GeoJSON legado; são descartadas (recalculadas no próximo ciclo).
+    op.execute("DELETE FROM risk_surfaces WHERE geojson IS NULL")
+    op.alter_column('risk_surfaces', 'geojson',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               nullable=False)
+    op.drop_column('risk_surfaces', 'raster')
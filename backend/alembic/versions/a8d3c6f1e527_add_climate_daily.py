@@ -0,0 +1,41 @@
+"""add climate_daily
+
+Revision ID: a8d3c6f1e527
+Revises: e2f5b8c1a094
+Create Date: 2026-10-17 16:05:12.604831
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3c6f1e527'
+down_revision: Union[str, Sequence[str], None] = 'e2f5b8c1a094'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('climate_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('precipitacao_total_mm', sa.Float(), nullable=False),
+    sa.Column('temperatura_media_2m_c', sa.Float(), nullable=False),
+    sa.Column('temperatura_aparente_media_2m_c', sa.Float(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('latitude', 'longitude', 'day', name='uq_climate_daily_location_day')
+    )
+    op.create_index('ix_climate_daily_location', 'climate_daily', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_climate_daily_location', table_name='climate_daily')
+    op.drop_table('climate_daily')
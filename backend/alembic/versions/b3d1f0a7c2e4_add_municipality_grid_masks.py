@@ -0,0 +1,49 @@
+"""add municipality_grid_masks
+
+Revision ID: b3d1f0a7c2e4
+Revises: 70865ee17315
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d1f0a7c2e4'
+down_revision: Union[str, Sequence[str], None] = '70865ee17315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('municipality_grid_masks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('municipality_id', sa.Integer(), nullable=False),
+    sa.Column('grid_resolution_m', sa.Integer(), nullable=False),
+    sa.Column('municipality_updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('min_lat', sa.Float(), nullable=False),
+    sa.Column('min_lon', sa.Float(), nullable=False),
+    sa.Column('max_lat', sa.Float(), nullable=False),
+    sa.Column('max_lon', sa.Float(), nullable=False),
+    sa.Column('step_lat', sa.Float(), nullable=False),
+    sa.Column('step_lon', sa.Float(), nullable=False),
+    sa.Column('n_rows', sa.Integer(), nullable=False),
+    sa.Column('n_cols', sa.Integer(), nullable=False),
+    sa.Column('mask', sa.LargeBinary(), nullable=False),
+    sa.Column('inside_cells', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['municipality_id'], ['municipalities.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('municipality_id', 'grid_resolution_m', 'municipality_updated_at', name='uq_municipality_grid_mask_key')
+    )
+    op.create_index(op.f('ix_municipality_grid_masks_municipality_id'), 'municipality_grid_masks', ['municipality_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_municipality_grid_masks_municipality_id'), table_name='municipality_grid_masks')
+    op.drop_table('municipality_grid_masks')
@@ -0,0 +1,28 @@
+"""add risk_surfaces.recomputed_cells
+
+Revision ID: c7a4e19b2d03
+Revises: 5e8c2a9d4f17
+Create Date: 2026-10-17 11:20:05.102934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a4e19b2d03'
+down_revision: Union[str, Sequence[str], None] = '5e8c2a9d4f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('risk_surfaces', sa.Column('recomputed_cells', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('risk_surfaces', 'recomputed_cells')
@@ -0,0 +1,28 @@
+"""add risk_surfaces.stats
+
+Revision ID: e2f5b8c1a094
+Revises: c7a4e19b2d03
+Create Date: 2026-10-17 13:42:51.417206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f5b8c1a094'
+down_revision: Union[str, Sequence[str], None] = 'c7a4e19b2d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('risk_surfaces', sa.Column('stats', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('risk_surfaces', 'stats')
@@ -16,8 +16,9 @@ Princípios:
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from shapely.geometry import Point as ShapelyPoint
 from shapely.geometry import shape
@@ -462,14 +463,25 @@ def aggregate_surface_against_municipality(
     snapshot_timestamp_iso: str,
     threshold_high_risk: float = 0.70,
     icra_property: str = "icra",
+    cells_within_polygon: bool = False,
 ) -> AggregatedSpatialData:
+    """
+    cells_within_polygon=True indica que as células da superfície foram geradas
+    a partir da máscara de grid persistida do município (todas já estão dentro do
+    polígono), dispensando o teste ponto-no-polígono por célula.
+    """
     thr = float(threshold_high_risk)
     if not (0.0 <= thr <= 1.0):
         raise SpatialOpsError("threshold_high_risk deve estar entre 0 e 1.")
 
     muni_geom = municipality_geojson_to_geometry(municipality_geojson)
     cells = surface_geojson_to_cells(surface_geojson, icra_property=icra_property)
-    inside_cells = filter_cells_by_centroid_within_polygon(cells, muni_geom)
+    if cells_within_polygon:
+        inside_cells = cells
+        method = "grid_mask"
+    else:
+        inside_cells = filter_cells_by_centroid_within_polygon(cells, muni_geom)
+        method = "centroid_within_polygon"
 
     utm_crs = detect_utm_crs_for_geometry_wgs84(muni_geom)
     transformer = build_transformer_wgs84_to(utm_crs)
@@ -503,7 +515,7 @@ def aggregate_surface_against_municipality(
         "grid_used_cells": int(used_cells),
         "grid_high_risk_cells": int(high_cells),
         "threshold_high_risk": float(thr),
-        "method": "centroid_within_polygon",
+        "method": method,
     }
     meta.update(_extract_surface_meta(surface_geojson))
 
@@ -518,6 +530,75 @@ def aggregate_surface_against_municipality(
         icra_values=icra_values,
         cell_area_m2=cell_area_m2,
         threshold_high_risk=float(thr),
-        method="centroid_within_polygon",
+        method=method,
         metadata=meta,  
     )
+
+
+def aggregate_surface_stats_against_municipality(
+    *,
+    municipality_id: int,
+    municipality_geojson: Dict[str, Any],
+    icra_sorted: Sequence[float],
+    cell_areas_m2: Sequence[float],
+    snapshot_timestamp_iso: str,
+    grid_resolution_m: Optional[int] = None,
+    threshold_high_risk: float = 0.70,
+) -> AggregatedSpatialData:
+    """
+    Mesmo agregado de `aggregate_surface_against_municipality(cells_within_polygon=True)`,
+    a partir das estatísticas persistidas na geração da superfície
+    (ICRA por célula em ordem crescente + área de cada célula na mesma ordem),
+    sem materializar o GeoJSON nem projetar célula a célula.
+    """
+    thr = float(threshold_high_risk)
+    if not (0.0 <= thr <= 1.0):
+        raise SpatialOpsError("threshold_high_risk deve estar entre 0 e 1.")
+
+    if len(icra_sorted) != len(cell_areas_m2):
+        raise SpatialOpsError("icra_sorted e cell_areas_m2 devem ter o mesmo tamanho.")
+
+    muni_geom = municipality_geojson_to_geometry(municipality_geojson)
+    utm_crs = detect_utm_crs_for_geometry_wgs84(muni_geom)
+    transformer = build_transformer_wgs84_to(utm_crs)
+
+    total_area_m2 = compute_area_m2_of_geometry(muni_geom, transformer)
+
+    icra_values = [float(v) for v in icra_sorted]
+    areas = [float(a) for a in cell_areas_m2]
+
+    first_high = bisect_left(icra_values, thr)
+    used_cells = len(icra_values)
+    high_cells = used_cells - first_high
+    high_area_m2 = float(sum(a for a in areas[first_high:] if a > 0))
+
+    positive_areas = [a for a in areas if a > 0]
+    cell_area_m2 = _median(positive_areas) if positive_areas else None
+
+    method = "surface_stats"
+    meta: Dict[str, object] = {
+        "municipality_id": int(municipality_id),
+        "snapshot_timestamp": str(snapshot_timestamp_iso),
+        "grid_total_cells": int(used_cells),
+        "grid_used_cells": int(used_cells),
+        "grid_high_risk_cells": int(high_cells),
+        "threshold_high_risk": float(thr),
+        "method": method,
+    }
+    if grid_resolution_m is not None:
+        meta["grid_resolution_m"] = int(grid_resolution_m)
+
+    return AggregatedSpatialData(
+        municipality_id=int(municipality_id),
+        snapshot_timestamp_iso=str(snapshot_timestamp_iso),
+        total_area_m2=float(total_area_m2 or 0.0),
+        high_risk_area_m2=float(high_area_m2 or 0.0),
+        total_cells=int(used_cells),
+        used_cells=int(used_cells),
+        high_risk_cells=int(high_cells),
+        icra_values=icra_values,
+        cell_area_m2=cell_area_m2,
+        threshold_high_risk=float(thr),
+        method=method,
+        metadata=meta,
+    )
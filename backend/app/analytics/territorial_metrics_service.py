@@ -5,7 +5,8 @@ Serviço de Inteligência Territorial (Analytics) do ClimaGyn.
 
 Responsabilidade:
 - Orquestrar leitura de Municipality + RiskSurface (já calculada/persistida)
-- Agregar superfície dentro do polígono municipal (via SpatialOps)
+- Agregar superfície dentro do polígono municipal (via SpatialOps), a partir das
+  estatísticas persistidas na geração quando disponíveis (sem reprocessar o GeoJSON)
 - Calcular métricas estratégicas (via MetricsCore)
 - Retornar envelope compatível com Schemas (schemas/territorial_metrics.py)
 - Compatível com rotas (routes/analytics.py)
@@ -32,11 +33,16 @@ from backend.app.analytics.metrics_core import (
     CompositeMode,
 )
 from backend.app.analytics.spatial_ops import (
+    AggregatedSpatialData,
     aggregate_surface_against_municipality,
+    aggregate_surface_stats_against_municipality,
 )
 
+from backend.app.repositories.grid_mask_repository import GridMaskRepository
 from backend.app.repositories.municipality_repository import MunicipalityRepository
 from backend.app.repositories.risk_surface_repository import RiskSurfaceRepository
+from backend.app.services.surface_raster import materialize_surface_geojson
+from backend.app.services.surface_stats import SurfaceStats, SurfaceStatsError
 
 
 # ============================================================
@@ -95,6 +101,8 @@ class TerritorialMetricsService:
         self.db = db
         self.municipalities = MunicipalityRepository(db)
         self.surfaces = RiskSurfaceRepository(db)
+        self.grid_masks = GridMaskRepository(db)
+        self._inside_cells_by_mask_key: Dict[Any, Optional[int]] = {}
 
         default_thr = float(getattr(settings.RISK, "HIGH_RISK_THRESHOLD", 0.70))
         self.high_risk_threshold = float(high_risk_threshold) if high_risk_threshold is not None else default_thr
@@ -200,13 +208,7 @@ class TerritorialMetricsService:
         Constrói envelope final compatível com:
         - TerritorialMetricsResponseSchema
         """
-        aggregated = aggregate_surface_against_municipality(
-            municipality_id=municipality.id,
-            municipality_geojson=municipality.geojson,
-            surface_geojson=surface.geojson,
-            snapshot_timestamp_iso=surface.snapshot_timestamp.isoformat(),
-            threshold_high_risk=self.high_risk_threshold,
-        )
+        aggregated = self._aggregate_surface(municipality, surface)
 
         calculator = TerritorialMetricsCalculator(
             thresholds=TerritorialThresholds(high_risk_threshold=self.high_risk_threshold),
@@ -234,6 +236,67 @@ class TerritorialMetricsService:
             "territorial_metrics": terr,
         }
 
+    def _aggregate_surface(self, municipality: Any, surface: Any) -> AggregatedSpatialData:
+        """
+        Caminho rápido: estatísticas persistidas (superfícies geradas pela máscara vigente).
+        Fallback: GeoJSON materializado + agregação célula a célula.
+        """
+        cells_within_polygon = self._surface_matches_grid_mask(municipality, surface)
+
+        stats = self._load_surface_stats(surface) if cells_within_polygon else None
+        if stats is not None:
+            return aggregate_surface_stats_against_municipality(
+                municipality_id=municipality.id,
+                municipality_geojson=municipality.geojson,
+                icra_sorted=stats.icra_sorted.tolist(),
+                cell_areas_m2=stats.cell_area_m2.tolist(),
+                snapshot_timestamp_iso=surface.snapshot_timestamp.isoformat(),
+                grid_resolution_m=surface.grid_resolution_m,
+                threshold_high_risk=self.high_risk_threshold,
+            )
+
+        return aggregate_surface_against_municipality(
+            municipality_id=municipality.id,
+            municipality_geojson=municipality.geojson,
+            surface_geojson=materialize_surface_geojson(surface.geojson, surface.raster),
+            snapshot_timestamp_iso=surface.snapshot_timestamp.isoformat(),
+            threshold_high_risk=self.high_risk_threshold,
+            cells_within_polygon=cells_within_polygon,
+        )
+
+    @staticmethod
+    def _load_surface_stats(surface: Any) -> Optional[SurfaceStats]:
+        payload = getattr(surface, "stats", None)
+        if payload is None:
+            return None
+        try:
+            stats = SurfaceStats.decode(payload)
+        except SurfaceStatsError:
+            return None
+        if surface.total_cells is not None and stats.total_cells != int(surface.total_cells):
+            return None
+        return stats
+
+    def _surface_matches_grid_mask(self, municipality: Any, surface: Any) -> bool:
+        """
+        True se a superfície foi gerada a partir da máscara de grid vigente do município
+        (mesma resolução, mesma versão do polígono e mesma quantidade de células).
+        """
+        if municipality.updated_at is None or surface.grid_resolution_m is None:
+            return False
+
+        key = (int(municipality.id), int(surface.grid_resolution_m), municipality.updated_at)
+        if key not in self._inside_cells_by_mask_key:
+            mask = self.grid_masks.get_mask(
+                municipality_id=key[0],
+                grid_resolution_m=key[1],
+                municipality_updated_at=key[2],
+            )
+            self._inside_cells_by_mask_key[key] = int(mask.inside_cells) if mask is not None else None
+
+        inside_cells = self._inside_cells_by_mask_key[key]
+        return inside_cells is not None and inside_cells == surface.total_cells
+
     def _build_surface_summary(
         self,
         *,
@@ -2,10 +2,14 @@ from .point import Point
 from .risk_snapshot import RiskSnapshot
 from .municipality import Municipality
 from .risk_surface import RiskSurface
+from .municipality_grid_mask import MunicipalityGridMask
+from .climate_daily import ClimateDaily
 
 __all__ = [
     "Point",
     "Municipality",
     "RiskSurface",
+    "MunicipalityGridMask",
+    "ClimateDaily",
     "RiskSnapshot",
 ]
\ No newline at end of file
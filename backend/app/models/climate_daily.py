@@ -0,0 +1,108 @@
+"""
+models/climate_daily.py
+
+Modelo responsável por armazenar dias climáticos já consolidados
+por localização (cache persistente da série diária da Open-Meteo).
+
+Objetivo no produto:
+- Evitar baixar novamente os ~90 dias de histórico a cada ciclo
+- Buscar no provedor apenas a cauda ainda não consolidada
+
+Notas arquiteturais:
+- Este arquivo contém APENAS persistência (ORM), sem regras de consolidação.
+- Chave lógica: (latitude, longitude, day), com coordenadas arredondadas
+  pelo store (services/climate_store.py).
+- Apenas dias consolidados (completos e mais antigos que CLIMATE_FINAL_LAG_DAYS,
+  ver services/climate_store.py) são gravados.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    UniqueConstraint,
+)
+
+from backend.app.database import Base
+
+
+class ClimateDaily(Base):
+    """
+    Registro diário normalizado de uma localização.
+    """
+
+    __tablename__ = "climate_daily"
+
+    # =====================================================
+    # IDENTIFICAÇÃO
+    # =====================================================
+
+    id = Column(Integer, primary_key=True)
+
+    latitude = Column(
+        Float,
+        nullable=False,
+        doc="Latitude arredondada da localização consultada",
+    )
+
+    longitude = Column(
+        Float,
+        nullable=False,
+        doc="Longitude arredondada da localização consultada",
+    )
+
+    day = Column(
+        Date,
+        nullable=False,
+        doc="Dia (UTC) do registro",
+    )
+
+    # =====================================================
+    # VARIÁVEIS CLIMÁTICAS
+    # =====================================================
+
+    precipitacao_total_mm = Column(Float, nullable=False)
+    temperatura_media_2m_c = Column(Float, nullable=False)
+    temperatura_aparente_media_2m_c = Column(Float, nullable=False)
+
+    fetched_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        doc="Momento em que o dia foi obtido do provedor",
+    )
+
+    # =====================================================
+    # CONSTRAINTS
+    # =====================================================
+
+    __table_args__ = (
+        UniqueConstraint(
+            "latitude",
+            "longitude",
+            "day",
+            name="uq_climate_daily_location_day",
+        ),
+        Index("ix_climate_daily_location", "latitude", "longitude"),
+    )
+
+    # =====================================================
+    # REPRESENTAÇÃO
+    # =====================================================
+
+    def __repr__(self) -> str:
+        return (
+            f"<ClimateDaily("
+            f"lat={self.latitude}, "
+            f"lon={self.longitude}, "
+            f"day={self.day}, "
+            f"precip={self.precipitacao_total_mm}"
+            f")>"
+        )
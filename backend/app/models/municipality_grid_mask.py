@@ -0,0 +1,130 @@
+"""
+models/municipality_grid_mask.py
+
+Modelo responsável por armazenar a máscara dentro/fora do grid regular
+de um município em uma resolução específica.
+
+Objetivo no produto:
+- Evitar refazer o teste ponto-no-polígono a cada geração de superfície
+- Compartilhar o mesmo conjunto de células entre motor de superfície e analytics
+
+Notas arquiteturais:
+- Este arquivo contém APENAS persistência (ORM), sem cálculos espaciais.
+- A máscara é um bitset (np.packbits) em ordem row-major (n_rows x n_cols).
+- Chave lógica: (municipality_id, grid_resolution_m, municipality_updated_at).
+  Alterar o polígono do município (updated_at) invalida a máscara automaticamente.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    DateTime,
+    Float,
+    ForeignKey,
+    LargeBinary,
+    UniqueConstraint,
+)
+
+from backend.app.database import Base
+
+
+class MunicipalityGridMask(Base):
+    """
+    Máscara de células do grid contidas no polígono do município.
+    """
+
+    __tablename__ = "municipality_grid_masks"
+
+    # =====================================================
+    # IDENTIFICAÇÃO
+    # =====================================================
+
+    id = Column(Integer, primary_key=True)
+
+    municipality_id = Column(
+        Integer,
+        ForeignKey("municipalities.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        doc="Município ao qual esta máscara pertence",
+    )
+
+    grid_resolution_m = Column(
+        Integer,
+        nullable=False,
+        doc="Resolução espacial do grid (metros)",
+    )
+
+    municipality_updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Municipality.updated_at usado no cálculo (versão do polígono)",
+    )
+
+    # =====================================================
+    # GEOMETRIA DO GRID
+    # =====================================================
+
+    min_lat = Column(Float, nullable=False)
+    min_lon = Column(Float, nullable=False)
+    max_lat = Column(Float, nullable=False)
+    max_lon = Column(Float, nullable=False)
+    step_lat = Column(Float, nullable=False, doc="Passo do grid em graus de latitude")
+    step_lon = Column(Float, nullable=False, doc="Passo do grid em graus de longitude")
+
+    n_rows = Column(Integer, nullable=False)
+    n_cols = Column(Integer, nullable=False)
+
+    # =====================================================
+    # MÁSCARA
+    # =====================================================
+
+    mask = Column(
+        LargeBinary,
+        nullable=False,
+        doc="Bitset (np.packbits) row-major: 1 = centro da célula dentro do polígono",
+    )
+
+    inside_cells = Column(
+        Integer,
+        nullable=False,
+        doc="Quantidade de células dentro do polígono",
+    )
+
+    computed_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        doc="Momento real do cálculo",
+    )
+
+    # =====================================================
+    # CONSTRAINTS
+    # =====================================================
+
+    __table_args__ = (
+        UniqueConstraint(
+            "municipality_id",
+            "grid_resolution_m",
+            "municipality_updated_at",
+            name="uq_municipality_grid_mask_key",
+        ),
+    )
+
+    # =====================================================
+    # REPRESENTAÇÃO
+    # =====================================================
+
+    def __repr__(self) -> str:
+        return (
+            f"<MunicipalityGridMask("
+            f"municipality_id={self.municipality_id}, "
+            f"grid_resolution_m={self.grid_resolution_m}, "
+            f"shape=({self.n_rows}, {self.n_cols}), "
+            f"inside_cells={self.inside_cells}"
+            f")>"
+        )
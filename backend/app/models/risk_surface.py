@@ -12,7 +12,12 @@ Objetivo no produto:
 
 Notas arquiteturais:
 - Este arquivo contém APENAS persistência (ORM), sem cálculos espaciais.
-- O payload principal é um GeoJSON (FeatureCollection), persistido em JSONB.
+- O payload principal é um raster compacto (grid + arrays por célula, ver
+  services/surface_raster.py), persistido em coluna binária.
+- `geojson` (JSONB) só existe em superfícies antigas; o FeatureCollection
+  é materializado sob demanda a partir do raster.
+- `stats` guarda as estatísticas por célula calculadas na geração, usadas
+  pelo analytics sem reprocessar o GeoJSON.
 - Garante 1 superfície por (municipality_id, snapshot_timestamp).
 """
 
@@ -29,6 +34,7 @@ from sqlalchemy import (
     UniqueConstraint,
     Index,
     Float,
+    LargeBinary,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
@@ -65,13 +71,25 @@ class RiskSurface(Base):
     )
 
     # =====================================================
-    # DADOS DA SUPERFÍCIE (GeoJSON)
+    # DADOS DA SUPERFÍCIE (raster / GeoJSON legado)
     # =====================================================
 
+    raster = Column(
+        LargeBinary,
+        nullable=True,
+        doc="Raster compacto (np.savez_compressed) com grid e valores por célula",
+    )
+
     geojson = Column(
         JSONB,
-        nullable=False,
-        doc="GeoJSON (FeatureCollection) representando a superfície de risco",
+        nullable=True,
+        doc="GeoJSON (FeatureCollection) legado; superfícies novas usam `raster`",
+    )
+
+    stats = Column(
+        LargeBinary,
+        nullable=True,
+        doc="Estatísticas por célula (ICRA ordenado, áreas, contagem por nível), ver services/surface_stats.py",
     )
 
     # =====================================================
@@ -96,6 +114,12 @@ class RiskSurface(Base):
         doc="Quantidade total de células/tiles gerados (se aplicável)",
     )
 
+    recomputed_cells = Column(
+        Integer,
+        nullable=True,
+        doc="Células efetivamente recalculadas nesta geração (modo incremental)",
+    )
+
     # =====================================================
     # MÉTRICAS TERRITORIAIS 
     # =====================================================
@@ -0,0 +1,138 @@
+"""
+repositories/climate_daily_repository.py
+
+Camada de acesso a dados para o cache diário de clima por localização.
+
+Responsabilidades:
+- Consulta dos dias armazenados de uma ou várias localizações em um intervalo
+- Persistência idempotente de dias consolidados
+
+IMPORTANTE:
+- NÃO chama o provedor climático
+- NÃO decide quais dias estão consolidados
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.models.climate_daily import ClimateDaily
+
+
+# Localizações por consulta em list_days_for_locations (2 parâmetros cada)
+LOCATIONS_PER_QUERY: int = 500
+
+_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+class ClimateDailyRepository:
+    """
+    Repositório de persistência dos dias climáticos.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def list_days(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: date,
+        end_date: date,
+    ) -> List[ClimateDaily]:
+        stmt = (
+            select(ClimateDaily)
+            .where(
+                and_(
+                    ClimateDaily.latitude == latitude,
+                    ClimateDaily.longitude == longitude,
+                    ClimateDaily.day >= start_date,
+                    ClimateDaily.day <= end_date,
+                )
+            )
+            .order_by(ClimateDaily.day.asc())
+        )
+        return list(self.session.execute(stmt).scalars().all())
+
+    def list_days_for_locations(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        start_date: date,
+        end_date: date,
+    ) -> List[ClimateDaily]:
+        """
+        Dias de várias localizações (lat, lon já arredondadas) no intervalo:
+        uma consulta por LOCATIONS_PER_QUERY localizações.
+        """
+        rows: List[ClimateDaily] = []
+        for i in range(0, len(locations), LOCATIONS_PER_QUERY):
+            chunk = list(locations[i:i + LOCATIONS_PER_QUERY])
+            stmt = (
+                select(ClimateDaily)
+                .where(
+                    and_(
+                        tuple_(ClimateDaily.latitude, ClimateDaily.longitude).in_(chunk),
+                        ClimateDaily.day >= start_date,
+                        ClimateDaily.day <= end_date,
+                    )
+                )
+                .order_by(ClimateDaily.latitude, ClimateDaily.longitude, ClimateDaily.day.asc())
+            )
+            rows.extend(self.session.execute(stmt).scalars().all())
+        return rows
+
+    def save_days(self, rows: List[ClimateDaily]) -> int:
+        """
+        Grava os dias informados em um único INSERT ... ON CONFLICT
+        (latitude, longitude, day) DO NOTHING: dias consolidados não mudam,
+        então o que já estiver gravado (ex: por outra execução) é mantido.
+
+        Outros dialetos: INSERT simples; conflito => rollback e 0.
+        Retorna quantos dias foram efetivamente inseridos.
+        """
+        if not rows:
+            return 0
+
+        insert = _INSERTS.get(self.session.get_bind().dialect.name)
+        if insert is None:
+            try:
+                self.session.add_all(rows)
+                self.session.commit()
+                return len(rows)
+            except IntegrityError:
+                self.session.rollback()
+                return 0
+
+        values: List[Dict[str, Any]] = [
+            {
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+                "day": row.day,
+                "precipitacao_total_mm": row.precipitacao_total_mm,
+                "temperatura_media_2m_c": row.temperatura_media_2m_c,
+                "temperatura_aparente_media_2m_c": row.temperatura_aparente_media_2m_c,
+            }
+            for row in rows
+        ]
+
+        stmt = insert(ClimateDaily).values(values).on_conflict_do_nothing(
+            index_elements=["latitude", "longitude", "day"],
+        )
+        try:
+            result = self.session.execute(stmt)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return max(0, int(result.rowcount or 0))
@@ -0,0 +1,87 @@
+"""
+repositories/grid_mask_repository.py
+
+Camada de acesso a dados para máscaras de grid dos municípios.
+
+Responsabilidades:
+- Consulta da máscara vigente por (município, resolução, versão do polígono)
+- Persistência idempotente de novas máscaras (SAVEPOINT, sem commit)
+- Limpeza de máscaras obsoletas (polígono alterado)
+
+IMPORTANTE:
+- NÃO contém lógica de cálculo espacial
+- NÃO decide quando recalcular
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.models.municipality_grid_mask import MunicipalityGridMask
+
+
+class GridMaskRepository:
+    """
+    Repositório de persistência das máscaras de grid.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_mask(
+        self,
+        municipality_id: int,
+        grid_resolution_m: int,
+        municipality_updated_at: datetime,
+    ) -> Optional[MunicipalityGridMask]:
+        stmt = (
+            select(MunicipalityGridMask)
+            .where(
+                and_(
+                    MunicipalityGridMask.municipality_id == municipality_id,
+                    MunicipalityGridMask.grid_resolution_m == grid_resolution_m,
+                    MunicipalityGridMask.municipality_updated_at == municipality_updated_at,
+                )
+            )
+            .limit(1)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def save_mask(self, mask: MunicipalityGridMask) -> MunicipalityGridMask:
+        """
+        Salva a máscara e remove versões antigas do mesmo (município, resolução).
+        Se outra execução salvou a mesma chave antes, retorna a existente.
+
+        Roda em SAVEPOINT + flush: NÃO faz commit nem rollback da transação
+        do chamador (o commit fica com quem chamou, ex: gravação da superfície).
+        """
+        try:
+            with self.session.begin_nested():
+                self.session.execute(
+                    delete(MunicipalityGridMask).where(
+                        and_(
+                            MunicipalityGridMask.municipality_id == mask.municipality_id,
+                            MunicipalityGridMask.grid_resolution_m == mask.grid_resolution_m,
+                            MunicipalityGridMask.municipality_updated_at != mask.municipality_updated_at,
+                        )
+                    )
+                )
+                self.session.add(mask)
+                self.session.flush()
+            return mask
+
+        except IntegrityError:
+            # O SAVEPOINT já foi desfeito; o restante da transação segue intacto
+            existing = self.get_mask(
+                municipality_id=mask.municipality_id,
+                grid_resolution_m=mask.grid_resolution_m,
+                municipality_updated_at=mask.municipality_updated_at,
+            )
+            if existing:
+                return existing
+            raise
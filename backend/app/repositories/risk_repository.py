@@ -13,16 +13,37 @@ Não contém lógica de negócio.
 Não realiza chamadas externas.
 """
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from sqlalchemy import select, desc, func, distinct
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from backend.app.models.risk_snapshot import RiskSnapshot
 
 
+# Campos sobrescritos quando (point_id, snapshot_timestamp) já existe
+# (mesmos de save_snapshot)
+_UPSERT_UPDATE_FIELDS: Tuple[str, ...] = (
+    "icra",
+    "icra_std",
+    "nivel_risco",
+    "confianca",
+    "chuva_dia",
+    "chuva_30d",
+    "chuva_90d",
+    "source",
+)
+
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
 class RiskRepository:
     """
     Repositório para manipulação de snapshots de risco.
@@ -77,17 +98,58 @@ class RiskRepository:
 
     def bulk_save_snapshots(self, snapshots: List[RiskSnapshot]) -> None:
         """
-        Salva múltiplos snapshots em uma única transação
+        Salva múltiplos snapshots em uma única transação (upsert em massa).
+        Se o lote falhar por integridade, refaz ponto a ponto com save_snapshot,
+        como antes do upsert.
         """
         try:
-            self.db.add_all(snapshots)
-            self.db.commit()
+            self.upsert_snapshots(snapshots)
 
         except IntegrityError:
-            self.db.rollback()
+            for snapshot in snapshots:
+                self.save_snapshot(snapshot)
+
+    def upsert_snapshots(self, snapshots: List[RiskSnapshot], chunk_size: int = 500) -> int:
+        """
+        Upsert em massa: um INSERT ... ON CONFLICT (point_id, snapshot_timestamp)
+        DO UPDATE por bloco de `chunk_size` e um único commit.
 
+        PostgreSQL e SQLite usam o ON CONFLICT nativo; outros dialetos caem
+        para save_snapshot por linha. Em erro, faz rollback e propaga.
+        Retorna quantos snapshots (únicos por chave) foram gravados.
+        """
+        if not snapshots:
+            return 0
+
+        insert = _UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if insert is None:
             for snapshot in snapshots:
                 self.save_snapshot(snapshot)
+            return len(snapshots)
+
+        # Chave repetida no mesmo INSERT quebra o ON CONFLICT: vale o último
+        rows: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
+        for snapshot in snapshots:
+            rows[(snapshot.point_id, snapshot.snapshot_timestamp)] = self._snapshot_row(snapshot)
+        values = list(rows.values())
+
+        size = max(1, int(chunk_size))
+        try:
+            for i in range(0, len(values), size):
+                stmt = insert(RiskSnapshot).values(values[i:i + size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["point_id", "snapshot_timestamp"],
+                    set_={field: stmt.excluded[field] for field in _UPSERT_UPDATE_FIELDS},
+                )
+                self.db.execute(stmt)
+
+            self.db.commit()
+
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return len(values)
 
     # ==========================================================
     # CONSULTAS
@@ -178,6 +240,22 @@ class RiskRepository:
         )
         return self.db.execute(stmt).scalar_one_or_none()
 
+    def get_point_ids_by_bucket(
+        self,
+        snapshot_timestamp: datetime,
+    ) -> Set[str]:
+        """
+        IDs dos pontos que já têm snapshot no timestamp (uma consulta,
+        só a coluna point_id: sem o join do relacionamento `point`).
+        """
+
+        stmt = (
+            select(RiskSnapshot.point_id)
+            .where(RiskSnapshot.snapshot_timestamp == snapshot_timestamp)
+        )
+
+        return set(self.db.execute(stmt).scalars().all())
+
     def get_snapshots_by_bucket(
         self,
         snapshot_timestamp: datetime,
@@ -232,6 +310,25 @@ class RiskRepository:
     # MÉTODO PRIVADO
     # ==========================================================
 
+    def _snapshot_row(self, snapshot: RiskSnapshot) -> Dict[str, Any]:
+        """
+        Colunas do INSERT em massa (defaults do ORM aplicados aqui).
+        """
+        return {
+            "point_id": snapshot.point_id,
+            "snapshot_timestamp": snapshot.snapshot_timestamp,
+            "icra": snapshot.icra,
+            "icra_std": snapshot.icra_std,
+            "nivel_risco": snapshot.nivel_risco,
+            "confianca": snapshot.confianca,
+            "chuva_dia": snapshot.chuva_dia,
+            "chuva_30d": snapshot.chuva_30d,
+            "chuva_90d": snapshot.chuva_90d,
+            "computed_at": snapshot.computed_at or datetime.now(timezone.utc),
+            "valid_until": snapshot.valid_until,
+            "source": snapshot.source or "scheduled",
+        }
+
     def _get_by_point_and_timestamp(
         self,
         point_id: str,
@@ -136,6 +136,29 @@ class RiskSurfaceRepository:
 
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_previous_by_municipality(
+        self,
+        municipality_id: int,
+        before: datetime,
+    ) -> Optional[RiskSurface]:
+        """
+        Retorna a superfície mais recente do município com
+        snapshot_timestamp estritamente anterior a `before`.
+        """
+        stmt = (
+            select(RiskSurface)
+            .where(
+                and_(
+                    RiskSurface.municipality_id == municipality_id,
+                    RiskSurface.snapshot_timestamp < before,
+                )
+            )
+            .order_by(desc(RiskSurface.snapshot_timestamp))
+            .limit(1)
+        )
+
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def get_latest_valid_by_municipality(
         self,
         municipality_id: int,
@@ -6,7 +6,10 @@ Rotas responsáveis por servir a superfície espacial de risco
 
 Responsabilidades:
 - Expor superfície GeoJSON para frontend
-- Garantir cache via banco (JSONB)
+- Expor tiles raster (PNG, XYZ) cacheados por bucket
+- Expor isobandas (células do mesmo nível dissolvidas em polígonos)
+- Expor diferença célula a célula entre dois buckets
+- Garantir cache via banco (raster compacto; GeoJSON materializado sob demanda)
 - Delegar decisão de cálculo ao RiskSurfaceService
 - Não conter lógica de negócio pesada
 """
@@ -14,17 +17,29 @@ Responsabilidades:
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.app.database import get_db
 from backend.app.models.municipality import Municipality
+from backend.app.models.risk_surface import RiskSurface
 from backend.app.repositories.municipality_repository import MunicipalityRepository
 from backend.app.repositories.risk_surface_repository import RiskSurfaceRepository
-from backend.app.services.risk_surface_service import RiskSurfaceService
+from backend.app.services.risk_surface_service import RiskSurfaceService, RiskSurfaceServiceError
+from backend.app.services.surface_diff import DEFAULT_DIFF_TOLERANCE
+from backend.app.services.surface_isobands import ISOBAND_BASES
+from backend.app.services.surface_tiles import TileRequestError, validate_tile
 from backend.app.repositories.risk_repository import RiskRepository
+from backend.app.settings import settings
+from backend.app.utils.json_stream import (
+    iter_compressed,
+    iter_envelope_with_feature_collection,
+    negotiate_encoding,
+)
+from backend.app.utils.lru_cache import LRUCache
 
 
 # ============================================================
@@ -37,6 +52,13 @@ router = APIRouter(
 )
 
 
+# Envelope de GET /surface/{id} já serializado e comprimido, chaveado por
+# (municipality_id, snapshot_timestamp, computed_at, content-encoding).
+_ENCODED_SURFACE_CACHE: LRUCache[Tuple[Any, ...], bytes] = LRUCache(
+    maxsize=int(settings.SURFACE.RESPONSE_CACHE_SIZE)
+)
+
+
 # ============================================================
 # Helpers
 # ============================================================
@@ -63,6 +85,40 @@ def _get_active_municipality_or_404(
     return municipality
 
 
+def _as_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _get_persisted_surface_or_404(
+    surface_repo: RiskSurfaceRepository,
+    municipality_id: int,
+    reference_ts: Optional[datetime],
+) -> Tuple[RiskSurface, int]:
+    """
+    Superfície persistida (sem recálculo) + max-age do Cache-Control:
+    com reference_ts a URL é estável por bucket (TTL do snapshot).
+    """
+    if reference_ts is not None:
+        surface = surface_repo.get_by_municipality_and_timestamp(
+            municipality_id=municipality_id,
+            snapshot_timestamp=_as_utc(reference_ts),
+        )
+        max_age = int(settings.RISK.SNAPSHOT_TTL_SECONDS)
+    else:
+        surface = surface_repo.get_latest_by_municipality(municipality_id=municipality_id)
+        max_age = 60
+
+    if not surface:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Superfície ainda não gerada para este município.",
+        )
+
+    return surface, max_age
+
+
 # ============================================================
 # GET /surface/{municipality_id}
 # ============================================================
@@ -70,8 +126,9 @@ def _get_active_municipality_or_404(
 @router.get("/{municipality_id}")
 def get_surface(
     municipality_id: int,
+    request: Request,
     db: Session = Depends(get_db),
-) -> Dict[str, Any]:
+) -> Response:
     """
     Retorna envelope completo da superfície espacial do município.
 
@@ -79,6 +136,9 @@ def get_surface(
     - Busca superfície válida no banco
     - Se expirou ou não existir → recalcula automaticamente
     - Retorna GeoJSON + metadados + estatísticas
+    - JSON escrito em stream: features geradas do raster em lotes (sem montar o
+      FeatureCollection inteiro), com gzip/brotli conforme Accept-Encoding
+    - Bytes finais cacheados por bucket: requisições repetidas não reserializam
     """
 
     municipality = _get_active_municipality_or_404(db, municipality_id)
@@ -115,7 +175,22 @@ def get_surface(
             detail=f"Erro ao gerar superfície: {repr(e)}",
         )
 
-    return {
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    cache_key = (
+        municipality.id,
+        surface.snapshot_timestamp.isoformat(),
+        surface.computed_at.isoformat(),
+        encoding,
+    )
+    cached = _ENCODED_SURFACE_CACHE.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
+
+    envelope = {
         "municipality_id": municipality.id,
         "municipality_name": municipality.name,
         "reference_ts": surface.snapshot_timestamp.isoformat(),
@@ -129,8 +204,18 @@ def get_surface(
             "high_risk_area_m2": surface.high_risk_area_m2,
             "high_risk_percentage": surface.high_risk_percentage,
         },
-        "geojson": surface.geojson,
     }
+    geojson = service.get_surface_geojson_stream(surface)
+
+    def _stream():
+        parts: List[bytes] = []
+        chunks = iter_envelope_with_feature_collection(envelope, "geojson", geojson)
+        for chunk in iter_compressed(chunks, encoding):
+            parts.append(chunk)
+            yield chunk
+        _ENCODED_SURFACE_CACHE.put(cache_key, b"".join(parts))
+
+    return StreamingResponse(_stream(), media_type="application/json", headers=headers)
 
 
 # ============================================================
@@ -169,6 +254,7 @@ def get_surface_metadata(
         "kernel_sigma_m": latest_surface.kernel_sigma_m,
         "stats": {
             "total_cells": latest_surface.total_cells,
+            "recomputed_cells": latest_surface.recomputed_cells,
             "total_area_m2": latest_surface.total_area_m2,
             "high_risk_area_m2": latest_surface.high_risk_area_m2,
             "high_risk_percentage": latest_surface.high_risk_percentage,
@@ -176,6 +262,202 @@ def get_surface_metadata(
     }
 
 
+# ============================================================
+# GET /surface/{municipality_id}/tiles/{z}/{x}/{y}
+# ============================================================
+
+@router.get("/{municipality_id}/tiles/{z}/{x}/{y}")
+def get_surface_tile(
+    municipality_id: int,
+    z: int,
+    x: int,
+    y: int,
+    reference_ts: Optional[datetime] = Query(
+        default=None,
+        description="Bucket da superfície (UTC). Se omitido, usa a superfície mais recente.",
+    ),
+    db: Session = Depends(get_db),
+) -> Response:
+    """
+    Retorna tile raster (PNG RGBA, esquema XYZ / Web Mercator) da superfície.
+
+    Comportamento:
+    - NÃO recalcula superfície (usa a persistida)
+    - Tiles cacheados em memória por bucket
+    - Com reference_ts a URL é estável por bucket (cache HTTP pelo TTL do snapshot)
+    """
+
+    try:
+        validate_tile(z, x, y)
+    except TileRequestError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    municipality = _get_active_municipality_or_404(db, municipality_id)
+    surface_repo = RiskSurfaceRepository(db)
+    surface, max_age = _get_persisted_surface_or_404(surface_repo, municipality.id, reference_ts)
+
+    service = RiskSurfaceService(
+        municipality_repo=MunicipalityRepository(db),
+        surface_repo=surface_repo,
+        risk_repo=RiskRepository(db),
+    )
+
+    try:
+        png = service.get_surface_tile(surface, z, x, y)
+    except RiskSurfaceServiceError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    return Response(
+        content=png,
+        media_type="image/png",
+        headers={
+            "Cache-Control": f"public, max-age={max_age}",
+            "X-Surface-Reference-Ts": surface.snapshot_timestamp.isoformat(),
+        },
+    )
+
+
+# ============================================================
+# GET /surface/{municipality_id}/isobands
+# ============================================================
+
+@router.get("/{municipality_id}/isobands")
+def get_surface_isobands(
+    municipality_id: int,
+    response: Response,
+    basis: str = Query(
+        default="absolute",
+        description="Nível usado para dissolver as células: absolute | relative.",
+    ),
+    reference_ts: Optional[datetime] = Query(
+        default=None,
+        description="Bucket da superfície (UTC). Se omitido, usa a superfície mais recente.",
+    ),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Retorna a superfície como isobandas: uma feature ((Multi)Polygon com buracos)
+    por nível de risco, em vez de um polígono por célula.
+
+    Comportamento:
+    - NÃO recalcula superfície (usa a persistida)
+    - Isobandas cacheadas em memória por bucket
+    - O raster por célula continua disponível em GET /surface/{id} (analytics)
+    """
+
+    if basis not in ISOBAND_BASES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"basis inválido: {basis}. Use um de {list(ISOBAND_BASES)}.",
+        )
+
+    municipality = _get_active_municipality_or_404(db, municipality_id)
+    surface_repo = RiskSurfaceRepository(db)
+    surface, max_age = _get_persisted_surface_or_404(surface_repo, municipality.id, reference_ts)
+
+    service = RiskSurfaceService(
+        municipality_repo=MunicipalityRepository(db),
+        surface_repo=surface_repo,
+        risk_repo=RiskRepository(db),
+    )
+
+    try:
+        isobands = service.get_surface_isobands(surface, basis=basis)
+    except RiskSurfaceServiceError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+
+    return {
+        "municipality_id": municipality.id,
+        "reference_ts": surface.snapshot_timestamp.isoformat(),
+        "computed_at": surface.computed_at.isoformat(),
+        "grid_resolution_m": surface.grid_resolution_m,
+        "basis": basis,
+        "geojson": isobands,
+    }
+
+
+# ============================================================
+# GET /surface/{municipality_id}/diff
+# ============================================================
+
+@router.get("/{municipality_id}/diff")
+def get_surface_diff(
+    municipality_id: int,
+    response: Response,
+    from_ts: Optional[datetime] = Query(
+        default=None,
+        alias="from",
+        description="Bucket inicial (UTC). Se omitido, usa o bucket anterior a `to`.",
+    ),
+    to_ts: Optional[datetime] = Query(
+        default=None,
+        alias="to",
+        description="Bucket final (UTC). Se omitido, usa a superfície mais recente.",
+    ),
+    tolerance: float = Query(
+        default=DEFAULT_DIFF_TOLERANCE,
+        ge=0.0,
+        le=1.0,
+        description="Variação mínima de risco (absoluto) para a célula ser retornada.",
+    ),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Retorna o que mudou entre dois buckets: apenas as células cujo risco variou
+    acima da tolerância (ou mudaram de nível) + estatísticas agregadas.
+
+    Comportamento:
+    - NÃO recalcula superfícies (usa as persistidas)
+    - Resultado cacheado em memória por par de buckets
+    """
+
+    municipality = _get_active_municipality_or_404(db, municipality_id)
+    surface_repo = RiskSurfaceRepository(db)
+
+    after, max_age = _get_persisted_surface_or_404(surface_repo, municipality.id, to_ts)
+
+    if from_ts is not None:
+        before = surface_repo.get_by_municipality_and_timestamp(
+            municipality_id=municipality.id,
+            snapshot_timestamp=_as_utc(from_ts),
+        )
+    else:
+        before = surface_repo.get_previous_by_municipality(
+            municipality_id=municipality.id,
+            before=after.snapshot_timestamp,
+        )
+
+    if not before:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Superfície do bucket inicial não encontrada para este município.",
+        )
+
+    service = RiskSurfaceService(
+        municipality_repo=MunicipalityRepository(db),
+        surface_repo=surface_repo,
+        risk_repo=RiskRepository(db),
+    )
+
+    try:
+        diff = service.get_surface_diff(before, after, tolerance=tolerance)
+    except RiskSurfaceServiceError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+
+    return {
+        "municipality_id": municipality.id,
+        "from_ts": before.snapshot_timestamp.isoformat(),
+        "to_ts": after.snapshot_timestamp.isoformat(),
+        "grid_resolution_m": after.grid_resolution_m,
+        "stats": diff["stats"],
+        "geojson": diff["geojson"],
+    }
+
+
 # ============================================================
 # POST /surface/{municipality_id}/recompute
 # ============================================================
@@ -0,0 +1,368 @@
+"""
+benchmark_surface.py
+
+Benchmark offline do motor de superfícies de risco (RiskSurfaceService).
+
+Responsabilidade:
+- Gerar municípios sintéticos (polígono simples e MultiPolygon complexo com buraco)
+- Gerar conjuntos sintéticos de pontos (100 a 10.000 pontos)
+- Medir separadamente cada etapa da geração, em várias resoluções:
+    grid          => bbox + máscara dentro/fora
+    sigmas        => sigma adaptativo (kNN)
+    kernel_matrix => matriz esparsa de pesos
+    kernel_apply  => produto matriz-vetor (absoluto + relativo)
+    generate      => `_generate_surface` completo, sem cache de layout
+    geojson       => materialização do FeatureCollection a partir do raster
+- Emitir resultados em JSON (para acompanhamento de regressões)
+
+Este script:
+- NÃO acessa banco (máscara de grid mantida em memória)
+- NÃO chama IA nem APIs externas
+- NÃO depende de servidor rodando
+
+Uso:
+    python -m backend.app.scripts.benchmark_surface --output bench.json
+    python -m backend.app.scripts.benchmark_surface --points 100,1000 --resolutions 350 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from math import cos, pi, radians, sin
+from statistics import median
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.app.services.risk_surface_service import _LAYOUT_CACHE, RiskSurfaceService
+from backend.app.services.surface_kernel import build_kernel_weight_matrix, local_projection_origin
+from backend.app.services.surface_raster import SurfaceRaster
+
+
+# ==========================================================
+# CONFIGURAÇÃO
+# ==========================================================
+
+DEFAULT_POINTS = (100, 1_000, 10_000)
+DEFAULT_RESOLUTIONS = (250, 350, 500)
+DEFAULT_REPEAT = 3
+
+CENTER_LAT = -16.68
+CENTER_LON = -49.25
+RADIUS_DEG = 0.15  # ~33 km de diâmetro
+
+SEED = 42
+
+
+# ==========================================================
+# DADOS SINTÉTICOS
+# ==========================================================
+
+def _ring(center_lat: float, center_lon: float, radius_deg: float, n: int, wobble: float, rng) -> List[List[float]]:
+    angles = np.linspace(0.0, 2.0 * pi, n, endpoint=False)
+    radii = radius_deg * (1.0 + wobble * rng.uniform(-1.0, 1.0, n))
+    lon_scale = 1.0 / max(0.1, cos(radians(center_lat)))
+    ring = [
+        [center_lon + r * cos(a) * lon_scale, center_lat + r * sin(a)]
+        for a, r in zip(angles.tolist(), radii.tolist())
+    ]
+    ring.append(ring[0])
+    return ring
+
+
+def synthetic_municipalities() -> Dict[str, Dict[str, Any]]:
+    """
+    simple  => quadrado (5 vértices)
+    complex => MultiPolygon: anel irregular de 4.000 vértices com buraco + ilha
+    """
+    rng = np.random.default_rng(SEED)
+    lon_r = RADIUS_DEG / max(0.1, cos(radians(CENTER_LAT)))
+
+    simple = {
+        "type": "Polygon",
+        "coordinates": [[
+            [CENTER_LON - lon_r, CENTER_LAT - RADIUS_DEG],
+            [CENTER_LON + lon_r, CENTER_LAT - RADIUS_DEG],
+            [CENTER_LON + lon_r, CENTER_LAT + RADIUS_DEG],
+            [CENTER_LON - lon_r, CENTER_LAT + RADIUS_DEG],
+            [CENTER_LON - lon_r, CENTER_LAT - RADIUS_DEG],
+        ]],
+    }
+
+    outer = _ring(CENTER_LAT, CENTER_LON, RADIUS_DEG, 4_000, 0.08, rng)
+    hole = list(reversed(_ring(CENTER_LAT + 0.03, CENTER_LON - 0.02, RADIUS_DEG * 0.2, 400, 0.05, rng)))
+    island = _ring(CENTER_LAT - RADIUS_DEG * 1.3, CENTER_LON + lon_r * 0.9, RADIUS_DEG * 0.25, 600, 0.05, rng)
+
+    complex_ = {
+        "type": "MultiPolygon",
+        "coordinates": [[outer, hole], [island]],
+    }
+
+    return {"simple": simple, "complex": complex_}
+
+
+def synthetic_points(n: int, seed: int = SEED) -> Tuple[List[Any], List[Any]]:
+    """
+    Pontos com densidade heterogênea (metade concentrada em 3 focos)
+    e ICRA espacialmente suave + ruído.
+    """
+    rng = np.random.default_rng(seed + n)
+    lon_r = RADIUS_DEG / max(0.1, cos(radians(CENTER_LAT)))
+
+    n_uniform = n - n // 2
+    lats = [CENTER_LAT + rng.uniform(-RADIUS_DEG, RADIUS_DEG, n_uniform)]
+    lons = [CENTER_LON + rng.uniform(-lon_r, lon_r, n_uniform)]
+
+    centers = [(0.05, -0.04), (-0.06, 0.03), (0.02, 0.07)]
+    per_focus = np.array_split(np.arange(n // 2), len(centers))
+    for (dlat, dlon), idx in zip(centers, per_focus):
+        lats.append(CENTER_LAT + dlat + rng.normal(0.0, 0.01, idx.size))
+        lons.append(CENTER_LON + dlon + rng.normal(0.0, 0.01, idx.size))
+
+    lat = np.concatenate(lats)
+    lon = np.concatenate(lons)
+    icra = np.clip(
+        0.5 + 0.35 * np.sin((lat - CENTER_LAT) * 40.0) * np.cos((lon - CENTER_LON) * 30.0)
+        + rng.normal(0.0, 0.08, n),
+        0.0,
+        1.0,
+    )
+
+    points = [
+        SimpleNamespace(id=f"bench_{i:05d}", latitude=float(a), longitude=float(b))
+        for i, (a, b) in enumerate(zip(lat.tolist(), lon.tolist()))
+    ]
+    snapshots = [SimpleNamespace(point_id=p.id, icra=float(v)) for p, v in zip(points, icra.tolist())]
+    return points, snapshots
+
+
+# ==========================================================
+# INFRA
+# ==========================================================
+
+class _InMemoryGridMaskRepository:
+    """
+    Substitui GridMaskRepository: nunca há máscara persistida,
+    então a etapa de grid sempre calcula a máscara.
+    """
+
+    def get_mask(self, **_: Any) -> None:
+        return None
+
+    def save_mask(self, mask: Any) -> Any:
+        return mask
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "min_s": round(min(samples), 6),
+        "median_s": round(median(samples), 6),
+        "max_s": round(max(samples), 6),
+    }
+
+
+# ==========================================================
+# BENCHMARK
+# ==========================================================
+
+def run_case(
+    name: str,
+    geometry: Dict[str, Any],
+    n_points: int,
+    resolution_m: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    service = RiskSurfaceService(
+        municipality_repo=None,
+        surface_repo=None,
+        risk_repo=None,
+        grid_mask_repo=_InMemoryGridMaskRepository(),
+    )
+    service.cfg = replace(service.cfg, grid_resolution_m=int(resolution_m))
+
+    municipality = SimpleNamespace(
+        id=1,
+        name=f"bench_{name}",
+        geojson=geometry,
+        updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        active=True,
+    )
+    points, snapshots = synthetic_points(n_points)
+    point_xy = [(float(p.latitude), float(p.longitude)) for p in points]
+    point_lat = np.array([xy[0] for xy in point_xy], dtype=float)
+    point_lon = np.array([xy[1] for xy in point_xy], dtype=float)
+    icra = np.array([s.icra for s in snapshots], dtype=float)
+    snapshot_ts = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    geom = service._extract_geometry(geometry)
+    bbox = service._bbox_from_geometry(geom)
+
+    samples: Dict[str, List[float]] = {
+        k: [] for k in ("grid", "sigmas", "kernel_matrix", "kernel_apply", "generate", "geojson")
+    }
+    counts: Dict[str, int] = {}
+
+    for _ in range(max(1, int(repeat))):
+        dt, (spec, mask) = _timed(
+            lambda: service._get_grid_mask(
+                municipality=municipality,
+                bbox=bbox,
+                geometry=geom,
+                resolution_m=service.cfg.grid_resolution_m,
+                max_cells=service.cfg.max_cells,
+            )
+        )
+        samples["grid"].append(dt)
+
+        cell_index = np.flatnonzero(mask)
+        cell_lat, cell_lon = spec.cell_centers(cell_index, mask.shape[1])
+        origin: Optional[Tuple[float, float]] = (
+            local_projection_origin(
+                np.array([spec.min_lat, spec.max_lat], dtype=float),
+                np.array([spec.min_lon, spec.max_lon], dtype=float),
+            )
+            if service.cfg.local_projection
+            else None
+        )
+
+        dt, sigmas = _timed(lambda: service._compute_adaptive_sigmas(point_xy, origin=origin))
+        samples["sigmas"].append(dt)
+
+        dt, weights = _timed(
+            lambda: build_kernel_weight_matrix(
+                cell_lat=cell_lat,
+                cell_lon=cell_lon,
+                point_lat=point_lat,
+                point_lon=point_lon,
+                point_sigmas=np.array(sigmas, dtype=float),
+                truncation_sigmas=service.cfg.kernel_truncation_sigmas,
+                projection_origin=origin,
+            )
+        )
+        samples["kernel_matrix"].append(dt)
+
+        dt, _ = _timed(lambda: (weights.apply(icra), weights.apply(icra[::-1].copy())))
+        samples["kernel_apply"].append(dt)
+
+        _LAYOUT_CACHE.clear()
+        dt, surface = _timed(
+            lambda: service._generate_surface(municipality, points, snapshots, snapshot_ts, "benchmark")
+        )
+        samples["generate"].append(dt)
+
+        raster = SurfaceRaster.decode(surface.raster)
+        dt, _ = _timed(raster.to_geojson)
+        samples["geojson"].append(dt)
+
+        counts = {
+            "grid_cells": int(mask.size),
+            "inside_cells": int(cell_index.size),
+            "kernel_nnz": int(weights.nnz),
+            "raster_bytes": len(surface.raster),
+        }
+
+    _LAYOUT_CACHE.clear()
+
+    return {
+        "municipality": name,
+        "n_points": int(n_points),
+        "resolution_m": int(resolution_m),
+        **counts,
+        "timings": {k: _summarize(v) for k, v in samples.items()},
+    }
+
+
+def run_benchmark(
+    points: List[int],
+    resolutions: List[int],
+    repeat: int,
+    municipalities: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    geometries = synthetic_municipalities()
+    names = municipalities or list(geometries.keys())
+
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        for res in resolutions:
+            for n in points:
+                result = run_case(name, geometries[name], n, res, repeat)
+                results.append(result)
+                _print_result(result)
+
+    service_cfg = RiskSurfaceService(None, None, None, grid_mask_repo=_InMemoryGridMaskRepository()).cfg
+
+    return {
+        "benchmark": "surface_generation",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "config": {
+            "repeat": int(repeat),
+            "surface_defaults": asdict(service_cfg),
+        },
+        "results": results,
+    }
+
+
+# ==========================================================
+# SAÍDA
+# ==========================================================
+
+def _print_result(result: Dict[str, Any]) -> None:
+    t = result["timings"]
+    print(
+        f"{result['municipality']:<8} res={result['resolution_m']:>4}m pts={result['n_points']:>6} "
+        f"cells={result.get('inside_cells', 0):>7} "
+        + " ".join(f"{k}={v['median_s'] * 1000:.1f}ms" for k, v in t.items()),
+        file=sys.stderr,
+    )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline da geração de superfícies de risco.")
+    parser.add_argument("--points", type=_int_list, default=list(DEFAULT_POINTS))
+    parser.add_argument("--resolutions", type=_int_list, default=list(DEFAULT_RESOLUTIONS))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--municipalities", type=lambda v: [s for s in v.split(",") if s], default=None)
+    parser.add_argument("--output", type=str, default=None, help="Arquivo JSON (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        points=args.points,
+        resolutions=args.resolutions,
+        repeat=args.repeat,
+        municipalities=args.municipalities,
+    )
+
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,17 +8,21 @@ Este módulo:
 - NÃO calcula risco
 - NÃO monta features
 - NÃO conhece IA
-- NÃO persiste dados
+- NÃO acessa o banco diretamente: dias consolidados são lidos/gravados
+  pelo ClimateDailyStore (tabela climate_daily, CLIMATE_CACHE_ENABLED)
 
 Ele apenas fornece séries climáticas confiáveis.
 """
 
+import threading
 from datetime import date, datetime, timedelta, timezone
-from typing import List, Dict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 import requests
 
 from backend.app.settings import settings
+from backend.app.services.climate_store import ClimateDailyStore
+from backend.app.utils.lru_cache import LRUCache
 
 
 # =====================================================
@@ -29,6 +33,21 @@ class ClimateServiceError(Exception):
     """Erro ao obter dados climáticos externos."""
 
 
+# =====================================================
+# NÓS DA GRADE DO PROVEDOR
+# =====================================================
+
+# Nó que a Open-Meteo reportou (latitude/longitude da célula usada + elevação
+# do downscaling) por (endpoint, coordenada pedida arredondada). Duas
+# coordenadas com o mesmo nó recebem exatamente os mesmos dados.
+_PROVIDER_NODES: LRUCache[Tuple[str, float, float], Tuple[float, float, float]] = LRUCache(
+    maxsize=int(getattr(settings.CLIMATE, "CLIMATE_NODE_CACHE_SIZE", 50_000))
+)
+
+# Mesma precisão da chave do cache persistente (ClimateDailyStore.location_key)
+_NODE_KEY_PRECISION: int = 4
+
+
 # =====================================================
 # SERVIÇO PRINCIPAL
 # =====================================================
@@ -41,17 +60,58 @@ class ClimateService:
     no cálculo de features e risco.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, store: Optional[ClimateDailyStore] = None) -> None:
         self.base_archive_url = "https://archive-api.open-meteo.com/v1/archive"
         self.base_forecast_url = "https://api.open-meteo.com/v1/forecast"
         self.timeout = settings.CLIMATE.CLIMATE_TIMEOUT_SECONDS
+        self.batch_size = max(1, int(getattr(settings.CLIMATE, "CLIMATE_BATCH_SIZE", 50)))
 
-        self._session = requests.Session()
+        # requests.Session não é thread-safe: uma por thread (o ciclo do
+        # scheduler busca clima em várias threads com o mesmo serviço)
+        self._local = threading.local()
+        self._shared_session: Optional[requests.Session] = None
+
+        # Cache persistente de dias consolidados (None => sempre busca tudo)
+        if store is None and getattr(settings.CLIMATE, "CLIMATE_CACHE_ENABLED", False):
+            store = ClimateDailyStore()
+        self.store = store
+
+    @property
+    def _session(self) -> requests.Session:
+        """
+        Sessão HTTP da thread atual (criada sob demanda), ou a sessão
+        atribuída explicitamente, compartilhada por todas as threads.
+        """
+        if self._shared_session is not None:
+            return self._shared_session
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    @_session.setter
+    def _session(self, session: requests.Session) -> None:
+        self._shared_session = session
 
     # -------------------------------------------------
     # API PÚBLICA
     # -------------------------------------------------
 
+    def provider_node(
+        self,
+        latitude: float,
+        longitude: float,
+        reference_date: date,
+    ) -> Optional[Tuple[float, float, float]]:
+        """
+        Nó da grade (lat, lon, elevação) que o provedor usou da última vez que
+        esta coordenada foi pedida ao endpoint de `reference_date`, ou None se
+        ainda não foi pedida neste processo.
+        """
+        return _PROVIDER_NODES.get(self._node_key(self._select_endpoint(reference_date), latitude, longitude))
+
     def get_daily_series(
         self,
         latitude: float,
@@ -80,39 +140,73 @@ class ClimateService:
 
         url = self._select_endpoint(end_date)
 
+        known = self._load_known_days(latitude, longitude, start_date, end_date)
+        fetch_start = self._first_missing_day(known, start_date, end_date)
+        if fetch_start is None:
+            return [known[d] for d in sorted(known)]
+
         params = {
             "latitude": latitude,
             "longitude": longitude,
-            "daily": "precipitation_sum,temperature_2m_mean,apparent_temperature_mean",
-            "timezone": "UTC",
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
+            **self._daily_params(fetch_start, end_date),
         }
 
-        max_retries = settings.CLIMATE.CLIMATE_MAX_RETRIES
+        payload = self._get_with_retries(url, params)
+        self._remember_node(url, latitude, longitude, payload)
+        fetched = self._normalize_daily_response(payload)
 
-        for attempt in range(max_retries + 1):
-            try:
-                response = self._session.get(
-                    url,
-                    params=params,
-                    timeout=self.timeout,
-                )
-                response.raise_for_status()
-                payload = response.json()
-                break
+        return self._merge_with_known(
+            latitude, longitude, known, fetch_start, fetched, self._complete_days(payload)
+        )
 
-            except requests.RequestException as e:
-                if attempt == max_retries:
-                    raise ClimateServiceError(
-                        f"Open-Meteo Indisponível após {max_retries} tentativas: {repr(e)}"
-                    ) from e
+    def get_daily_series_batch(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        start_date: date,
+        end_date: date,
+    ) -> List[List[Dict]]:
+        """
+        Versão em lote de `get_daily_series`: até CLIMATE_BATCH_SIZE
+        localizações (lat, lon) por requisição à Open-Meteo.
 
-                backoff = 2 ** attempt
-                import time
-                time.sleep(backoff)
+        Retorno
+        -------
+        List[List[Dict]]
+            Uma série normalizada por localização, na ordem de `locations`.
+            Qualquer falha (requisição ou normalização) levanta ClimateServiceError.
+        """
+
+        if start_date > end_date:
+            raise ClimateServiceError("start_date não pode ser maior que end_date")
 
-        return self._normalize_daily_response(payload)
+        url = self._select_endpoint(end_date)
+
+        known = self._load_known_days_batch(locations, start_date, end_date)
+        starts = [self._first_missing_day(k, start_date, end_date) for k in known]
+        results: List[Optional[List[Dict]]] = [
+            [k[d] for d in sorted(k)] if s is None else None
+            for k, s in zip(known, starts)
+        ]
+
+        pending = [i for i, s in enumerate(starts) if s is not None]
+        if pending:
+            # Um único intervalo por requisição: a partir da lacuna mais antiga
+            fetch_start = min(starts[i] for i in pending)
+            extra = self._daily_params(fetch_start, end_date)
+            payloads = self._get_locations(url, [locations[i] for i in pending], extra, retry=True)
+
+            for i, payload in zip(pending, payloads):
+                lat, lon = locations[i]
+                results[i] = self._merge_with_known(
+                    lat,
+                    lon,
+                    known[i],
+                    fetch_start,
+                    self._normalize_daily_response(payload),
+                    self._complete_days(payload),
+                )
+
+        return results
 
     def get_intraday_snapshot(
         self,
@@ -128,30 +222,174 @@ class ClimateService:
         - Busca série horária do dia de referência em UTC
         - Agrega os últimos `window_hours` horários <= reference_ts
         """
-        if reference_ts.tzinfo is None:
-            reference_ts = reference_ts.replace(tzinfo=timezone.utc)
-        else:
-            reference_ts = reference_ts.astimezone(timezone.utc)
+        reference_ts, window_hours = self._normalize_intraday_args(reference_ts, window_hours)
 
-        if window_hours <= 0:
-            window_hours = 3
-
-        ref_date = reference_ts.date()
-        start_date = ref_date - timedelta(days=1)
-        url = self._select_endpoint(ref_date)
+        url = self._select_endpoint(reference_ts.date())
 
         params = {
             "latitude": latitude,
             "longitude": longitude,
-            "hourly": "precipitation,temperature_2m,apparent_temperature",
-            "timezone": "UTC",
-            "start_date": start_date.isoformat(),
-            "end_date": ref_date.isoformat(),
+            **self._hourly_params(reference_ts),
         }
 
         response = self._session.get(url, params=params, timeout=self.timeout)
         response.raise_for_status()
         payload = response.json()
+        self._remember_node(url, latitude, longitude, payload)
+
+        return self._summarize_hourly_response(payload, reference_ts, window_hours)
+
+    def get_intraday_snapshot_batch(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        reference_ts: datetime,
+        window_hours: int = 3,
+    ) -> List[Dict[str, float]]:
+        """
+        Versão em lote de `get_intraday_snapshot` (uma requisição por
+        CLIMATE_BATCH_SIZE localizações). Resumos na ordem de `locations`.
+        """
+        reference_ts, window_hours = self._normalize_intraday_args(reference_ts, window_hours)
+
+        url = self._select_endpoint(reference_ts.date())
+        extra = self._hourly_params(reference_ts)
+
+        return [
+            self._summarize_hourly_response(payload, reference_ts, window_hours)
+            for payload in self._get_locations(url, locations, extra, retry=False)
+        ]
+
+    def get_climate_snapshot(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: date,
+        end_date: date,
+        reference_ts: datetime,
+        window_hours: int = 3,
+    ) -> Tuple[List[Dict], Optional[Dict[str, float]]]:
+        """
+        Série diária + resumo intradiário em UMA requisição (variáveis
+        daily e hourly juntas), no lugar de get_daily_series +
+        get_intraday_snapshot.
+
+        Retorno
+        -------
+        (série diária normalizada, resumo intradiário ou None se a parte
+        horária da resposta for inutilizável)
+        """
+
+        return self.get_climate_snapshot_batch(
+            locations=[(latitude, longitude)],
+            start_date=start_date,
+            end_date=end_date,
+            reference_ts=reference_ts,
+            window_hours=window_hours,
+        )[0]
+
+    def get_climate_snapshot_batch(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        start_date: date,
+        end_date: date,
+        reference_ts: datetime,
+        window_hours: int = 3,
+    ) -> List[Tuple[List[Dict], Optional[Dict[str, float]]]]:
+        """
+        Versão em lote de `get_climate_snapshot` (CLIMATE_BATCH_SIZE
+        localizações por requisição). Resultados na ordem de `locations`.
+
+        A parte diária cobre a lacuna mais antiga (ver cache persistente);
+        a horária fica restrita às 48h do resumo intradiário:
+        - Forecast: start_hour/end_hour limitam as variáveis hourly
+        - Archive: só combina se o intervalo diário couber nas 48h;
+          senão, uma requisição diária e outra horária por lote
+        """
+
+        if start_date > end_date:
+            raise ClimateServiceError("start_date não pode ser maior que end_date")
+
+        reference_ts, window_hours = self._normalize_intraday_args(reference_ts, window_hours)
+        ref_date = reference_ts.date()
+
+        known = self._load_known_days_batch(locations, start_date, end_date)
+        starts = [self._first_missing_day(k, start_date, end_date) for k in known]
+
+        request_start = min([s for s in starts if s is not None] + [ref_date - timedelta(days=1)])
+        request_end = max(end_date, ref_date)
+        url = self._select_endpoint(request_end)
+
+        hourly = self._hourly_params(reference_ts)
+        if url == self.base_forecast_url:
+            extra = self._daily_params(request_start, request_end)
+            extra["hourly"] = hourly["hourly"]
+            extra["start_hour"] = f"{hourly['start_date']}T00:00"
+            extra["end_hour"] = f"{hourly['end_date']}T23:00"
+        elif request_start >= ref_date - timedelta(days=1):
+            extra = self._daily_params(request_start, request_end)
+            extra["hourly"] = hourly["hourly"]
+        else:
+            return self._get_climate_snapshot_split(locations, start_date, end_date, reference_ts, window_hours)
+
+        results: List[Tuple[List[Dict], Optional[Dict[str, float]]]] = []
+        for (lat, lon), known_days, payload in zip(
+            locations, known, self._get_locations(url, locations, extra, retry=True)
+        ):
+            fetched = [
+                item
+                for item in self._normalize_daily_response(payload)
+                if start_date <= item["date"] <= end_date
+            ]
+            series = self._merge_with_known(
+                lat, lon, known_days, request_start, fetched, self._complete_days(payload)
+            )
+
+            try:
+                intraday = self._summarize_hourly_response(payload, reference_ts, window_hours)
+            except ClimateServiceError:
+                intraday = None
+
+            results.append((series, intraday))
+
+        return results
+
+    # -------------------------------------------------
+    # AUXILIARES
+    # -------------------------------------------------
+
+    def _get_climate_snapshot_split(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        start_date: date,
+        end_date: date,
+        reference_ts: datetime,
+        window_hours: int,
+    ) -> List[Tuple[List[Dict], Optional[Dict[str, float]]]]:
+        """
+        Série diária e resumo intradiário em requisições separadas (archive
+        com lacuna diária maior que as 48h horárias).
+        """
+
+        series = self.get_daily_series_batch(locations, start_date, end_date)
+
+        try:
+            intraday: Sequence[Optional[Dict[str, float]]] = self.get_intraday_snapshot_batch(
+                locations, reference_ts, window_hours
+            )
+        except ClimateServiceError:
+            intraday = [None] * len(locations)
+
+        return list(zip(series, intraday))
+
+    def _summarize_hourly_response(
+        self,
+        payload: Dict,
+        reference_ts: datetime,
+        window_hours: int,
+    ) -> Dict[str, float]:
+        """
+        Agrega a série horária de uma localização na janela de referência.
+        """
         hourly = payload.get("hourly") or {}
 
         times = hourly.get("time") or []
@@ -215,9 +453,185 @@ class ClimateService:
             "temperatura_media_2m_C": float(temp_mean_recent),
             "temperatura_aparente_media_2m_C": float(app_temp_mean_recent),
         }
-    # -------------------------------------------------
-    # AUXILIARES
-    # -------------------------------------------------
+
+    def _normalize_intraday_args(self, reference_ts: datetime, window_hours: int) -> Tuple[datetime, int]:
+        if reference_ts.tzinfo is None:
+            reference_ts = reference_ts.replace(tzinfo=timezone.utc)
+        else:
+            reference_ts = reference_ts.astimezone(timezone.utc)
+
+        if window_hours <= 0:
+            window_hours = 3
+
+        return reference_ts, window_hours
+
+    def _load_known_days(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: date,
+        end_date: date,
+    ) -> Dict[date, Dict]:
+        if self.store is None:
+            return {}
+        return self.store.load(latitude, longitude, start_date, end_date)
+
+    def _load_known_days_batch(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        start_date: date,
+        end_date: date,
+    ) -> List[Dict[date, Dict]]:
+        if self.store is None:
+            return [{} for _ in locations]
+        return self.store.load_many(locations, start_date, end_date)
+
+    def _first_missing_day(self, known: Dict[date, Dict], start_date: date, end_date: date) -> Optional[date]:
+        """
+        Primeiro dia do intervalo que precisa ir ao provedor (None => nenhum).
+        """
+        day = start_date
+        while day <= end_date:
+            if day not in known:
+                return day
+            day += timedelta(days=1)
+        return None
+
+    def _merge_with_known(
+        self,
+        latitude: float,
+        longitude: float,
+        known: Dict[date, Dict],
+        fetch_start: date,
+        fetched: List[Dict],
+        complete_days: Set[date],
+    ) -> List[Dict]:
+        """
+        Dias locais anteriores à busca + dias buscados; grava os consolidados
+        (só dias de `complete_days`, ver ClimateDailyStore.save).
+        """
+        if self.store is None:
+            return fetched
+
+        known_days = {d for d in known if d < fetch_start}
+        new_final = [item for item in fetched if item["date"] not in known_days]
+        self.store.save(latitude, longitude, new_final, complete_days)
+
+        return [known[d] for d in sorted(known_days)] + fetched
+
+    def _daily_params(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        return {
+            "daily": "precipitation_sum,temperature_2m_mean,apparent_temperature_mean",
+            "timezone": "UTC",
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+        }
+
+    def _hourly_params(self, reference_ts: datetime) -> Dict[str, Any]:
+        ref_date = reference_ts.date()
+        return {
+            "hourly": "precipitation,temperature_2m,apparent_temperature",
+            "timezone": "UTC",
+            "start_date": (ref_date - timedelta(days=1)).isoformat(),
+            "end_date": ref_date.isoformat(),
+        }
+
+    def _get_with_retries(self, url: str, params: Dict[str, Any]) -> Any:
+        """
+        GET com backoff exponencial (CLIMATE_MAX_RETRIES).
+        """
+        max_retries = settings.CLIMATE.CLIMATE_MAX_RETRIES
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = self._session.get(
+                    url,
+                    params=params,
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+                return response.json()
+
+            except requests.RequestException as e:
+                if attempt == max_retries:
+                    raise ClimateServiceError(
+                        f"Open-Meteo Indisponível após {max_retries} tentativas: {repr(e)}"
+                    ) from e
+
+                backoff = 2 ** attempt
+                import time
+                time.sleep(backoff)
+
+    def _get_locations(
+        self,
+        url: str,
+        locations: Sequence[Tuple[float, float]],
+        extra_params: Dict[str, Any],
+        retry: bool,
+    ) -> List[Dict]:
+        """
+        Busca várias localizações (latitude/longitude separadas por vírgula),
+        em blocos de `batch_size`. A Open-Meteo responde uma lista com um
+        objeto por localização (ou um objeto só, se houver uma).
+        """
+        payloads: List[Dict] = []
+
+        for i in range(0, len(locations), self.batch_size):
+            chunk = locations[i:i + self.batch_size]
+            params = {
+                "latitude": ",".join(str(float(lat)) for lat, _ in chunk),
+                "longitude": ",".join(str(float(lon)) for _, lon in chunk),
+                **extra_params,
+            }
+
+            if retry:
+                data = self._get_with_retries(url, params)
+            else:
+                try:
+                    response = self._session.get(url, params=params, timeout=self.timeout)
+                    response.raise_for_status()
+                    data = response.json()
+                except requests.RequestException as e:
+                    raise ClimateServiceError(f"Open-Meteo indisponível: {repr(e)}") from e
+
+            if isinstance(data, dict):
+                data = [data]
+
+            if not isinstance(data, list) or len(data) != len(chunk):
+                raise ClimateServiceError(
+                    f"Open-Meteo retornou {len(data) if isinstance(data, list) else 'N/A'} "
+                    f"localizações para {len(chunk)} solicitadas."
+                )
+
+            for (lat, lon), payload in zip(chunk, data):
+                self._remember_node(url, lat, lon, payload)
+            payloads.extend(data)
+
+        return payloads
+
+    def _node_key(self, url: str, latitude: float, longitude: float) -> Tuple[str, float, float]:
+        return (
+            url,
+            round(float(latitude), _NODE_KEY_PRECISION),
+            round(float(longitude), _NODE_KEY_PRECISION),
+        )
+
+    def _remember_node(self, url: str, latitude: float, longitude: float, payload: Any) -> None:
+        """
+        Guarda o nó reportado na resposta (latitude, longitude, elevation).
+        Respostas sem esses campos são ignoradas.
+        """
+        if not isinstance(payload, dict):
+            return
+        try:
+            node = (
+                float(payload["latitude"]),
+                float(payload["longitude"]),
+                float(payload["elevation"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return
+        _PROVIDER_NODES.put(self._node_key(url, latitude, longitude), node)
 
     def _select_endpoint(self, reference_date: date) -> str:
         """
@@ -232,6 +646,24 @@ class ClimateService:
 
         return self.base_forecast_url
 
+    def _complete_days(self, payload: Dict) -> Set[date]:
+        """
+        Dias da resposta diária com todas as variáveis brutas preenchidas
+        (a normalização troca nulos por 0.0; esses dias não podem ser gravados).
+        """
+        daily = payload.get("daily") or {}
+        columns = [
+            daily.get("precipitation_sum") or [],
+            daily.get("temperature_2m_mean") or [],
+            daily.get("apparent_temperature_mean") or [],
+        ]
+
+        complete: Set[date] = set()
+        for i, day in enumerate(daily.get("time") or []):
+            if all(i < len(col) and col[i] is not None for col in columns):
+                complete.add(date.fromisoformat(day))
+        return complete
+
     def _normalize_daily_response(self, payload: Dict) -> List[Dict]:
         """
         Normaliza estrutura retornada pela Open-Meteo.
@@ -0,0 +1,165 @@
+"""
+climate_store.py
+
+Cache persistente (tabela climate_daily) da série diária normalizada
+da Open-Meteo, por localização.
+
+Regra de consolidação (um dia só é gravado se atender a todas):
+- Veio completo do provedor (nenhuma das variáveis brutas nula)
+- É anterior a hoje - CLIMATE_FINAL_LAG_DAYS (UTC)
+- Está CLIMATE_FINAL_LAG_DAYS antes do último dia completo da própria
+  resposta: o horizonte de dados do provedor (ex: atraso do archive) também
+  precisa ter passado por ele, não só o relógio
+- Os demais são sempre buscados no provedor e nunca gravados
+
+Este módulo:
+- NÃO chama o provedor (ClimateService decide o que buscar)
+- Abre uma sessão curta por operação (é usado a partir das threads do ciclo)
+- Nunca propaga erro de banco: falhas são registradas no log e viram "cache vazio"
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.app import database
+from backend.app.models.climate_daily import ClimateDaily
+from backend.app.repositories.climate_daily_repository import ClimateDailyRepository
+from backend.app.settings import settings
+
+
+# Casas decimais da chave de localização (~11 m)
+LOCATION_PRECISION: int = 4
+
+logger = logging.getLogger("climagyn.backend.climate_store")
+
+
+class ClimateDailyStore:
+    """
+    Leitura/gravação de dias consolidados por localização.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        final_lag_days: Optional[int] = None,
+    ) -> None:
+        self._session_factory = session_factory or (lambda: database.SessionLocal())
+        lag = final_lag_days if final_lag_days is not None else getattr(settings.CLIMATE, "CLIMATE_FINAL_LAG_DAYS", 5)
+        self.final_lag_days = max(0, int(lag))
+
+    def location_key(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        return round(float(latitude), LOCATION_PRECISION), round(float(longitude), LOCATION_PRECISION)
+
+    def final_before(self) -> date:
+        """
+        Dias estritamente anteriores a esta data (UTC, mesmo fuso das séries
+        da Open-Meteo) são consolidados.
+        """
+        return datetime.now(timezone.utc).date() - timedelta(days=self.final_lag_days)
+
+    def load(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: date,
+        end_date: date,
+    ) -> Dict[date, Dict]:
+        """
+        Dias armazenados no intervalo, no formato de
+        ClimateService._normalize_daily_response.
+        """
+        return self.load_many([(latitude, longitude)], start_date, end_date)[0]
+
+    def load_many(
+        self,
+        locations: Sequence[Tuple[float, float]],
+        start_date: date,
+        end_date: date,
+    ) -> List[Dict[date, Dict]]:
+        """
+        Versão em lote de `load`: todas as localizações em uma sessão
+        (ClimateDailyRepository.list_days_for_locations). Resultados na ordem
+        de `locations`.
+        """
+        keys = [self.location_key(lat, lon) for lat, lon in locations]
+        if not keys:
+            return []
+
+        try:
+            with self._session_factory() as session:
+                rows = ClimateDailyRepository(session).list_days_for_locations(
+                    sorted(set(keys)), start_date, end_date
+                )
+        except Exception:
+            logger.warning(
+                "Falha ao ler climate_daily (%d localizações, %s a %s); seguindo sem cache",
+                len(keys),
+                start_date,
+                end_date,
+                exc_info=True,
+            )
+            return [{} for _ in keys]
+
+        by_location: Dict[Tuple[float, float], Dict[date, Dict]] = {}
+        for row in rows:
+            by_location.setdefault((row.latitude, row.longitude), {})[row.day] = {
+                "date": row.day,
+                "precipitacao_total_mm": float(row.precipitacao_total_mm),
+                "temperatura_media_2m_C": float(row.temperatura_media_2m_c),
+                "temperatura_aparente_media_2m_C": float(row.temperatura_aparente_media_2m_c),
+            }
+
+        return [dict(by_location.get(key, {})) for key in keys]
+
+    def save(
+        self,
+        latitude: float,
+        longitude: float,
+        series: List[Dict],
+        complete_days: Collection[date],
+    ) -> int:
+        """
+        Grava os dias consolidados de uma série normalizada. Retorna quantos.
+
+        complete_days: dias da resposta com todas as variáveis brutas preenchidas
+        (a normalização troca nulos por 0.0; só o chamador sabe quais vieram nulos).
+        """
+        if not complete_days:
+            return 0
+
+        horizon = max(complete_days) - timedelta(days=self.final_lag_days)
+        cutoff = min(self.final_before(), horizon)
+        lat, lon = self.location_key(latitude, longitude)
+
+        rows = [
+            ClimateDaily(
+                latitude=lat,
+                longitude=lon,
+                day=item["date"],
+                precipitacao_total_mm=float(item["precipitacao_total_mm"]),
+                temperatura_media_2m_c=float(item["temperatura_media_2m_C"]),
+                temperatura_aparente_media_2m_c=float(item["temperatura_aparente_media_2m_C"]),
+            )
+            for item in series
+            if item["date"] < cutoff and item["date"] in complete_days
+        ]
+        if not rows:
+            return 0
+
+        try:
+            with self._session_factory() as session:
+                return ClimateDailyRepository(session).save_days(rows)
+        except Exception:
+            logger.warning(
+                "Falha ao gravar %d dias em climate_daily (%s, %s)",
+                len(rows),
+                lat,
+                lon,
+                exc_info=True,
+            )
+            return 0
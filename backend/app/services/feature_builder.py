@@ -16,6 +16,8 @@ from typing import Dict, List
 from datetime import date
 import math
 
+import numpy as np
+
 
 # =====================================================
 # CONTRATO FORMAL DE FEATURES (ORDEM DO MODELO)
@@ -46,6 +48,14 @@ FEATURE_ORDER: List[str] = [
 ]
 
 
+# Colunas da matriz `today` em build_features_batch
+TODAY_COLUMNS: List[str] = [
+    "precipitacao_total_mm",
+    "temperatura_media_2m_C",
+    "temperatura_aparente_media_2m_C",
+]
+
+
 # =====================================================
 # EXCEÇÃO
 # =====================================================
@@ -174,6 +184,94 @@ class FeatureBuilder:
                 f"Erro ao construir features (data={target_date}): {e}"
             )
 
+    def build_features_batch(
+        self,
+        today: np.ndarray,
+        precip_history: np.ndarray,
+        temp_history: np.ndarray,
+        target_date: date,
+    ) -> np.ndarray:
+        """
+        Versão vetorizada de `build_features` para vários pontos da mesma data.
+
+        - today: (n_pontos x 3), colunas em TODAY_COLUMNS
+        - precip_history / temp_history: (n_pontos x n_dias), coluna 0 = ontem
+
+        Retorna matriz (n_pontos x len(FEATURE_ORDER)) na ordem do modelo,
+        numericamente idêntica ao caminho escalar (somas acumuladas na mesma
+        ordem que `sum()` sobre as fatias).
+        """
+
+        try:
+            today = np.asarray(today, dtype=float)
+            precip = np.asarray(precip_history, dtype=float)
+            temp = np.asarray(temp_history, dtype=float)
+
+            n = today.shape[0]
+            if today.shape != (n, len(TODAY_COLUMNS)):
+                raise FeatureBuilderError(f"today deve ter shape (n, {len(TODAY_COLUMNS)}); recebido {today.shape}")
+            if precip.ndim != 2 or precip.shape[0] != n or temp.ndim != 2 or temp.shape[0] != n:
+                raise FeatureBuilderError(
+                    f"Históricos devem ter {n} linhas; recebido {precip.shape} e {temp.shape}"
+                )
+
+            cols: Dict[str, np.ndarray] = {}
+
+            # =================================================
+            # BASE DIRETA
+            # =================================================
+
+            for j, name in enumerate(TODAY_COLUMNS):
+                cols[name] = today[:, j]
+
+            # =================================================
+            # MÉDIAS MÓVEIS
+            # =================================================
+
+            precip_cumsum = np.cumsum(precip, axis=1)
+            for window in (7, 30, 90):
+                cols[f"precipitacao_ma_{window}d"] = self._moving_average_batch(precip_cumsum, window, n)
+
+            # =================================================
+            # ANOMALIAS + INTENSIDADE
+            # =================================================
+
+            total = cols["precipitacao_total_mm"]
+            media_7d = cols["precipitacao_ma_7d"]
+
+            cols["anomalia_precip_7d"] = total - media_7d
+            cols["anomalia_precip_30d"] = total - cols["precipitacao_ma_30d"]
+
+            intensidade = np.zeros(n, dtype=float)
+            np.divide(total, media_7d, out=intensidade, where=media_7d > 0)
+            cols["intensidade_precipitacao"] = intensidade
+
+            # =================================================
+            # LAGS
+            # =================================================
+
+            for lag in (1, 2, 3, 7, 14, 30):
+                cols[f"precipitacao_lag_{lag}d"] = self._lag_batch(precip, lag, n)
+
+            cols["temperatura_lag_1d"] = self._lag_batch(temp, 1, n)
+            cols["temperatura_lag_7d"] = self._lag_batch(temp, 7, n)
+
+            # =================================================
+            # COMPONENTES SAZONAIS (mesma data para todos)
+            # =================================================
+
+            for name, value in self._seasonal_components(target_date).items():
+                cols[name] = np.full(n, value, dtype=float)
+
+            self._validate(cols)
+
+            return np.column_stack([cols[f] for f in FEATURE_ORDER]) if n else np.zeros((0, len(FEATURE_ORDER)))
+
+        except Exception as e:
+            raise FeatureBuilderError(
+                f"Erro ao construir features em lote (data={target_date}): {e}"
+            )
+
     # -------------------------------------------------
     # HELPERS
     # -------------------------------------------------
@@ -189,6 +287,23 @@ class FeatureBuilder:
         # Média móvel deve usar os dias mais recentes.
         return sum(series[:window]) / window
 
+    def _moving_average_batch(self, cumsum: np.ndarray, window: int, n: int) -> np.ndarray:
+        days = cumsum.shape[1]
+        if days == 0:
+            return np.zeros(n, dtype=float)
+
+        if days < window:
+            return cumsum[:, -1] / days
+
+        return cumsum[:, window - 1] / window
+
+    def _lag_batch(self, history: np.ndarray, lag: int, n: int) -> np.ndarray:
+        days = history.shape[1]
+        if days == 0:
+            return np.zeros(n, dtype=float)
+
+        return history[:, min(lag, days) - 1].copy()
+
     def _lag(self, series: List[float], lag: int) -> float:
         if not series:
             return 0.0
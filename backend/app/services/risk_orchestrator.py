@@ -11,11 +11,17 @@ Este arquivo:
 
 from __future__ import annotations
 
+import logging
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, date, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import requests
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from backend.app.settings import settings
@@ -23,7 +29,12 @@ from backend.app.models.point import Point
 from backend.app.models.risk_snapshot import RiskSnapshot
 from backend.app.repositories.risk_repository import RiskRepository
 from backend.app.services.climate_service import ClimateService
-from backend.app.services.feature_builder import FeatureBuilder, FEATURE_ORDER
+from backend.app.services.feature_builder import FeatureBuilder, FEATURE_ORDER, TODAY_COLUMNS
+from backend.app.utils.db_metrics import count_round_trips
+from backend.app.utils.single_flight import SingleFlight
+
+
+logger = logging.getLogger("climagyn.backend.risk_orchestrator")
 
 
 # ============================================================
@@ -53,6 +64,29 @@ class RiskResult:
     chuva_90d: float
 
 
+@dataclass(frozen=True)
+class PointInput:
+    """
+    Dados do ponto desacoplados da sessão ORM: podem ir para threads de
+    cálculo sem risco de lazy-load concorrente na mesma Session.
+    """
+    id: str
+    latitude: float
+    longitude: float
+
+
+# (climate_today, climate_history) já prontos para o FeatureBuilder
+ClimateInputs = Tuple[Dict[str, Any], Dict[str, List[float]]]
+
+
+# Cálculos sob demanda em andamento por (point_id, reference_ts), no processo.
+# O orquestrador é criado por requisição; o registro precisa ser do módulo.
+_ON_DEMAND_FLIGHTS: SingleFlight[Tuple[str, datetime], RiskSnapshot] = SingleFlight()
+
+# Namespace (1º argumento) de pg_advisory_xact_lock(int, int) para pontos
+_POINT_LOCK_NAMESPACE: int = 0x1C4A
+
+
 # ============================================================
 # ORQUESTRATOR
 # ============================================================
@@ -73,11 +107,37 @@ class RiskOrchestrator:
         self.repo = repository
         self.climate_service = climate_service or ClimateService()
         self.feature_builder = feature_builder or FeatureBuilder()
-        self.http = http_session or requests.Session()
+        # requests.Session não é thread-safe: sem sessão injetada, uma por thread
+        # (a IA pode ser chamada das threads do ciclo, ver _score_cycle_batch)
+        self._http_local = threading.local()
+        self._shared_http: Optional[requests.Session] = http_session
         self.history_days: int = int(getattr(getattr(settings, "RISK", object()), "HISTORY_DAYS", 90))
         self.snapshot_ttl_seconds: int = int(settings.RISK.SNAPSHOT_TTL_SECONDS)
         interval_seconds = int(settings.RISK.SCHEDULE_INTERVAL_SECONDS)
         self.rounding_minutes: int = max(1, interval_seconds // 60)
+        self.cycle_parallelism: int = max(1, int(getattr(settings.RISK, "CYCLE_PARALLELISM", 8)))
+        self.icra_batch_size: int = max(1, int(getattr(settings.IA, "BATCH_SIZE", 256)))
+        self.snapshot_upsert_chunk: int = max(1, int(getattr(settings.RISK, "SNAPSHOT_UPSERT_CHUNK_SIZE", 500)))
+        self.coalesce_climate: bool = bool(getattr(settings.CLIMATE, "CLIMATE_COALESCE_BY_PROVIDER_NODE", True))
+
+    @property
+    def http(self) -> requests.Session:
+        """
+        Sessão HTTP da IA: a injetada no construtor (compartilhada) ou uma
+        por thread, criada sob demanda.
+        """
+        if self._shared_http is not None:
+            return self._shared_http
+
+        session = getattr(self._http_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._http_local.session = session
+        return session
+
+    @http.setter
+    def http(self, session: requests.Session) -> None:
+        self._shared_http = session
 
     # --------------------------------------------------------
     # PÚBLICOS (chamados por rotas / scheduler)
@@ -141,55 +201,168 @@ class RiskOrchestrator:
         Fallback sob demanda:
         - Se já existe snapshot “fresco” do ciclo, devolve.
         - Se não existe / expirou / force=True, recalcula e salva.
+
+        Requisições concorrentes para o mesmo (ponto, ciclo) esperam um único
+        cálculo (single flight) e relêem o snapshot salvo na própria sessão.
+        Com RISK.ON_DEMAND_DB_LOCK, o cálculo também é serializado entre
+        processos por advisory lock do PostgreSQL.
         """
         ref = reference_ts or self.get_reference_ts_now()
         point = self.get_point(db, point_id)
 
         if not force_recompute:
-            latest = self.repo.get_latest_by_point(point_id)
-            if latest and latest.snapshot_timestamp == ref:
-                if not self._is_expired(latest):
-                    return latest
+            fresh = self._get_fresh_snapshot(point_id, ref)
+            if fresh is not None:
+                return fresh
+
+        def _compute() -> RiskSnapshot:
+            locked = self._acquire_point_db_lock(db, point_id, ref)
+            try:
+                if locked and not force_recompute:
+                    # Outro processo pode ter calculado enquanto esperávamos o lock
+                    fresh = self._get_fresh_snapshot(point_id, ref)
+                    if fresh is not None:
+                        db.commit()
+                        return fresh
+
+                computed = self._compute_point_risk(point=point, reference_ts=ref, source="on_demand")
+                # O commit do save libera o lock de transação
+                return self.repo.save_snapshot(computed)
+
+            except Exception:
+                if locked:
+                    db.rollback()
+                raise
+
+        saved, leader = _ON_DEMAND_FLIGHTS.do((point_id, ref), _compute)
+        if leader:
+            return saved
+
+        # Instância do líder pertence à sessão de outra requisição: relê na
+        # sessão desta. `saved` só se a releitura não encontrar (não deveria:
+        # o líder já fez commit).
+        shared = self.repo.get_snapshot(point_id, ref)
+        if shared is not None:
+            return shared
 
-        computed = self._compute_point_risk(point=point, reference_ts=ref, source="on_demand") 
-        saved = self.repo.save_snapshot(computed)
         return saved
 
+    def _get_fresh_snapshot(self, point_id: str, reference_ts: datetime) -> Optional[RiskSnapshot]:
+        latest = self.repo.get_latest_by_point(point_id)
+        if latest and latest.snapshot_timestamp == reference_ts and not self._is_expired(latest):
+            return latest
+        return None
+
+    def _acquire_point_db_lock(self, db: Session, point_id: str, reference_ts: datetime) -> bool:
+        """
+        pg_advisory_xact_lock por (ponto, ciclo), liberado no fim da transação.
+        False => lock desabilitado ou banco sem advisory locks.
+        """
+        if not bool(getattr(settings.RISK, "ON_DEMAND_DB_LOCK", False)):
+            return False
+
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+
+        key = zlib.crc32(f"{point_id}|{reference_ts.isoformat()}".encode("utf-8"))
+        if key >= 2 ** 31:
+            key -= 2 ** 32
+
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :key)"),
+            {"namespace": _POINT_LOCK_NAMESPACE, "key": key},
+        )
+        return True
+
     def compute_all_points_for_cycle(
         self,
         db: Session,
         reference_ts: Optional[datetime] = None,
         only_active: bool = True,
         skip_if_exists: bool = True,
+        parallelism: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Scheduler:
         - Calcula snapshot para todos os pontos do ciclo `reference_ts`
         - Persiste no banco
         - Retorna um pequeno resumo para logs/observabilidade
+
+        parallelism: threads do pool do ciclo (default: RISK.CYCLE_PARALLELISM), limitado
+        ao número de pontos a calcular; o valor efetivo volta em `parallelism` no resumo.
+        No pool rodam clima + features, uma vez por nó da grade do provedor já
+        conhecido (CLIMATE.CLIMATE_COALESCE_BY_PROVIDER_NODE; replicadas aos pontos do nó)
+        ou por ponto, e a chamada à IA por ponto quando a chamada em lote
+        (IA.BATCH_SIZE pontos) falha.
+        Leitura/escrita no banco ficam na thread do ciclo, com a `db` recebida.
+        Falha em um ponto não afeta os demais; a ordem de saída de cada lote é preservada.
+
+        O resumo traz `db_round_trips`: statements + commits/rollbacks feitos pela
+        thread do ciclo (None se a sessão não puder ser instrumentada), e
+        `snapshot_upsert_fallbacks`: lotes cujo upsert em massa falhou e foram
+        regravados linha a linha (ver log de warning).
         """
         ref = reference_ts or self.get_reference_ts_now()
+        workers = max(1, int(parallelism if parallelism is not None else self.cycle_parallelism))
+
+        with count_round_trips(db) as round_trips:
+            summary = self._run_cycle(db, ref, only_active, skip_if_exists, workers)
+
+        summary["db_round_trips"] = round_trips.value
+        return summary
+
+    def _run_cycle(
+        self,
+        db: Session,
+        ref: datetime,
+        only_active: bool,
+        skip_if_exists: bool,
+        workers: int,
+    ) -> Dict[str, Any]:
         points = self.list_points(db, only_active=only_active)
 
         created = 0
         reused = 0
         failed: List[Dict[str, str]] = []
+        pending: List[PointInput] = []
+
+        # Uma consulta para o bucket inteiro (antes: get_latest_by_point por ponto)
+        existing = self.repo.get_point_ids_by_bucket(ref) if skip_if_exists and points else set()
 
         for p in points:
             try:
-                if skip_if_exists:
-                    latest = self.repo.get_latest_by_point(p.id)
-                    if latest and latest.snapshot_timestamp == ref:
-                        reused += 1
-                        continue
+                if p.id in existing:
+                    reused += 1
+                    continue
 
-                snap = self._compute_point_risk(point=p, reference_ts=ref, source="scheduler")
-                self.repo.save_snapshot(snap)
-                created += 1
+                pending.append(PointInput(id=p.id, latitude=float(p.latitude), longitude=float(p.longitude)))
 
             except Exception as e:
                 failed.append({"point_id": p.id, "error": repr(e)})
 
+        groups = self._group_by_climate_node(pending, ref)
+        to_save: List[RiskSnapshot] = []
+        upsert_fallbacks = 0
+
+        # Pool do ciclo: nunca maior que o número de pontos a calcular
+        workers = min(workers, max(1, len(pending)))
+
+        for point, snap, error in self._iter_cycle_snapshots(groups, ref, workers):
+            if error is not None:
+                failed.append({"point_id": point.id, "error": repr(error)})
+                continue
+
+            to_save.append(snap)
+            if len(to_save) >= self.snapshot_upsert_chunk:
+                saved, fell_back = self._persist_cycle_snapshots(to_save, failed)
+                created += saved
+                upsert_fallbacks += int(fell_back)
+                to_save = []
+
+        saved, fell_back = self._persist_cycle_snapshots(to_save, failed)
+        created += saved
+        upsert_fallbacks += int(fell_back)
+
         return {
             "reference_ts": ref.isoformat(),
             "total_points": len(points),
@@ -197,29 +370,418 @@ class RiskOrchestrator:
             "reused": reused,
             "failed_count": len(failed),
             "failed": failed[:10],
+            "parallelism": workers,
+            "climate_requests_coalesced": len(pending) - len(groups),
+            "snapshot_upsert_fallbacks": upsert_fallbacks,
+        }
+
+    def _persist_cycle_snapshots(
+        self,
+        snapshots: List[RiskSnapshot],
+        failed: List[Dict[str, str]],
+    ) -> Tuple[int, bool]:
+        """
+        Grava os snapshots do ciclo em um upsert em massa. Se o lote falhar,
+        registra o erro (warning), desfaz a transação e regrava um a um para
+        isolar o ponto problemático.
+
+        Retorna (quantos gravou, se caiu no fallback por linha).
+        """
+        if not snapshots:
+            return 0, False
+
+        if not hasattr(self.repo, "upsert_snapshots"):
+            return self._save_snapshots_one_by_one(snapshots, failed), False
+
+        try:
+            self.repo.upsert_snapshots(snapshots, chunk_size=self.snapshot_upsert_chunk)
+            return len(snapshots), False
+        except Exception:
+            logger.warning(
+                "Upsert em massa de %d snapshots falhou; regravando um a um.",
+                len(snapshots),
+                exc_info=True,
+            )
+            session = getattr(self.repo, "db", None)
+            if session is not None:
+                session.rollback()
+
+        return self._save_snapshots_one_by_one(snapshots, failed), True
+
+    def _save_snapshots_one_by_one(
+        self,
+        snapshots: List[RiskSnapshot],
+        failed: List[Dict[str, str]],
+    ) -> int:
+        saved = 0
+        for snap in snapshots:
+            try:
+                self.repo.save_snapshot(snap)
+                saved += 1
+            except Exception as e:
+                failed.append({"point_id": snap.point_id, "error": repr(e)})
+
+        return saved
+
+    def _group_by_climate_node(self, pending: List[PointInput], reference_ts: datetime) -> List[List[PointInput]]:
+        """
+        Agrupa pontos pelo nó da grade que o provedor climático reportou para
+        eles (ClimateService.provider_node), preservando a ordem de chegada.
+        Nó igual => dados iguais, então o primeiro ponto do grupo representa
+        os demais sem aproximação. Pontos de nó ainda desconhecido ficam
+        sozinhos (a busca deles ensina o nó para os próximos ciclos).
+        """
+        provider_node = getattr(self.climate_service, "provider_node", None)
+        if not self.coalesce_climate or provider_node is None:
+            return [[p] for p in pending]
+
+        target_date = reference_ts.date()
+        groups: Dict[Tuple[Any, ...], List[PointInput]] = {}
+        for p in pending:
+            node = provider_node(p.latitude, p.longitude, target_date)
+            key = ("node", node) if node is not None else ("point", p.id)
+            groups.setdefault(key, []).append(p)
+
+        return list(groups.values())
+
+    def _iter_cycle_snapshots(
+        self,
+        groups: List[List[PointInput]],
+        reference_ts: datetime,
+        workers: int,
+    ) -> Iterator[Tuple[PointInput, Optional[RiskSnapshot], Optional[Exception]]]:
+        """
+        Gera (ponto, snapshot, erro) à medida que cada lote é pontuado pela IA.
+
+        Um único pool de `workers` threads (workers <= 1 => sem pool) atende
+        tanto a busca de clima/features dos grupos sem pré-busca quanto a
+        chamada à IA por ponto quando a chamada em lote falha.
+        """
+        ready: List[Tuple[PointInput, Dict[str, float]]] = []
+
+        climate = self._prefetch_cycle_climate(groups, reference_ts)
+
+        pool = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="risk-cycle")
+            if workers > 1
+            else None
+        )
+        try:
+            for p, features, error in self._iter_cycle_features(groups, climate, reference_ts, pool):
+                if error is not None:
+                    yield p, None, error
+                    continue
+
+                ready.append((p, features))
+                if len(ready) >= self.icra_batch_size:
+                    yield from self._score_cycle_batch(ready, reference_ts, pool)
+                    ready = []
+
+            if ready:
+                yield from self._score_cycle_batch(ready, reference_ts, pool)
+
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def _prefetch_cycle_climate(
+        self,
+        groups: List[List[PointInput]],
+        reference_ts: datetime,
+    ) -> List[Optional[ClimateInputs]]:
+        """
+        Busca o clima de todos os grupos em requisições multi-localização
+        (ClimateService.get_*_batch). Posições None (provedor sem lote,
+        falha do lote ou da normalização) são buscadas individualmente depois.
+        """
+        prefetched: List[Optional[ClimateInputs]] = [None] * len(groups)
+        if len(groups) <= 1 or not hasattr(self.climate_service, "get_daily_series_batch"):
+            return prefetched
+
+        target_date = reference_ts.date()
+        locations = [(float(g[0].latitude), float(g[0].longitude)) for g in groups]
+        start_date = target_date - timedelta(days=self.history_days)
+
+        try:
+            fetched = self._fetch_cycle_climate_batch(locations, start_date, target_date, reference_ts)
+        except Exception:
+            return prefetched
+
+        for i, (series, intraday) in enumerate(fetched):
+            try:
+                climate_today, history = self._series_to_today_and_history(series, target_date=target_date)
+            except Exception:
+                continue
+
+            if intraday is not None:
+                climate_today = self._merge_intraday(climate_today, intraday)
+            prefetched[i] = (climate_today, history)
+
+        return prefetched
+
+    def _fetch_cycle_climate_batch(
+        self,
+        locations: List[Tuple[float, float]],
+        start_date: date,
+        end_date: date,
+        reference_ts: datetime,
+    ) -> List[Tuple[Any, Optional[Dict[str, float]]]]:
+        """
+        (série diária, resumo intradiário) por localização. Usa a busca
+        combinada quando o provedor oferece; senão, diária + horária em lote.
+        """
+        if hasattr(self.climate_service, "get_climate_snapshot_batch"):
+            return self.climate_service.get_climate_snapshot_batch(
+                locations=locations,
+                start_date=start_date,
+                end_date=end_date,
+                reference_ts=reference_ts,
+                window_hours=3,
+            )
+
+        series_list = self.climate_service.get_daily_series_batch(
+            locations=locations,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        intraday_list: List[Optional[Dict[str, float]]] = [None] * len(locations)
+        if hasattr(self.climate_service, "get_intraday_snapshot_batch"):
+            try:
+                intraday_list = list(
+                    self.climate_service.get_intraday_snapshot_batch(
+                        locations=locations,
+                        reference_ts=reference_ts,
+                        window_hours=3,
+                    )
+                )
+            except Exception:
+                pass
+
+        return list(zip(series_list, intraday_list))
+
+    def _iter_cycle_features(
+        self,
+        groups: List[List[PointInput]],
+        climate: List[Optional[ClimateInputs]],
+        reference_ts: datetime,
+        pool: Optional[ThreadPoolExecutor],
+    ) -> Iterator[Tuple[PointInput, Optional[Dict[str, float]], Optional[Exception]]]:
+        """
+        Gera (ponto, features, erro) à medida que cada grupo termina; as
+        features do representante valem para todos os pontos do grupo.
+
+        Grupos com clima pré-buscado saem de uma única passada vetorizada
+        (FeatureBuilder.build_features_batch); os demais buscam o clima nas
+        threads do `pool`. Sem pool => sequencial, na ordem dos grupos.
+        """
+        rows = self._build_features_rows(climate, reference_ts.date())
+        for group, features in zip(groups, rows):
+            if features is not None:
+                for p in group:
+                    yield p, dict(features), None
+
+        remaining = [(g, c) for g, c, features in zip(groups, climate, rows) if features is None]
+        if not remaining:
+            return
+        groups, climate = [g for g, _ in remaining], [c for _, c in remaining]
+
+        if pool is None or len(groups) <= 1:
+            for group, climate_inputs in zip(groups, climate):
+                try:
+                    features = self._build_point_features(
+                        point=group[0], reference_ts=reference_ts, climate_inputs=climate_inputs
+                    )
+                except Exception as e:
+                    for p in group:
+                        yield p, None, e
+                    continue
+
+                for p in group:
+                    yield p, dict(features), None
+            return
+
+        futures = {
+            pool.submit(
+                self._build_point_features,
+                point=group[0],
+                reference_ts=reference_ts,
+                climate_inputs=climate_inputs,
+            ): group
+            for group, climate_inputs in zip(groups, climate)
         }
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                features = future.result()
+            except Exception as e:
+                for p in group:
+                    yield p, None, e
+                continue
+
+            for p in group:
+                yield p, dict(features), None
+
+    def _build_features_rows(
+        self,
+        climate: List[Optional[ClimateInputs]],
+        target_date: date,
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        Features (na ordem do modelo) dos grupos com clima pré-buscado, em uma
+        chamada a build_features_batch. None => grupo segue pelo caminho escalar
+        (sem clima, históricos de tamanhos diferentes ou falha do lote).
+        """
+        rows: List[Optional[Dict[str, float]]] = [None] * len(climate)
+        ready = [i for i, c in enumerate(climate) if c is not None]
+        if not ready or not hasattr(self.feature_builder, "build_features_batch"):
+            return rows
+
+        precip = [list(climate[i][1].get("precipitacao_total_mm", [])) for i in ready]
+        temp = [list(climate[i][1].get("temperatura_media_2m_C", [])) for i in ready]
+        if len({len(h) for h in precip + temp}) != 1:
+            return rows
+
+        today = [[float(climate[i][0].get(k, 0.0)) for k in TODAY_COLUMNS] for i in ready]
+
+        try:
+            matrix = self.feature_builder.build_features_batch(
+                today=np.array(today, dtype=float),
+                precip_history=np.array(precip, dtype=float).reshape(len(ready), -1),
+                temp_history=np.array(temp, dtype=float).reshape(len(ready), -1),
+                target_date=target_date,
+            )
+        except Exception:
+            return rows
+
+        for i, values in zip(ready, matrix.tolist()):
+            rows[i] = dict(zip(FEATURE_ORDER, values))
+
+        return rows
+
+    def _score_cycle_batch(
+        self,
+        batch: List[Tuple[PointInput, Dict[str, float]]],
+        reference_ts: datetime,
+        pool: Optional[ThreadPoolExecutor] = None,
+    ) -> Iterator[Tuple[PointInput, Optional[RiskSnapshot], Optional[Exception]]]:
+        """
+        Pontua um lote com uma chamada à IA. Se a chamada em lote falhar
+        (ex: API de IA sem o endpoint de lote), cai para uma chamada por ponto,
+        nas threads do `pool` (se houver), mantendo o isolamento de falhas.
+        Resultados na ordem do lote.
+        """
+        target_date = reference_ts.date()
+
+        results: Optional[List[Dict[str, Any]]] = None
+        if len(batch) > 1:
+            try:
+                results = self._call_icra_batch_api(
+                    target_date=target_date,
+                    items=[(p.id, features) for p, features in batch],
+                )
+            except RiskOrchestrationError:
+                results = None
+
+        if results is not None:
+            for (p, features), icra_result in zip(batch, results):
+                yield self._score_cycle_point(p, features, reference_ts, icra_result)
+            return
+
+        if pool is None or len(batch) <= 1:
+            for p, features in batch:
+                yield self._score_cycle_point(p, features, reference_ts)
+            return
+
+        yield from pool.map(
+            lambda item: self._score_cycle_point(item[0], item[1], reference_ts),
+            batch,
+        )
+
+    def _score_cycle_point(
+        self,
+        point: PointInput,
+        features: Dict[str, float],
+        reference_ts: datetime,
+        icra_result: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[PointInput, Optional[RiskSnapshot], Optional[Exception]]:
+        """
+        Snapshot de um ponto do ciclo; sem `icra_result`, chama a IA por ponto.
+        Erros voltam no terceiro elemento (não propagam).
+        """
+        try:
+            if icra_result is None:
+                icra_result = self._call_icra_api(
+                    point_id=point.id,
+                    target_date=reference_ts.date(),
+                    features=features,
+                )
+
+            return point, self._build_snapshot(
+                point=point,
+                reference_ts=reference_ts,
+                features_ordered=features,
+                icra_result=icra_result,
+                source="scheduler",
+            ), None
+        except Exception as e:
+            return point, None, e
 
     # --------------------------------------------------------
     # CÁLCULO REAL (clima -> features -> IA -> snapshot)
     # --------------------------------------------------------
 
-    def _compute_point_risk(self, point: Point, reference_ts: datetime, source: str = "on_demand") -> RiskSnapshot:
+    def _compute_point_risk(
+        self,
+        point: Union[Point, PointInput],
+        reference_ts: datetime,
+        source: str = "on_demand",
+    ) -> RiskSnapshot:
         """
         Computa risco de um ponto para um reference_ts.
         """
+        features_ordered = self._build_point_features(point=point, reference_ts=reference_ts)
+
+        icra_result = self._call_icra_api(
+            point_id=point.id,
+            target_date=reference_ts.date(),
+            features=features_ordered,
+        )
+
+        return self._build_snapshot(
+            point=point,
+            reference_ts=reference_ts,
+            features_ordered=features_ordered,
+            icra_result=icra_result,
+            source=source,
+        )
+
+    def _build_point_features(
+        self,
+        point: Union[Point, PointInput],
+        reference_ts: datetime,
+        climate_inputs: Optional[ClimateInputs] = None,
+    ) -> Dict[str, float]:
+        """
+        Clima -> features na ordem esperada pela IA.
+        climate_inputs: clima já obtido (busca em lote); None => busca do ponto.
+        """
         target_date = reference_ts.date()
         start_date = target_date - timedelta(days=self.history_days)
         end_date = target_date
 
         # 1) Clima 
-        climate_today, climate_history = self._get_climate_inputs(
-            latitude=float(point.latitude),
-            longitude=float(point.longitude),
-            start_date=start_date,
-            end_date=end_date,
-            target_date=target_date,
-            reference_ts=reference_ts,
-        )
+        if climate_inputs is not None:
+            climate_today, climate_history = climate_inputs
+        else:
+            climate_today, climate_history = self._get_climate_inputs(
+                latitude=float(point.latitude),
+                longitude=float(point.longitude),
+                start_date=start_date,
+                end_date=end_date,
+                target_date=target_date,
+                reference_ts=reference_ts,
+            )
 
         # 2) Features 
         features = self.feature_builder.build_features(
@@ -229,16 +791,19 @@ class RiskOrchestrator:
         )
 
         # Garante ordem/keys esperadas pela IA
-        features_ordered = {k: float(features.get(k, 0.0)) for k in FEATURE_ORDER}
-
-        # 3) IA
-        icra_result = self._call_icra_api(
-            point_id=point.id,
-            target_date=target_date,
-            features=features_ordered,
-        )
+        return {k: float(features.get(k, 0.0)) for k in FEATURE_ORDER}
 
-        # 4) Persistência 
+    def _build_snapshot(
+        self,
+        point: Union[Point, PointInput],
+        reference_ts: datetime,
+        features_ordered: Dict[str, float],
+        icra_result: Dict[str, Any],
+        source: str,
+    ) -> RiskSnapshot:
+        """
+        Resposta da IA -> snapshot (ainda não persistido).
+        """
         nivel = self._normalize_risk_level(str(icra_result.get("nivel_risco", "")))
         confianca = str(icra_result.get("confianca", "Indefinida"))
 
@@ -247,8 +812,6 @@ class RiskOrchestrator:
         chuva_30d = float(detalhes.get("chuva_30d", features_ordered.get("precipitacao_ma_30d", 0.0)))
         chuva_90d = float(detalhes.get("chuva_90d", features_ordered.get("precipitacao_ma_90d", 0.0)))
 
-        now = datetime.now(timezone.utc)
-
         return RiskSnapshot(
             point_id=point.id,
             snapshot_timestamp=reference_ts,
@@ -277,6 +840,21 @@ class RiskOrchestrator:
         - climate_today: dict (precipitacao_total_mm, temperatura_media_2m_C, ...)
         - climate_history: dict com séries list[float] p/ precip e temp
         """
+        if reference_ts is not None and hasattr(self.climate_service, "get_climate_snapshot"):
+            series, intraday = self.climate_service.get_climate_snapshot(
+                latitude=latitude,
+                longitude=longitude,
+                start_date=start_date,
+                end_date=end_date,
+                reference_ts=reference_ts,
+                window_hours=3,
+            )
+
+            climate_today, history = self._series_to_today_and_history(series, target_date=target_date)
+            if intraday is not None:
+                climate_today = self._merge_intraday(climate_today, intraday)
+            return climate_today, history
+
         if hasattr(self.climate_service, "get_daily_series"):
             series = self.climate_service.get_daily_series(
                 latitude=latitude,
@@ -353,6 +931,9 @@ class RiskOrchestrator:
         except Exception:
             return climate_today
 
+        return self._merge_intraday(climate_today, intraday)
+
+    def _merge_intraday(self, climate_today: Dict[str, Any], intraday: Dict[str, float]) -> Dict[str, Any]:
         merged = dict(climate_today)
         merged["precipitacao_total_mm"] = float(intraday.get("precipitacao_total_mm", merged.get("precipitacao_total_mm", 0.0)) or 0.0)
         merged["temperatura_media_2m_C"] = float(intraday.get("temperatura_media_2m_C", merged.get("temperatura_media_2m_C", 0.0)) or 0.0)
@@ -480,6 +1061,51 @@ class RiskOrchestrator:
                 f"ICRA retornou JSON inválido: {repr(e)} | body={resp.text[:500]}"
             ) from e
 
+    def _call_icra_batch_api(
+        self,
+        target_date: date,
+        items: List[Tuple[str, Dict[str, float]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Uma chamada a PREDICT_BATCH_ENDPOINT; resultados na ordem de `items`.
+        """
+        payload = {
+            "itens": [
+                {
+                    "data": target_date.isoformat(),
+                    "features": features,
+                    "ponto": point_id,
+                }
+                for point_id, features in items
+            ]
+        }
+
+        url = f"{settings.IA.BASE_URL}{settings.IA.PREDICT_BATCH_ENDPOINT}"
+        timeout = int(getattr(settings.IA, "TIMEOUT_SECONDS", 30))
+
+        try:
+            resp = self.http.post(url, json=payload, timeout=timeout)
+        except Exception as e:
+            raise RiskOrchestrationError(f"Falha ao chamar ICRA em lote: {repr(e)}") from e
+
+        if resp.status_code != 200:
+            raise RiskOrchestrationError(f"ICRA em lote retornou {resp.status_code}: {resp.text[:500]}")
+
+        try:
+            results = resp.json()["resultados"]
+        except Exception as e:
+            raise RiskOrchestrationError(
+                f"ICRA em lote retornou JSON inválido: {repr(e)} | body={resp.text[:500]}"
+            ) from e
+
+        if not isinstance(results, list) or len(results) != len(items):
+            raise RiskOrchestrationError(
+                f"ICRA em lote retornou {len(results) if isinstance(results, list) else 'N/A'} "
+                f"resultados para {len(items)} itens."
+            )
+
+        return results
+
     def _normalize_risk_level(self, raw: str) -> str:
         if not raw:
             return "Moderado"
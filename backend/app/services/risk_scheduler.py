@@ -9,13 +9,17 @@ Compatível com a arquitetura atual:
 - Usa RiskRepository
 - Usa compute_all_points_for_cycle()
 - Snapshot por bucket global
+- Superfícies por município geradas em paralelo (process pool, 1 sessão por worker)
 """
 
 from __future__ import annotations
 
 import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from backend.app.database import SessionLocal
 from backend.app.settings import settings
@@ -26,6 +30,52 @@ from backend.app.repositories.risk_surface_repository import RiskSurfaceReposito
 from backend.app.services.risk_surface_service import RiskSurfaceService
 from backend.app.models.point import Point
 
+# ============================================================
+# Worker de superfície (executa em processo separado)
+# ============================================================
+
+def _generate_surface_worker(
+    municipality_id: int,
+    reference_ts: datetime,
+    incremental: bool,
+) -> Dict[str, Any]:
+    """
+    Gera a superfície de um município no bucket com sessão própria.
+
+    Função de módulo (picklable) para uso no ProcessPoolExecutor;
+    nunca propaga exceção: falhas voltam no resultado para o resumo do ciclo.
+    """
+    try:
+        with SessionLocal() as session:
+            surface_service = RiskSurfaceService(
+                municipality_repo=MunicipalityRepository(session),
+                surface_repo=RiskSurfaceRepository(session),
+                risk_repo=RiskRepository(session),
+            )
+            surface = surface_service.get_or_generate_surface(
+                db=session,
+                municipality_id=municipality_id,
+                snapshot_timestamp=reference_ts,
+                force_recompute=True,
+                source="scheduled",
+                incremental=incremental,
+            )
+            total_cells = int(surface.total_cells or 0)
+            recomputed = surface.recomputed_cells
+            return {
+                "municipality_id": municipality_id,
+                "ok": True,
+                "total_cells": total_cells,
+                "recomputed_cells": int(recomputed) if recomputed is not None else total_cells,
+            }
+    except Exception as e:
+        return {
+            "municipality_id": municipality_id,
+            "ok": False,
+            "error": repr(e),
+        }
+
+
 # ============================================================
 # Scheduler
 # ============================================================
@@ -46,6 +96,7 @@ class RiskScheduler:
         self.poll_seconds = min(self.cycle_seconds, 60)
         self.enabled = bool(settings.RISK.SCHEDULER_ENABLED)
         self._last_surface_reference_ts: Optional[datetime] = None
+        self._surface_pool: Optional[ProcessPoolExecutor] = None
 
         self._task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
@@ -66,6 +117,28 @@ class RiskScheduler:
 
     def stop(self) -> None:
         self._stop_event.set()
+        if self._surface_pool is not None:
+            self._surface_pool.shutdown(wait=False, cancel_futures=True)
+            self._surface_pool = None
+
+    def _surface_workers(self) -> int:
+        """
+        SURFACE.GENERATION_WORKERS: 0 => os.cpu_count(); 1 => sequencial no próprio thread.
+        """
+        configured = int(settings.SURFACE.GENERATION_WORKERS)
+        if configured <= 0:
+            return max(1, os.cpu_count() or 1)
+        return configured
+
+    def _get_surface_pool(self, workers: int) -> ProcessPoolExecutor:
+        # Pool persistente entre ciclos: cada worker mantém seu cache de layouts.
+        # "spawn" evita herdar conexões do pool do SQLAlchemy do processo pai.
+        if self._surface_pool is None:
+            self._surface_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._surface_pool
 
     # --------------------------------------------------------
     # Loop
@@ -141,18 +214,16 @@ class RiskScheduler:
             return
 
         mrepo = MunicipalityRepository(session)
-        srepo = RiskSurfaceRepository(session)
-        surface_service = RiskSurfaceService(
-            municipality_repo=mrepo,
-            surface_repo=srepo,
-            risk_repo=repo,
-        )
 
         municipalities = mrepo.list_active_for_surface_generation()
         ok = 0
         skip_no_points = 0
         failed = 0
+        cells_total = 0
+        cells_recomputed = 0
+        incremental = bool(settings.SURFACE.INCREMENTAL_RECOMPUTE)
 
+        pending: List[Any] = []
         for municipality in municipalities:
             has_points = (
                 session.query(Point.id)
@@ -166,30 +237,53 @@ class RiskScheduler:
             if not has_points:
                 skip_no_points += 1
                 continue
+            pending.append(municipality)
 
-            try:
-                print(
-                    f"[SCHEDULER] Gerando superfície para município "
-                    f"{municipality.id} - {municipality.name}"
-                )
-                surface_service.get_or_generate_surface(
-                    db=session,
-                    municipality_id=municipality.id,
-                    snapshot_timestamp=reference_ts,
-                    force_recompute=True,
-                    source="scheduled",
-                )
+        workers = min(self._surface_workers(), max(1, len(pending)))
+        print(
+            f"[SCHEDULER] Gerando superfícies de {len(pending)} município(s) "
+            f"| workers={workers} incremental={incremental}"
+        )
+
+        results: List[Dict[str, Any]] = []
+        if workers <= 1:
+            for municipality in pending:
+                results.append(_generate_surface_worker(municipality.id, reference_ts, incremental))
+        else:
+            pool = self._get_surface_pool(self._surface_workers())
+            futures = {
+                pool.submit(_generate_surface_worker, municipality.id, reference_ts, incremental): municipality.id
+                for municipality in pending
+            }
+            pool_broken = False
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # Falha do próprio worker (ex: processo morto); o pool precisa ser recriado.
+                    results.append({"municipality_id": futures[future], "ok": False, "error": repr(e)})
+                    pool_broken = True
+
+            if pool_broken:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._surface_pool = None
+
+        for result in results:
+            if result["ok"]:
                 ok += 1
-            except Exception as e:
+                cells_total += result["total_cells"]
+                cells_recomputed += result["recomputed_cells"]
+            else:
                 failed += 1
                 print(
                     "[SCHEDULER][SURFACE ERROR] "
-                    f"municipality_id={municipality.id} error={repr(e)}"
+                    f"municipality_id={result['municipality_id']} error={result['error']}"
                 )
 
         print(
             "[SCHEDULER] Superfícies do bucket concluídas "
-            f"{reference_ts.isoformat()} | ok={ok} skip_no_points={skip_no_points} failed={failed}"
+            f"{reference_ts.isoformat()} | ok={ok} skip_no_points={skip_no_points} failed={failed} "
+            f"cells_recomputed={cells_recomputed}/{cells_total}"
         )
         self._last_surface_reference_ts = reference_ts
         
@@ -6,7 +6,8 @@ para um município e um snapshot_timestamp (bucket global), usando Kernel Gaussi
 
 Objetivo:
 - A partir dos snapshots pontuais (ICRA por ponto), gerar uma superfície contínua
-  (grid + kernel) e persistir como GeoJSONB (PostgreSQL) em risk_surfaces.
+  (grid + kernel) e persistir em risk_surfaces no formato raster compacto
+  (GeoJSON materializado sob demanda).
 
 Regras/Arquitetura:
 - Service decide se recalcula ou reutiliza (repository filtra validade quando solicitado).
@@ -18,12 +19,14 @@ Regras/Arquitetura:
 
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from bisect import bisect_right
 from math import cos, radians, sin, asin, sqrt
-from typing import Any, Dict, List, Optional, Tuple, Callable
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from backend.app.settings import settings
@@ -31,19 +34,31 @@ from backend.app.models.point import Point
 from backend.app.models.risk_snapshot import RiskSnapshot
 from backend.app.models.municipality import Municipality
 from backend.app.models.risk_surface import RiskSurface
+from backend.app.models.municipality_grid_mask import MunicipalityGridMask
 
+from backend.app.repositories.grid_mask_repository import GridMaskRepository
 from backend.app.repositories.municipality_repository import MunicipalityRepository
 from backend.app.repositories.risk_surface_repository import RiskSurfaceRepository
 from backend.app.repositories.risk_repository import RiskRepository
-
-try:
-    from shapely.geometry import shape as shapely_shape
-    from shapely.geometry import Point as ShapelyPoint
-    from shapely.prepared import prep as shapely_prep
-except Exception: 
-    shapely_shape = None
-    ShapelyPoint = None
-    shapely_prep = None
+from backend.app.services.surface_grid import (
+    GridSpec,
+    compute_grid_mask,
+    pack_mask,
+    unpack_mask,
+)
+from backend.app.services.surface_kernel import (
+    KernelWeightMatrix,
+    build_kernel_weight_matrix,
+    local_projection_origin,
+    project_local_m,
+)
+from backend.app.services.surface_raster import SurfaceRaster, level_codes, materialize_surface_geojson
+from backend.app.services.surface_diff import SurfaceDiffError, diff_surface_rasters
+from backend.app.services.surface_isobands import build_isobands_geojson
+from backend.app.services.surface_stats import build_surface_stats
+from backend.app.services.surface_tiles import render_tile_png
+from backend.app.utils.lru_cache import LRUCache
+from backend.app.utils.spatial_index import KDTree, unit_sphere_xyz
 
 
 # ============================================================
@@ -70,6 +85,49 @@ class SurfaceConfig:
     t_moderado: float
     t_alto: float
     max_cells: int
+    kernel_truncation_sigmas: Optional[float] = None
+    incremental_icra_tolerance: float = 0.005
+    local_projection: bool = False
+
+
+@dataclass(frozen=True)
+class SurfaceLayout:
+    """
+    Parte da superfície que NÃO depende do bucket:
+    grid do município, sigmas adaptativos e matriz de pesos do kernel.
+    Depende apenas da geometria municipal, do conjunto de pontos e da SurfaceConfig.
+    """
+    spec: GridSpec
+    n_rows: int
+    n_cols: int
+    cell_index: np.ndarray
+    sigmas: List[float]
+    weights: KernelWeightMatrix
+    digest: str
+
+
+# Cache de layouts por processo, chaveado por
+# (municipality_id, municipality.updated_at, hash dos pontos, SurfaceConfig).
+_LAYOUT_CACHE: LRUCache[Tuple[Any, ...], SurfaceLayout] = LRUCache(
+    maxsize=int(getattr(getattr(settings, "SURFACE", object()), "LAYOUT_CACHE_SIZE", 8))
+)
+
+# Rasters decodificados, tiles PNG e isobandas por superfície persistida, chaveados por
+# (municipality_id, snapshot_timestamp, computed_at): um recálculo do bucket invalida tudo.
+_RASTER_CACHE: LRUCache[Tuple[Any, ...], SurfaceRaster] = LRUCache(
+    maxsize=int(getattr(getattr(settings, "SURFACE", object()), "LAYOUT_CACHE_SIZE", 8))
+)
+_TILE_CACHE: LRUCache[Tuple[Any, ...], bytes] = LRUCache(
+    maxsize=int(getattr(getattr(settings, "SURFACE", object()), "TILE_CACHE_SIZE", 2048))
+)
+_ISOBAND_CACHE: LRUCache[Tuple[Any, ...], Dict[str, Any]] = LRUCache(
+    maxsize=int(getattr(getattr(settings, "SURFACE", object()), "RESPONSE_CACHE_SIZE", 32))
+)
+
+# Diferenças entre buckets, chaveadas pelo par de superfícies + tolerância.
+_DIFF_CACHE: LRUCache[Tuple[Any, ...], Dict[str, Any]] = LRUCache(
+    maxsize=int(getattr(getattr(settings, "SURFACE", object()), "RESPONSE_CACHE_SIZE", 32))
+)
 
 
 # ============================================================
@@ -86,10 +144,14 @@ class RiskSurfaceService:
         municipality_repo: MunicipalityRepository,
         surface_repo: RiskSurfaceRepository,
         risk_repo: RiskRepository,
+        grid_mask_repo: Optional[GridMaskRepository] = None,
     ) -> None:
         self.municipality_repo = municipality_repo
         self.surface_repo = surface_repo
         self.risk_repo = risk_repo
+        self.grid_mask_repo = (
+            grid_mask_repo if grid_mask_repo is not None else GridMaskRepository(surface_repo.session)
+        )
 
         self.cfg = self._load_config()
 
@@ -104,12 +166,16 @@ class RiskSurfaceService:
         snapshot_timestamp: datetime,
         force_recompute: bool = False,
         source: str = "auto",  # auto | on_demand | scheduled
+        incremental: bool = False,
     ) -> RiskSurface:
         """
         Retorna superfície do município no timestamp (bucket).
 
         - Se existir e estiver válida (valid_until) e force=False => reutiliza.
         - Caso contrário => recalcula e salva.
+        - incremental=True => parte da superfície mais recente do município e
+          recalcula só as células afetadas por pontos cujo ICRA mudou além de
+          INCREMENTAL_ICRA_TOLERANCE (ver RiskSurface.recomputed_cells).
         """
         if snapshot_timestamp.tzinfo is None:
             snapshot_timestamp = snapshot_timestamp.replace(tzinfo=timezone.utc)
@@ -162,6 +228,12 @@ class RiskSurfaceService:
                 f"Nenhum snapshot disponível para os pontos do município no bucket={snapshot_timestamp.isoformat()}"
             )
 
+        previous = (
+            self.surface_repo.get_latest_by_municipality(municipality_id=municipality_id)
+            if incremental
+            else None
+        )
+
         valid_sources = {"on_demand" , "scheduled", "auto"}
         surface = self._generate_surface(
             municipality=municipality,
@@ -169,6 +241,7 @@ class RiskSurfaceService:
             snapshots=valid_snaps,
             snapshot_timestamp=snapshot_timestamp,
             source=source if source in valid_sources else "on_demand",
+            previous=previous,
         )
 
         if force_recompute:
@@ -177,6 +250,100 @@ class RiskSurfaceService:
 
         return saved
 
+    def get_surface_geojson(self, surface: RiskSurface) -> Dict[str, Any]:
+        """
+        GeoJSON (FeatureCollection de células) da superfície, materializado
+        a partir do raster compacto quando necessário.
+        """
+        return materialize_surface_geojson(surface.geojson, surface.raster)
+
+    def get_surface_geojson_stream(self, surface: RiskSurface) -> Dict[str, Any]:
+        """
+        Como `get_surface_geojson`, mas com `features` preguiçoso: o raster
+        decodificado (cacheado por bucket) gera os polígonos em lotes durante
+        o stream da resposta, sem montar a lista inteira antes.
+        """
+        if surface.geojson is not None or surface.raster is None:
+            return self.get_surface_geojson(surface)
+
+        return {
+            "type": "FeatureCollection",
+            "features": self._get_cached_raster(surface).iter_features(),
+        }
+
+    def get_surface_tile(self, surface: RiskSurface, z: int, x: int, y: int) -> bytes:
+        """
+        Tile PNG (XYZ / Web Mercator) da superfície, cacheado por bucket.
+        """
+        if surface.raster is None:
+            raise RiskSurfaceServiceError(
+                "Superfície sem raster (formato legado); recalcule para servir tiles."
+            )
+
+        surface_key = self._surface_cache_key(surface)
+
+        def _render() -> bytes:
+            return render_tile_png(self._get_cached_raster(surface), z, x, y)
+
+        return _TILE_CACHE.get_or_set(surface_key + (int(z), int(x), int(y)), _render)
+
+    def get_surface_isobands(self, surface: RiskSurface, basis: str = "absolute") -> Dict[str, Any]:
+        """
+        Isobandas da superfície: um (Multi)Polygon por nível de risco,
+        dissolvendo células vizinhas do mesmo nível. Cacheado por bucket.
+        """
+        if surface.raster is None:
+            raise RiskSurfaceServiceError(
+                "Superfície sem raster (formato legado); recalcule para servir isobandas."
+            )
+
+        return _ISOBAND_CACHE.get_or_set(
+            self._surface_cache_key(surface) + (basis,),
+            lambda: build_isobands_geojson(self._get_cached_raster(surface), basis=basis),
+        )
+
+    def get_surface_diff(
+        self,
+        before: RiskSurface,
+        after: RiskSurface,
+        tolerance: float,
+    ) -> Dict[str, Any]:
+        """
+        Células cujo risco mudou mais que `tolerance` entre dois buckets,
+        mais estatísticas do movimento. Cacheado por par de buckets.
+        """
+        if before.raster is None or after.raster is None:
+            raise RiskSurfaceServiceError(
+                "Superfície sem raster (formato legado); recalcule para comparar buckets."
+            )
+
+        def _diff() -> Dict[str, Any]:
+            try:
+                return diff_surface_rasters(
+                    self._get_cached_raster(before),
+                    self._get_cached_raster(after),
+                    tolerance=tolerance,
+                )
+            except SurfaceDiffError as e:
+                raise RiskSurfaceServiceError(str(e)) from e
+
+        key = self._surface_cache_key(before) + self._surface_cache_key(after) + (float(tolerance),)
+        return _DIFF_CACHE.get_or_set(key, _diff)
+
+    @staticmethod
+    def _surface_cache_key(surface: RiskSurface) -> Tuple[Any, ...]:
+        return (
+            int(surface.municipality_id),
+            surface.snapshot_timestamp.isoformat(),
+            surface.computed_at.isoformat() if surface.computed_at else "",
+        )
+
+    def _get_cached_raster(self, surface: RiskSurface) -> SurfaceRaster:
+        return _RASTER_CACHE.get_or_set(
+            self._surface_cache_key(surface),
+            lambda: SurfaceRaster.decode(surface.raster),
+        )
+
     # --------------------------------------------------------
     # GERAÇÃO (core)
     # --------------------------------------------------------
@@ -188,101 +355,109 @@ class RiskSurfaceService:
         snapshots: List[RiskSnapshot],
         snapshot_timestamp: datetime,
         source: str,
+        previous: Optional[RiskSurface] = None,
     ) -> RiskSurface:
-        # 1) Preparar geometria municipal e grid
-        geom = self._extract_geometry(municipality.geojson)
-        bbox = self._bbox_from_geometry(geom)
-
-        grid = self._generate_grid(
-            bbox=bbox,
-            geometry=geom,
-            resolution_m=self.cfg.grid_resolution_m,
-            max_cells=self.cfg.max_cells,
-        )
-
-        # 2) Sigma adaptativo por ponto
-        #    sigma_i calculado a partir da distância média dos k vizinhos mais próximos
-        #    (densidade alta => sigma menor; densidade baixa => sigma maior)
-        point_xy = [(float(p.latitude), float(p.longitude)) for p in points]
-        sigmas = self._compute_adaptive_sigmas(point_xy)
+        """
+        previous: superfície anterior do município (modo incremental). Se compatível
+        com o layout atual, só as células no raio dos pontos alterados são recalculadas.
+        """
+        # 1) Layout (grid + sigma adaptativo + matriz de pesos), reaproveitado entre buckets
+        layout = self._get_layout(municipality=municipality, points=points)
+        sigmas = layout.sigmas
 
-        # 3) Kernel e risco por célula
+        # 2) Entradas por ponto (ICRA absoluto e rank relativo)
         icra_by_point = {s.point_id: float(s.icra) for s in snapshots}
         point_ids = [p.id for p in points]
-        icras_abs = [icra_by_point[pid] for pid in point_ids]
-        icras_rel = self._relative_rank_values(icras_abs)
-        cell_values: List[Tuple[float, float, float, float, float, str, str]] = []
-        high_risk_cells = 0
+        icras_abs = np.array([icra_by_point[pid] for pid in point_ids], dtype=float)
+        icras_rel = np.array(self._relative_rank_values(icras_abs.tolist()), dtype=float)
 
-        # Pré-cálculo de “tamanho da célula” em graus (para polígonos)
         res_m = self.cfg.grid_resolution_m
-
-        for (cell_center_lat, cell_center_lon, cell_bounds) in grid:
-            risk_abs = self._kernel_risk_at(
-                lat=cell_center_lat,
-                lon=cell_center_lon,
-                point_xy=point_xy,
-                point_values=icras_abs,
-                point_sigmas=sigmas,
-            )
-            risk_rel = self._kernel_risk_at(
-                lat=cell_center_lat,
-                lon=cell_center_lon,
-                point_xy=point_xy,
-                point_values=icras_rel,
-                point_sigmas=sigmas,
-            )
-
-            level_abs = self._risk_level_from_icra(risk_abs)
-            level_rel = self._risk_level_from_icra(risk_rel)
-            risk_color_value = self._risk_color_value_from_abs_icra(risk_abs)
-
-            if risk_abs >= self.cfg.high_risk_threshold:
-                high_risk_cells += 1
-
-            min_lat, min_lon, max_lat, max_lon = cell_bounds
-            cell_values.append(
-                (
-                    min_lat,
-                    min_lon,
-                    risk_abs,
-                    risk_rel,
-                    risk_color_value,
-                    level_abs,
-                    level_rel,
-                )
+        n_cells = layout.weights.n_cells
+
+        # 3) Células a recalcular: todas, ou (incremental) só as do raio dos pontos alterados
+        prev = self._previous_raster_for_layout(previous, layout)
+        if prev is None:
+            rows = np.ones(n_cells, dtype=bool)
+            risks_abs = np.zeros(n_cells, dtype=float)
+            risks_rel = np.zeros(n_cells, dtype=float)
+            color_values = np.zeros(n_cells, dtype=np.float32)
+            levels_abs = np.zeros(n_cells, dtype=np.uint8)
+            levels_rel = np.zeros(n_cells, dtype=np.uint8)
+        else:
+            tol = float(self.cfg.incremental_icra_tolerance)
+            changed = (
+                (np.abs(icras_abs - prev.point_icra_abs) > tol)
+                | (np.abs(icras_rel - prev.point_icra_rel) > tol)
             )
-
-        total_cells = len(cell_values)
-
-        # 4) GeoJSON (FeatureCollection de células)
-        geojson = self._build_geojson_cells(
-            cell_values=cell_values,
-            resolution_m=res_m,
+            # Pontos dentro da tolerância mantêm o valor já refletido na superfície,
+            # então o desvio acumulado entre ciclos nunca passa de `tol`.
+            icras_abs = np.where(changed, icras_abs, prev.point_icra_abs)
+            icras_rel = np.where(changed, icras_rel, prev.point_icra_rel)
+
+            rows = layout.weights.rows_touching(changed)
+            risks_abs = prev.risk_abs.astype(float)
+            risks_rel = prev.risk_rel.astype(float)
+            color_values = prev.color_value.copy()
+            levels_abs = prev.level_abs.copy()
+            levels_rel = prev.level_rel.copy()
+
+        # 4) Kernel e risco por célula (produto matriz-vetor sobre o layout)
+        if rows.any():
+            new_abs = layout.weights.apply_rows(icras_abs, rows)
+            new_rel = layout.weights.apply_rows(icras_rel, rows)
+            risks_abs[rows] = new_abs
+            risks_rel[rows] = new_rel
+            color_values[rows] = [self._risk_color_value_from_abs_icra(v) for v in new_abs.tolist()]
+            levels_abs[rows] = level_codes([self._risk_level_from_icra(v) for v in new_abs.tolist()])
+            levels_rel[rows] = level_codes([self._risk_level_from_icra(v) for v in new_rel.tolist()])
+
+        recomputed_cells = int(np.count_nonzero(rows))
+        high_risk_cells = int(np.count_nonzero(risks_abs >= self.cfg.high_risk_threshold))
+
+        # 5) Raster compacto (GeoJSON é materializado sob demanda)
+        raster = SurfaceRaster(
+            spec=layout.spec,
+            n_rows=layout.n_rows,
+            n_cols=layout.n_cols,
+            grid_resolution_m=int(res_m),
+            cell_index=layout.cell_index.astype(np.uint32),
+            risk_abs=risks_abs.astype(np.float32),
+            risk_rel=risks_rel.astype(np.float32),
+            color_value=np.asarray(color_values, dtype=np.float32),
+            level_abs=levels_abs,
+            level_rel=levels_rel,
+            layout_digest=layout.digest,
+            point_icra_abs=icras_abs,
+            point_icra_rel=icras_rel,
         )
 
-        # 5) Estatísticas
+        total_cells = raster.total_cells
+
+        # 6) Estatísticas
         total_area_m2 = float(total_cells) * float(res_m) * float(res_m)
         high_risk_area_m2 = float(high_risk_cells) * float(res_m) * float(res_m)
         high_risk_percentage = ((high_risk_area_m2 / total_area_m2) * 100 if total_area_m2 > 0 else 0.0)
 
-        # 6) Validade
+        # 7) Validade
         ttl_seconds = int(settings.RISK.SNAPSHOT_TTL_SECONDS)
         valid_until = snapshot_timestamp + timedelta(seconds=ttl_seconds)
 
         computed_at = self._utcnow()
 
-        # 7) Persistir model
+        # 8) Persistir model
         # kernel_sigma_m: aqui o sigma é adaptativo; armazenamos um valor representativo (mediana/clamp),
         rep_sigma = int(self._median(sigmas)) if sigmas else int(self.cfg.sigma_min_m)
 
         return RiskSurface(
             municipality_id=int(municipality.id),
             snapshot_timestamp=snapshot_timestamp,
-            geojson=geojson,
+            geojson=None,
+            raster=raster.encode(),
+            stats=build_surface_stats(raster).encode(),
             grid_resolution_m=int(res_m),
             kernel_sigma_m=rep_sigma,
             total_cells=total_cells,
+            recomputed_cells=recomputed_cells,
             total_area_m2=total_area_m2,
             high_risk_area_m2=high_risk_area_m2,
             high_risk_percentage=float(high_risk_percentage),
@@ -291,81 +466,215 @@ class RiskSurfaceService:
             source=source,
         )
 
+    def _previous_raster_for_layout(
+        self,
+        previous: Optional[RiskSurface],
+        layout: SurfaceLayout,
+    ) -> Optional[SurfaceRaster]:
+        """
+        Raster anterior reaproveitável: mesmo layout (grid, pontos, config) e com
+        as entradas por ponto gravadas. Caso contrário => recálculo completo.
+        """
+        if previous is None or previous.raster is None:
+            return None
+
+        try:
+            prev = SurfaceRaster.decode(previous.raster)
+        except Exception:
+            return None
+
+        if not prev.has_inputs or prev.layout_digest != layout.digest:
+            return None
+        if prev.total_cells != layout.weights.n_cells or prev.point_icra_abs.shape[0] != layout.weights.n_points:
+            return None
+        return prev
+
+    # --------------------------------------------------------
+    # LAYOUT (cache entre buckets)
+    # --------------------------------------------------------
+
+    def _get_layout(self, municipality: Municipality, points: List[Point]) -> SurfaceLayout:
+        key = self._layout_cache_key(municipality=municipality, points=points)
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return _LAYOUT_CACHE.get_or_set(
+            key,
+            lambda: self._build_layout(municipality=municipality, points=points, digest=digest),
+        )
+
+    def _layout_cache_key(self, municipality: Municipality, points: List[Point]) -> Tuple[Any, ...]:
+        """
+        Ativar/desativar ou mover pontos muda o hash e invalida o layout automaticamente.
+        """
+        digest = hashlib.sha1()
+        for p in points:
+            digest.update(f"{p.id}|{float(p.latitude):.7f}|{float(p.longitude):.7f};".encode("utf-8"))
+
+        updated_at = municipality.updated_at.isoformat() if municipality.updated_at else ""
+        return (int(municipality.id), updated_at, digest.hexdigest(), self.cfg)
+
+    def _build_layout(self, municipality: Municipality, points: List[Point], digest: str) -> SurfaceLayout:
+        geom = self._extract_geometry(municipality.geojson)
+        bbox = self._bbox_from_geometry(geom)
+
+        spec, mask = self._get_grid_mask(
+            municipality=municipality,
+            bbox=bbox,
+            geometry=geom,
+            resolution_m=self.cfg.grid_resolution_m,
+            max_cells=self.cfg.max_cells,
+        )
+        n_rows, n_cols = mask.shape
+        cell_index = np.flatnonzero(mask)
+        cell_lat, cell_lon = spec.cell_centers(cell_index, n_cols)
+
+        # Sigma adaptativo por ponto:
+        # sigma_i calculado a partir da distância média dos k vizinhos mais próximos
+        # (densidade alta => sigma menor; densidade baixa => sigma maior)
+        point_xy = [(float(p.latitude), float(p.longitude)) for p in points]
+
+        # Referencial métrico local centrado no grid (None => haversine por par)
+        origin = (
+            local_projection_origin(
+                np.array([spec.min_lat, spec.max_lat], dtype=float),
+                np.array([spec.min_lon, spec.max_lon], dtype=float),
+            )
+            if self.cfg.local_projection
+            else None
+        )
+        sigmas = self._compute_adaptive_sigmas(point_xy, origin=origin)
+
+        weights = build_kernel_weight_matrix(
+            cell_lat=cell_lat,
+            cell_lon=cell_lon,
+            point_lat=np.array([xy[0] for xy in point_xy], dtype=float),
+            point_lon=np.array([xy[1] for xy in point_xy], dtype=float),
+            point_sigmas=np.array(sigmas, dtype=float),
+            truncation_sigmas=self.cfg.kernel_truncation_sigmas,
+            projection_origin=origin,
+        )
+
+        return SurfaceLayout(
+            spec=spec,
+            n_rows=int(n_rows),
+            n_cols=int(n_cols),
+            cell_index=cell_index,
+            sigmas=sigmas,
+            weights=weights,
+            digest=digest,
+        )
+
     # --------------------------------------------------------
     # GRID (bbox + polígono)
     # --------------------------------------------------------
 
-    def _generate_grid(
+    def _get_grid_mask(
         self,
+        municipality: Municipality,
         bbox: Tuple[float, float, float, float],
         geometry: Dict[str, Any],
         resolution_m: int,
         max_cells: int,
-    ) -> List[Tuple[float, float, Tuple[float, float, float, float]]]:
+    ) -> Tuple[GridSpec, np.ndarray]:
         """
-        Gera grid de células (centros) dentro do polígono do município.
-        Retorna lista de:
-            (center_lat, center_lon, (min_lat, min_lon, max_lat, max_lon))
+        Grid regular sobre a bbox + máscara (n_rows, n_cols) das células cujo
+        centro está dentro do polígono do município.
+
+        A máscara dentro/fora é persistida por (município, resolução, updated_at)
+        e reaproveitada entre gerações e processos.
         """
         min_lat, min_lon, max_lat, max_lon = bbox
         if min_lat >= max_lat or min_lon >= max_lon:
             raise RiskSurfaceServiceError("BBox inválida no municipality")
 
-        # Conversão metro->grau (aproximação)
-        # lat: ~111_320 m por grau
-        # lon: ~111_320*cos(lat) m por grau
-        lat0 = (min_lat + max_lat) / 2.0
-        step_lat = float(resolution_m) / 111_320.0
-        step_lon = float(resolution_m) / (111_320.0 * max(0.1, cos(radians(lat0))))
+        spec = GridSpec.from_bbox(bbox, resolution_m)
+        n_rows, n_cols = spec.shape
+        updated_at = municipality.updated_at
 
-        cells: List[Tuple[float, float, Tuple[float, float, float, float]]] = []
-        contains_fn = self._build_geometry_contains_fn(geometry)
-
-        lat = min_lat
-        while lat <= max_lat:
-            lon = min_lon
-            while lon <= max_lon:
-                center_lat = lat + step_lat / 2.0
-                center_lon = lon + step_lon / 2.0
-
-                if contains_fn(center_lon, center_lat):  # (x=lon, y=lat)
-                    cell_bounds = (lat, lon, lat + step_lat, lon + step_lon)
-                    cells.append((center_lat, center_lon, cell_bounds))
+        stored = None
+        if updated_at is not None:
+            stored = self.grid_mask_repo.get_mask(
+                municipality_id=int(municipality.id),
+                grid_resolution_m=int(resolution_m),
+                municipality_updated_at=updated_at,
+            )
 
-                    if len(cells) >= max_cells:
-                        raise RiskSurfaceServiceError(
-                            f"Grid excedeu max_cells={max_cells}. "
-                            f"Aumente resolução (ex: 700m) ou aumente max_cells."
-                        )
+        if stored is not None and (int(stored.n_rows), int(stored.n_cols)) == (n_rows, n_cols):
+            mask = unpack_mask(stored.mask, n_rows, n_cols)
+        else:
+            mask = compute_grid_mask(spec, geometry)
+            if updated_at is not None:
+                self.grid_mask_repo.save_mask(
+                    MunicipalityGridMask(
+                        municipality_id=int(municipality.id),
+                        grid_resolution_m=int(resolution_m),
+                        municipality_updated_at=updated_at,
+                        min_lat=spec.min_lat,
+                        min_lon=spec.min_lon,
+                        max_lat=spec.max_lat,
+                        max_lon=spec.max_lon,
+                        step_lat=spec.step_lat,
+                        step_lon=spec.step_lon,
+                        n_rows=n_rows,
+                        n_cols=n_cols,
+                        mask=pack_mask(mask),
+                        inside_cells=int(np.count_nonzero(mask)),
+                    )
+                )
 
-                lon += step_lon
-            lat += step_lat
+        if int(np.count_nonzero(mask)) >= max_cells:
+            raise RiskSurfaceServiceError(
+                f"Grid excedeu max_cells={max_cells}. "
+                f"Aumente resolução (ex: 700m) ou aumente max_cells."
+            )
 
-        return cells
+        return spec, mask
 
     # --------------------------------------------------------
     # SIGMA ADAPTATIVO
     # --------------------------------------------------------
 
-    def _compute_adaptive_sigmas(self, point_xy: List[Tuple[float, float]]) -> List[float]:
+    def _compute_adaptive_sigmas(
+        self,
+        point_xy: List[Tuple[float, float]],
+        origin: Optional[Tuple[float, float]] = None,
+    ) -> List[float]:
         """
         Para cada ponto, sigma_i = clamp(min,max, mean(dist_to_kNN) * sigma_scale)
+
+        Os k vizinhos vêm de um KD-tree, em O(n log n) no lugar do all-pairs O(n²):
+        - origin informado => KD-tree 2D no referencial local (metros); as distâncias
+          do kNN já são as distâncias usadas
+        - origin None => KD-tree sobre a esfera unitária (mesma ordem da haversine)
+          e distâncias haversine por par
         """
         k = max(1, int(self.cfg.knn_k))
+        n = len(point_xy)
         out: List[float] = []
+        if n == 0:
+            return out
+
+        lats = np.array([xy[0] for xy in point_xy], dtype=float)
+        lons = np.array([xy[1] for xy in point_xy], dtype=float)
+
+        if origin is not None:
+            coords = np.column_stack(project_local_m(lats, lons, origin))
+        else:
+            coords = unit_sphere_xyz(lats, lons)
+        tree = KDTree(coords)
 
         for i, (lat_i, lon_i) in enumerate(point_xy):
-            dists: List[float] = []
-            for j, (lat_j, lon_j) in enumerate(point_xy):
-                if i == j:
-                    continue
-                dists.append(self._haversine_m(lat_i, lon_i, lat_j, lon_j))
+            dists, neighbors = tree.query(coords[i], k=min(k, n - 1), exclude_index=i)
 
-            dists.sort()
-            if not dists:
+            if neighbors.size == 0:
                 sigma = float(self.cfg.sigma_max_m)
             else:
-                use = dists[: min(k, len(dists))]
+                if origin is not None:
+                    use = dists.tolist()
+                else:
+                    use = sorted(
+                        self._haversine_m(lat_i, lon_i, point_xy[j][0], point_xy[j][1])
+                        for j in neighbors.tolist()
+                    )
                 mean_k = sum(use) / float(len(use))
                 sigma = mean_k * float(self.cfg.sigma_scale)
 
@@ -374,124 +683,6 @@ class RiskSurfaceService:
 
         return out
 
-    # --------------------------------------------------------
-    # KERNEL
-    # --------------------------------------------------------
-
-    def _kernel_risk_at(
-        self,
-        lat: float,
-        lon: float,
-        point_xy: List[Tuple[float, float]],
-        point_values: List[float],
-        point_sigmas: List[float],
-    ) -> float:
-        """
-        Kernel Gaussiano normalizado (para manter 0..1 coerente):
-            risk = sum(icra_i * w_i) / sum(w_i)
-        """
-        num = 0.0
-        den = 0.0
-
-        for (plat, plon), value, sigma in zip(point_xy, point_values, point_sigmas):
-            d = self._haversine_m(lat, lon, plat, plon)
-
-            # w = exp(-d^2/(2*sigma^2))
-            # Evita underflow/overflow: se d muito maior que sigma, peso ~0.
-            if sigma <= 0:
-                continue
-
-            z = (d * d) / (2.0 * sigma * sigma)
-            if z > 60.0:
-                continue
-
-            w = self._exp_neg(z)
-            num += value * w
-            den += w
-
-        if den <= 0.0:
-            return 0.0
-
-        risk = num / den
-        # clamp final
-        if risk < 0.0:
-            return 0.0
-        if risk > 1.0:
-            return 1.0
-        return float(risk)
-
-    # --------------------------------------------------------
-    # GEOJSON
-    # --------------------------------------------------------
-
-    def _build_geojson_cells(
-        self,
-        cell_values: List[Tuple[float, float, float, float, float, str, str]],
-        resolution_m: int,
-    ) -> Dict[str, Any]:
-        """
-        Constr?i FeatureCollection de pol?gonos de c?lulas.
-
-        cell_values:
-            (min_lat, min_lon, risk_abs, risk_rel, risk_color_value, level_abs, level_rel)
-        """
-        features: List[Dict[str, Any]] = []
-
-        def _relative_color(rank: float) -> str:
-            rank = max(0.0, min(1.0, rank))
-            hue = (1.0 - rank) * 120.0
-            return f"hsl({hue:.2f}, 75%, 45%)"
-
-        for (
-            min_lat,
-            min_lon,
-            risk_abs,
-            risk_rel,
-            risk_color_value,
-            level_abs,
-            level_rel,
-        ) in cell_values:
-            step_lat = float(resolution_m) / 111_320.0
-            step_lon = float(resolution_m) / (111_320.0 * max(0.1, cos(radians(min_lat + step_lat / 2.0))))
-
-            max_lat = min_lat + step_lat
-            max_lon = min_lon + step_lon
-
-            poly = [
-                [min_lon, min_lat],
-                [max_lon, min_lat],
-                [max_lon, max_lat],
-                [min_lon, max_lat],
-                [min_lon, min_lat],
-            ]
-
-            color = _relative_color(float(risk_color_value))
-
-            features.append(
-                {
-                    "type": "Feature",
-                    "properties": {
-                        "risk_value": float(risk_abs),
-                        "risk_level": level_abs,
-                        "risk_value_relative": float(risk_rel),
-                        "risk_level_relative": level_rel,
-                        "risk_color_value": float(risk_color_value),
-                        "color": color,
-                        "color_basis": "risk_level_calibrated",
-                        "grid_resolution_m": int(resolution_m),
-                    },
-                    "geometry": {
-                        "type": "Polygon",
-                        "coordinates": [poly],
-                    },
-                }
-            )
-
-        return {
-            "type": "FeatureCollection",
-            "features": features,
-        }
-
     # --------------------------------------------------------
     # NÍVEL DE RISCO 
     # --------------------------------------------------------
@@ -552,7 +743,7 @@ class RiskSurfaceService:
         return max(0.0, min(1.0, _lerp(v, t3, 1.0, 0.85, 1.0)))
 
     # --------------------------------------------------------
-    # GEOJSON GEOMETRY EXTRACT + POINT IN POLYGON
+    # GEOJSON GEOMETRY EXTRACT + BBOX
     # --------------------------------------------------------
 
     def _extract_geometry(self, geojson: Dict[str, Any]) -> Dict[str, Any]:
@@ -636,83 +827,6 @@ class RiskSurfaceService:
 
         return (min(lats), min(lons), max(lats), max(lons))
 
-    def _build_geometry_contains_fn(self, geometry: Dict[str, Any]) -> Callable[[float, float], bool]:
-        if shapely_shape is not None and ShapelyPoint is not None and shapely_prep is not None:
-            try:
-                prepared = shapely_prep(shapely_shape(geometry))
-
-                def _contains_shapely(x_lon: float, y_lat: float) -> bool:
-                    return bool(prepared.covers(ShapelyPoint(float(x_lon), float(y_lat))))
-
-                return _contains_shapely
-            except Exception:
-                pass
-
-        def _contains_fallback(x_lon: float, y_lat: float) -> bool:
-            return self._point_in_geometry(x_lon, y_lat, geometry)
-
-        return _contains_fallback
-
-    def _point_in_geometry(self, x_lon: float, y_lat: float, geometry: Dict[str, Any]) -> bool:
-        """
-        Retorna True se ponto (lon,lat) estiver dentro de Polygon ou MultiPolygon.
-        Suporta buracos (holes) via regra: dentro do anel externo e fora de qualquer hole.
-        """
-        gtype = geometry.get("type")
-        coords = geometry.get("coordinates")
-
-        if gtype == "Polygon":
-            return self._point_in_polygon(x_lon, y_lat, coords)
-
-        if gtype == "MultiPolygon":
-            for poly in coords:
-                if self._point_in_polygon(x_lon, y_lat, poly):
-                    return True
-            return False
-
-        return False
-
-    def _point_in_polygon(self, x_lon: float, y_lat: float, polygon_coords: Any) -> bool:
-        """
-        polygon_coords: [ outer_ring, hole1, hole2, ... ]
-        ring: [[lon,lat], [lon,lat], ...]
-        """
-        if not polygon_coords or not isinstance(polygon_coords, list):
-            return False
-
-        outer = polygon_coords[0]
-        if not self._point_in_ring(x_lon, y_lat, outer):
-            return False
-
-        for hole in polygon_coords[1:]:
-            if self._point_in_ring(x_lon, y_lat, hole):
-                return False
-
-        return True
-
-    def _point_in_ring(self, x: float, y: float, ring: Any) -> bool:
-        """
-        Ray casting.
-        Considera ring fechado ou não.
-        """
-        if not ring or not isinstance(ring, list):
-            return False
-
-        inside = False
-        n = len(ring)
-
-        for i in range(n):
-            x1, y1 = ring[i][0], ring[i][1]
-            x2, y2 = ring[(i + 1) % n][0], ring[(i + 1) % n][1]
-
-            intersects = ((y1 > y) != (y2 > y)) and (
-                x < (x2 - x1) * (y - y1) / ((y2 - y1) or 1e-12) + x1
-            )
-            if intersects:
-                inside = not inside
-
-        return inside
-
     # --------------------------------------------------------
     # UTILS
     # --------------------------------------------------------
@@ -734,6 +848,15 @@ class RiskSurfaceService:
 
         max_cells = int(getattr(getattr(settings, "SURFACE", object()), "MAX_CELLS", 200_000))
 
+        raw_truncation = getattr(getattr(settings, "SURFACE", object()), "KERNEL_TRUNCATION_SIGMAS", None)
+        kernel_truncation_sigmas = float(raw_truncation) if raw_truncation is not None else None
+
+        incremental_icra_tolerance = float(
+            getattr(getattr(settings, "SURFACE", object()), "INCREMENTAL_ICRA_TOLERANCE", 0.005)
+        )
+
+        local_projection = bool(getattr(getattr(settings, "SURFACE", object()), "LOCAL_PROJECTION", False))
+
         if grid_resolution_m <= 0:
             raise RiskSurfaceServiceError("GRID_RESOLUTION_M inválido")
         if not (0.0 < high_risk_threshold <= 1.0):
@@ -742,6 +865,10 @@ class RiskSurfaceService:
             raise RiskSurfaceServiceError("SIGMA_MIN_M/SIGMA_MAX_M inválidos")
         if max_cells <= 0:
             raise RiskSurfaceServiceError("MAX_CELLS inválido")
+        if kernel_truncation_sigmas is not None and kernel_truncation_sigmas <= 0:
+            raise RiskSurfaceServiceError("KERNEL_TRUNCATION_SIGMAS inválido")
+        if incremental_icra_tolerance < 0:
+            raise RiskSurfaceServiceError("INCREMENTAL_ICRA_TOLERANCE inválido")
 
         return SurfaceConfig(
             grid_resolution_m=grid_resolution_m,
@@ -754,6 +881,9 @@ class RiskSurfaceService:
             t_moderado=t_moderado,
             t_alto=t_alto,
             max_cells=max_cells,
+            kernel_truncation_sigmas=kernel_truncation_sigmas,
+            incremental_icra_tolerance=incremental_icra_tolerance,
+            local_projection=local_projection,
         )
 
     def _utcnow(self) -> datetime:
@@ -773,14 +903,6 @@ class RiskSurfaceService:
         c = 2.0 * asin(min(1.0, sqrt(a)))
         return R * c
 
-    def _exp_neg(self, z: float) -> float:
-        """
-        exp(-z) sem importar math.exp explicitamente aqui,
-        usando aproximação estável via pow de e (mantendo simples).
-        """
-        # e ≈ 2.718281828
-        return 2.718281828 ** (-z)
-
     def _median(self, values: List[float]) -> float:
         if not values:
             return 0.0
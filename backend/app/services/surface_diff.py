@@ -0,0 +1,127 @@
+"""
+surface_diff.py
+
+Diferença célula a célula entre duas superfícies de risco (dois buckets)
+do mesmo município, calculada a partir dos rasters persistidos.
+
+Retorna apenas as células cuja variação de risco absoluto passou da tolerância
+(ou que mudaram de nível), mais estatísticas agregadas do movimento.
+
+Este módulo:
+- NÃO acessa banco
+- NÃO conhece modelos ORM
+- NÃO mantém cache (o serviço decide o que cachear)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from backend.app.services.surface_raster import RISK_LEVELS, SurfaceRaster
+
+
+DEFAULT_DIFF_TOLERANCE: float = 0.01
+
+
+class SurfaceDiffError(ValueError):
+    """Superfícies incomparáveis (grids diferentes)."""
+
+
+def diff_surface_rasters(
+    before: SurfaceRaster,
+    after: SurfaceRaster,
+    tolerance: float = DEFAULT_DIFF_TOLERANCE,
+) -> Dict[str, Any]:
+    """
+    {"stats": {...}, "geojson": FeatureCollection das células alteradas}
+
+    Células presentes em apenas uma das superfícies (ex: polígono do município
+    alterado entre os buckets) não são comparadas; aparecem só na contagem.
+    """
+    tol = float(tolerance)
+    if tol < 0:
+        raise SurfaceDiffError("tolerance deve ser >= 0.")
+
+    if (
+        before.spec != after.spec
+        or before.n_rows != after.n_rows
+        or before.n_cols != after.n_cols
+        or before.grid_resolution_m != after.grid_resolution_m
+    ):
+        raise SurfaceDiffError("Superfícies com grids diferentes (resolução ou bbox); não é possível comparar.")
+
+    common, pos_before, pos_after = np.intersect1d(
+        before.cell_index, after.cell_index, assume_unique=True, return_indices=True
+    )
+
+    risk_before = before.risk_abs[pos_before].astype(float)
+    risk_after = after.risk_abs[pos_after].astype(float)
+    level_before = before.level_abs[pos_before]
+    level_after = after.level_abs[pos_after]
+
+    delta = risk_after - risk_before
+    level_step = level_after.astype(np.int16) - level_before.astype(np.int16)
+    changed = (np.abs(delta) > tol) | (level_step != 0)
+
+    changed_pos = np.flatnonzero(changed)
+    polygons = after.cell_polygons(pos_after[changed_pos])
+
+    features: List[Dict[str, Any]] = []
+    for poly, rb, ra, d, lb, la in zip(
+        polygons,
+        risk_before[changed_pos].tolist(),
+        risk_after[changed_pos].tolist(),
+        delta[changed_pos].tolist(),
+        level_before[changed_pos].tolist(),
+        level_after[changed_pos].tolist(),
+    ):
+        features.append(
+            {
+                "type": "Feature",
+                "properties": {
+                    "risk_value_from": rb,
+                    "risk_value_to": ra,
+                    "delta": d,
+                    "risk_level_from": RISK_LEVELS[lb],
+                    "risk_level_to": RISK_LEVELS[la],
+                },
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [poly],
+                },
+            }
+        )
+
+    n_common = int(common.shape[0])
+    stats: Dict[str, Any] = {
+        "compared_cells": n_common,
+        "cells_only_from": int(before.total_cells - n_common),
+        "cells_only_to": int(after.total_cells - n_common),
+        "changed_cells": int(changed_pos.shape[0]),
+        "increased_cells": int(np.count_nonzero(changed & (delta > 0))),
+        "decreased_cells": int(np.count_nonzero(changed & (delta < 0))),
+        "level_up_cells": int(np.count_nonzero(level_step > 0)),
+        "level_down_cells": int(np.count_nonzero(level_step < 0)),
+        "mean_delta": float(delta.mean()) if n_common else 0.0,
+        "mean_abs_delta": float(np.abs(delta).mean()) if n_common else 0.0,
+        "max_increase": float(max(0.0, delta.max())) if n_common else 0.0,
+        "max_decrease": float(max(0.0, -delta.min())) if n_common else 0.0,
+        "level_counts_from": _level_counts(level_before),
+        "level_counts_to": _level_counts(level_after),
+        "tolerance": tol,
+    }
+
+    return {
+        "stats": stats,
+        "geojson": {
+            "type": "FeatureCollection",
+            "features": features,
+        },
+    }
+
+
+def _level_counts(levels: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(levels, minlength=len(RISK_LEVELS)).tolist()
+    return {name: int(c) for name, c in zip(RISK_LEVELS, counts)}
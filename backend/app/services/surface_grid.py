@@ -0,0 +1,194 @@
+"""
+surface_grid.py
+
+Grid regular (lat/lon) do município e máscara dentro/fora do polígono,
+usados pelo motor de superfícies e pelo módulo de analytics.
+
+Este módulo:
+- NÃO acessa banco
+- NÃO conhece modelos ORM
+- NÃO decide resolução (recebe da SurfaceConfig)
+
+A máscara é calculada uma única vez por (município, resolução) de forma vetorizada:
+- shapely >= 2 disponível => `intersects_xy` (mesma regra de `covers` para pontos)
+- fallback => rasterização por scanline (par/ímpar), uma linha do grid por vez
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import cos, radians
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import shapely
+    from shapely.geometry import shape as shapely_shape
+except Exception:
+    shapely = None
+    shapely_shape = None
+
+
+# =====================================================
+# ESPECIFICAÇÃO DO GRID
+# =====================================================
+
+@dataclass(frozen=True)
+class GridSpec:
+    """
+    Grid regular sobre a bbox do município.
+
+    As bordas são geradas por soma acumulada (lat += step), exatamente como o
+    laço original, para que centros e limites das células sejam bit a bit iguais.
+    """
+
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+    step_lat: float
+    step_lon: float
+
+    @classmethod
+    def from_bbox(cls, bbox: Tuple[float, float, float, float], resolution_m: int) -> "GridSpec":
+        """
+        Conversão metro->grau (aproximação):
+        - lat: ~111_320 m por grau
+        - lon: ~111_320*cos(lat) m por grau
+        """
+        min_lat, min_lon, max_lat, max_lon = bbox
+        lat0 = (min_lat + max_lat) / 2.0
+        return cls(
+            min_lat=float(min_lat),
+            min_lon=float(min_lon),
+            max_lat=float(max_lat),
+            max_lon=float(max_lon),
+            step_lat=float(resolution_m) / 111_320.0,
+            step_lon=float(resolution_m) / (111_320.0 * max(0.1, cos(radians(lat0)))),
+        )
+
+    def row_edges(self) -> np.ndarray:
+        return _axis_edges(self.min_lat, self.step_lat, self.max_lat)
+
+    def col_edges(self) -> np.ndarray:
+        return _axis_edges(self.min_lon, self.step_lon, self.max_lon)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return int(self.row_edges().shape[0]), int(self.col_edges().shape[0])
+
+    def cell_centers(self, cell_index: np.ndarray, n_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Centros (lat, lon) das células dadas por índice row-major
+        (mesma ordem do laço lat externo / lon interno).
+        """
+        rows, cols = np.divmod(np.asarray(cell_index, dtype=np.int64), int(n_cols))
+        return (
+            self.row_edges()[rows] + self.step_lat / 2.0,
+            self.col_edges()[cols] + self.step_lon / 2.0,
+        )
+
+
+def _axis_edges(start: float, step: float, stop: float) -> np.ndarray:
+    out: List[float] = []
+    v = start
+    while v <= stop:
+        out.append(v)
+        v += step
+    return np.array(out, dtype=float)
+
+
+# =====================================================
+# MÁSCARA (DENTRO/FORA)
+# =====================================================
+
+def compute_grid_mask(spec: GridSpec, geometry: Dict[str, Any]) -> np.ndarray:
+    """
+    Máscara booleana (n_rows, n_cols): True se o centro da célula está no polígono.
+    """
+    center_lats = spec.row_edges() + spec.step_lat / 2.0
+    center_lons = spec.col_edges() + spec.step_lon / 2.0
+
+    if center_lats.size == 0 or center_lons.size == 0:
+        return np.zeros((center_lats.size, center_lons.size), dtype=bool)
+
+    if shapely is not None and shapely_shape is not None and hasattr(shapely, "intersects_xy"):
+        try:
+            geom = shapely_shape(geometry)
+            shapely.prepare(geom)
+            xx, yy = np.meshgrid(center_lons, center_lats)
+            return np.asarray(shapely.intersects_xy(geom, xx, yy), dtype=bool)
+        except Exception:
+            pass
+
+    return _scanline_mask(center_lats, center_lons, geometry)
+
+
+def _scanline_mask(
+    center_lats: np.ndarray,
+    center_lons: np.ndarray,
+    geometry: Dict[str, Any],
+) -> np.ndarray:
+    """
+    Rasterização por scanline (regra par/ímpar), com a mesma regra do ray casting:
+    dentro do anel externo e fora de qualquer hole; MultiPolygon = união.
+    """
+    gtype = geometry.get("type")
+    coords = geometry.get("coordinates")
+
+    if gtype == "Polygon":
+        polygons = [coords]
+    elif gtype == "MultiPolygon":
+        polygons = list(coords or [])
+    else:
+        polygons = []
+
+    mask = np.zeros((center_lats.size, center_lons.size), dtype=bool)
+    for polygon_coords in polygons:
+        if not polygon_coords or not isinstance(polygon_coords, list):
+            continue
+
+        inside = _ring_mask(center_lats, center_lons, polygon_coords[0])
+        for hole in polygon_coords[1:]:
+            inside &= ~_ring_mask(center_lats, center_lons, hole)
+        mask |= inside
+
+    return mask
+
+
+def _ring_mask(center_lats: np.ndarray, center_lons: np.ndarray, ring: Any) -> np.ndarray:
+    out = np.zeros((center_lats.size, center_lons.size), dtype=bool)
+    if not ring or not isinstance(ring, list):
+        return out
+
+    pts = np.array([[float(p[0]), float(p[1])] for p in ring], dtype=float)
+    x1, y1 = pts[:, 0], pts[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+    for r, y in enumerate(center_lats.tolist()):
+        active = (y1 > y) != (y2 > y)
+        if not active.any():
+            continue
+
+        ax1, ay1, ax2, ay2 = x1[active], y1[active], x2[active], y2[active]
+        x_cross = np.sort((ax2 - ax1) * (y - ay1) / (ay2 - ay1) + ax1)
+
+        # ponto dentro <=> quantidade ímpar de cruzamentos com x < x_cross
+        crossings_right = x_cross.size - np.searchsorted(x_cross, center_lons, side="right")
+        out[r] = (crossings_right % 2) == 1
+
+    return out
+
+
+# =====================================================
+# SERIALIZAÇÃO
+# =====================================================
+
+def pack_mask(mask: np.ndarray) -> bytes:
+    return np.packbits(np.asarray(mask, dtype=bool).ravel()).tobytes()
+
+
+def unpack_mask(data: bytes, n_rows: int, n_cols: int) -> np.ndarray:
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=int(n_rows) * int(n_cols))
+    return bits.astype(bool).reshape(int(n_rows), int(n_cols))
@@ -0,0 +1,144 @@
+"""
+surface_isobands.py
+
+Saída alternativa da superfície de risco: isobandas.
+
+Células vizinhas com o mesmo nível de risco são dissolvidas em um único
+(Multi)Polygon por nível (com buracos), reduzindo a quantidade de features em
+ordens de grandeza para renderização. O raster por célula continua sendo a
+fonte para analytics.
+
+Estratégia:
+1) cada linha do grid vira "runs" horizontais de células consecutivas do mesmo nível
+2) shapely >= 2 disponível => union_all dos retângulos dos runs (bordas compartilhadas
+   são exatas, pois o grid é gerado por soma acumulada)
+3) fallback => MultiPolygon com os retângulos dos runs (sem dissolver entre linhas)
+
+Este módulo:
+- NÃO acessa banco
+- NÃO conhece modelos ORM
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from backend.app.services.surface_raster import RISK_LEVELS, SurfaceRaster
+
+try:
+    import shapely
+    from shapely.geometry import mapping as shapely_mapping
+except Exception:
+    shapely = None
+    shapely_mapping = None
+
+
+ISOBAND_BASES: Tuple[str, ...] = ("absolute", "relative")
+
+
+def _level_runs(
+    dense_levels: np.ndarray,
+    level: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs horizontais (row, col_start, col_end_exclusivo) do nível no grid denso.
+    """
+    mask = dense_levels == level
+    n_rows = mask.shape[0]
+    padded = np.zeros((n_rows, mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+
+    edges = np.diff(padded, axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+    return start_rows, start_cols, end_cols
+
+
+def build_isobands_geojson(raster: SurfaceRaster, basis: str = "absolute") -> Dict[str, Any]:
+    """
+    FeatureCollection com uma feature por nível de risco presente na superfície.
+    """
+    if basis not in ISOBAND_BASES:
+        raise ValueError(f"basis inválido: {basis}. Use um de {ISOBAND_BASES}.")
+
+    levels = raster.level_abs if basis == "absolute" else raster.level_rel
+
+    dense = np.full(raster.n_rows * raster.n_cols, -1, dtype=np.int16)
+    dense[raster.cell_index.astype(np.int64)] = levels.astype(np.int16)
+    dense = dense.reshape(raster.n_rows, raster.n_cols)
+
+    # Mesmas bordas de SurfaceRaster.cell_polygons (largura por linha), para
+    # as isobandas coincidirem com as células do GeoJSON
+    lat_edges = raster.spec.row_edges()
+    lon_edges = np.append(raster.spec.col_edges(), np.nan)
+    step_lat = raster.cell_step_lat
+    row_step_lon = np.array([raster.cell_step_lon(v) for v in lat_edges.tolist()], dtype=np.float64)
+    cell_area_m2 = float(raster.grid_resolution_m) * float(raster.grid_resolution_m)
+
+    color_values = raster.color_value.astype(float)
+    features: List[Dict[str, Any]] = []
+
+    for level, name in enumerate(RISK_LEVELS):
+        in_level = levels == level
+        n_cells = int(np.count_nonzero(in_level))
+        if n_cells == 0:
+            continue
+
+        rows, c0, c1 = _level_runs(dense, level)
+        min_lat = lat_edges[rows]
+        max_lat = min_lat + step_lat
+        min_lon = lon_edges[c0]
+        max_lon = lon_edges[c1 - 1] + row_step_lon[rows]
+
+        geometry = _runs_to_geometry(min_lon, min_lat, max_lon, max_lat)
+
+        mean_color = float(color_values[in_level].mean())
+        hue = (1.0 - max(0.0, min(1.0, mean_color))) * 120.0
+
+        features.append(
+            {
+                "type": "Feature",
+                "properties": {
+                    "risk_level": name,
+                    "risk_level_code": level,
+                    "basis": basis,
+                    "cells": n_cells,
+                    "area_m2": float(n_cells) * cell_area_m2,
+                    "risk_color_value": mean_color,
+                    "color": f"hsl({hue:.2f}, 75%, 45%)",
+                    "grid_resolution_m": int(raster.grid_resolution_m),
+                },
+                "geometry": geometry,
+            }
+        )
+
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+    }
+
+
+def _runs_to_geometry(
+    min_lon: np.ndarray,
+    min_lat: np.ndarray,
+    max_lon: np.ndarray,
+    max_lat: np.ndarray,
+) -> Dict[str, Any]:
+    if shapely is not None and shapely_mapping is not None and hasattr(shapely, "union_all"):
+        try:
+            boxes = shapely.box(min_lon, min_lat, max_lon, max_lat)
+            # simplify(0) só remove vértices colineares deixados pela união
+            return dict(shapely_mapping(shapely.simplify(shapely.union_all(boxes), 0.0)))
+        except Exception:
+            pass
+
+    polygons = [
+        [[[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]]
+        for x0, y0, x1, y1 in zip(min_lon.tolist(), min_lat.tolist(), max_lon.tolist(), max_lat.tolist())
+    ]
+    return {
+        "type": "MultiPolygon",
+        "coordinates": polygons,
+    }
@@ -0,0 +1,344 @@
+"""
+surface_kernel.py
+
+Motor vetorizado (NumPy) do kernel Gaussiano usado na geração de superfícies de risco.
+
+Este módulo:
+- NÃO acessa banco
+- NÃO conhece modelos ORM
+- NÃO decide grid nem sigma
+
+Ele apenas recebe arrays (centros das células, pontos e sigmas), monta a matriz
+de pesos normalizada e aplica essa matriz aos valores de ICRA, em lote.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import cos, pi, radians, sqrt
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.app.utils.spatial_index import GridHash
+
+
+# =====================================================
+# CONSTANTES
+# =====================================================
+
+EARTH_RADIUS_M: float = 6371000.0
+
+# Mesmo corte do kernel escalar: z = d²/(2σ²) > 60 => peso desprezível (~1e-26).
+KERNEL_Z_MAX: float = 60.0
+
+# Folga aplicada ao lado dos baldes do hash espacial (conversão metro->grau aproximada).
+HASH_CELL_MARGIN: float = 0.01
+
+# Limite de elementos (células x pontos) por bloco, para controlar memória
+# em grids grandes (ex: 200k células x milhares de pontos).
+DEFAULT_CHUNK_ELEMENTS: int = 2_000_000
+
+
+# =====================================================
+# DISTÂNCIAS
+# =====================================================
+
+def haversine_matrix_m(
+    lat_a: np.ndarray,
+    lon_a: np.ndarray,
+    lat_b: np.ndarray,
+    lon_b: np.ndarray,
+) -> np.ndarray:
+    """
+    Matriz de distâncias haversine (metros) entre A (linhas) e B (colunas).
+
+    Mesma formulação de RiskSurfaceService._haversine_m, aplicada em lote.
+    """
+    phi_a = np.radians(lat_a)[:, None]
+    phi_b = np.radians(lat_b)[None, :]
+    dphi = np.radians(lat_b[None, :] - lat_a[:, None])
+    dlambda = np.radians(lon_b[None, :] - lon_a[:, None])
+
+    a = np.sin(dphi / 2.0) ** 2 + np.cos(phi_a) * np.cos(phi_b) * np.sin(dlambda / 2.0) ** 2
+    c = 2.0 * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+    return EARTH_RADIUS_M * c
+
+
+def local_projection_origin(lat: np.ndarray, lon: np.ndarray) -> Tuple[float, float]:
+    """
+    Origem (lat0, lon0) do referencial local: centro da bbox das coordenadas.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    if lat.size == 0:
+        return 0.0, 0.0
+    return (
+        float((lat.min() + lat.max()) / 2.0),
+        float((lon.min() + lon.max()) / 2.0),
+    )
+
+
+def project_local_m(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    origin: Tuple[float, float],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Projeção equiretangular em torno de `origin` (metros):
+        x = R·cos(lat0)·Δlon,  y = R·Δlat
+
+    Na escala de um município (dezenas de km) a distância euclidiana nesse
+    referencial difere da haversine em ~|tan(lat0)|·Δlat_origem (ex: < 0,2% a
+    30 km da origem em Goiânia), muito abaixo da incerteza do sigma adaptativo.
+    """
+    lat0, lon0 = origin
+    k = EARTH_RADIUS_M * pi / 180.0
+    x = (np.asarray(lon, dtype=float) - lon0) * (k * cos(radians(lat0)))
+    y = (np.asarray(lat, dtype=float) - lat0) * k
+    return x, y
+
+
+def euclidean_matrix_m(
+    x_a: np.ndarray,
+    y_a: np.ndarray,
+    x_b: np.ndarray,
+    y_b: np.ndarray,
+) -> np.ndarray:
+    """
+    Matriz de distâncias euclidianas (metros) entre A (linhas) e B (colunas),
+    em coordenadas já projetadas por `project_local_m`.
+    """
+    dx = x_b[None, :] - x_a[:, None]
+    dy = y_b[None, :] - y_a[:, None]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+# =====================================================
+# KERNEL
+# =====================================================
+
+def truncation_z_max(truncation_sigmas: Optional[float]) -> float:
+    """
+    Converte raio de truncamento (múltiplos de σ) no corte equivalente em z = d²/(2σ²).
+
+    - None => apenas o corte padrão (z > KERNEL_Z_MAX, ~10.95σ)
+    - n    => suporte limitado a d <= n·σ_i (z <= n²/2)
+
+    Erro do truncamento: cada peso descartado é <= exp(-n²/2) (n=4 => 3.4e-4).
+    Como o risco é uma média ponderada de valores em [0, 1], o erro absoluto
+    por célula é <= m·exp(-n²/2) / K (m pontos descartados, K soma dos pesos
+    mantidos). Esse limite só é pequeno quando K não é: com poucos pontos
+    mantidos, todos perto da borda do raio, K ~ exp(-n²/2) e o erro pode chegar
+    a toda a faixa [0, 1].
+
+    Em particular, célula sem NENHUM ponto dentro do raio (K = 0) deixa de
+    valer a média do kernel completo e passa a valer 0.0 (mesma regra de
+    den <= 0): a diferença é o próprio valor da célula, que pode ser alto
+    quando os pontos vizinhos estão em risco. Por isso o padrão é None.
+    """
+    if truncation_sigmas is None or truncation_sigmas <= 0:
+        return KERNEL_Z_MAX
+    return min(KERNEL_Z_MAX, 0.5 * float(truncation_sigmas) ** 2)
+
+
+def kernel_weights(
+    distances_m: np.ndarray,
+    sigmas_m: np.ndarray,
+    z_max: float = KERNEL_Z_MAX,
+) -> np.ndarray:
+    """
+    Pesos Gaussianos w = exp(-d²/(2σ²)) com o mesmo corte do kernel escalar:
+    - σ <= 0 => peso 0
+    - z > z_max => peso 0
+    """
+    sigmas = np.asarray(sigmas_m, dtype=float)[None, :]
+    valid_sigma = sigmas > 0.0
+    safe_sigmas = np.where(valid_sigma, sigmas, 1.0)
+
+    z = (distances_m * distances_m) / (2.0 * safe_sigmas * safe_sigmas)
+    keep = valid_sigma & (z <= z_max)
+    return np.where(keep, np.exp(-np.where(keep, z, 0.0)), 0.0)
+
+
+# =====================================================
+# MATRIZ DE PESOS (ESPARSA)
+# =====================================================
+
+@dataclass(frozen=True)
+class KernelWeightMatrix:
+    """
+    Matriz esparsa (COO) célula x ponto com pesos normalizados por linha:
+        W[c, i] = w_ci / sum_j(w_cj)
+
+    Com ela, cada superfície vira um produto matriz-vetor:
+        risk = W @ icra
+
+    Células sem nenhum peso não têm entradas e resultam em 0.0 (mesma regra do kernel).
+    """
+
+    n_cells: int
+    n_points: int
+    rows: np.ndarray
+    cols: np.ndarray
+    data: np.ndarray
+
+    @property
+    def nnz(self) -> int:
+        return int(self.data.shape[0])
+
+    def apply(self, point_values: Sequence[float]) -> np.ndarray:
+        values = np.asarray(point_values, dtype=float)
+        if values.shape[0] != self.n_points:
+            raise ValueError(
+                f"Quantidade de valores ({values.shape[0]}) difere da matriz ({self.n_points} pontos)."
+            )
+
+        out = np.bincount(
+            self.rows,
+            weights=self.data * values[self.cols],
+            minlength=self.n_cells,
+        )
+        return np.clip(out, 0.0, 1.0)
+
+    def rows_touching(self, point_mask: np.ndarray) -> np.ndarray:
+        """
+        Máscara (n_cells,) das células com peso não nulo de algum ponto marcado
+        (células dentro do raio efetivo do kernel desses pontos).
+        """
+        mask = np.asarray(point_mask, dtype=bool)
+        touched = np.zeros(self.n_cells, dtype=bool)
+        touched[self.rows[mask[self.cols]]] = True
+        return touched
+
+    def apply_rows(self, point_values: Sequence[float], row_mask: np.ndarray) -> np.ndarray:
+        """
+        Mesmo que `apply`, mas somente para as células de `row_mask`
+        (retorna os valores dessas células, em ordem crescente de índice).
+
+        A soma de cada linha segue a mesma ordem das entradas, então o resultado
+        é idêntico ao de `apply` para essas células.
+        """
+        values = np.asarray(point_values, dtype=float)
+        if values.shape[0] != self.n_points:
+            raise ValueError(
+                f"Quantidade de valores ({values.shape[0]}) difere da matriz ({self.n_points} pontos)."
+            )
+
+        mask = np.asarray(row_mask, dtype=bool)
+        sel = mask[self.rows]
+        out = np.bincount(
+            self.rows[sel],
+            weights=self.data[sel] * values[self.cols[sel]],
+            minlength=self.n_cells,
+        )
+        return np.clip(out[mask], 0.0, 1.0)
+
+
+def build_kernel_weight_matrix(
+    cell_lat: np.ndarray,
+    cell_lon: np.ndarray,
+    point_lat: np.ndarray,
+    point_lon: np.ndarray,
+    point_sigmas: np.ndarray,
+    truncation_sigmas: Optional[float] = None,
+    chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    projection_origin: Optional[Tuple[float, float]] = None,
+) -> KernelWeightMatrix:
+    """
+    Monta a matriz esparsa célula x ponto do kernel Gaussiano, já normalizada por linha.
+
+    Depende apenas do grid, das coordenadas e dos sigmas (não dos valores de ICRA),
+    então pode ser reaproveitada entre buckets.
+
+    Suporte limitado: os pontos são agrupados em um hash espacial com baldes do
+    tamanho do raio efetivo máximo (n·σ_max); cada célula avalia só os pontos dos
+    3x3 baldes vizinhos. O custo cresce com a densidade local, não com o total de pontos.
+
+    projection_origin: se informado, células e pontos são projetados uma única vez
+    no referencial local (`project_local_m`) e as distâncias viram euclidianas;
+    None => haversine por par (comportamento original).
+    """
+    cell_lat = np.asarray(cell_lat, dtype=float)
+    cell_lon = np.asarray(cell_lon, dtype=float)
+    point_lat = np.asarray(point_lat, dtype=float)
+    point_lon = np.asarray(point_lon, dtype=float)
+    point_sigmas = np.asarray(point_sigmas, dtype=float)
+
+    n_cells = int(cell_lat.shape[0])
+    n_points = int(point_lat.shape[0])
+
+    rows_parts: List[np.ndarray] = []
+    cols_parts: List[np.ndarray] = []
+    data_parts: List[np.ndarray] = []
+
+    z_max = truncation_z_max(truncation_sigmas)
+    sigma_max = float(point_sigmas.max()) if n_points else 0.0
+    radius_m = sqrt(2.0 * z_max) * sigma_max
+
+    if n_cells > 0 and n_points > 0 and radius_m > 0:
+        if projection_origin is not None:
+            # Referencial local em metros: baldes exatos do tamanho do raio.
+            cell_x_m, cell_y_m = project_local_m(cell_lat, cell_lon, projection_origin)
+            point_x_m, point_y_m = project_local_m(point_lat, point_lon, projection_origin)
+
+            point_hash = GridHash(point_x_m, point_y_m, cell_x=radius_m, cell_y=radius_m)
+            cix, ciy = point_hash.keys_for(cell_x_m, cell_y_m)
+        else:
+            # Baldes em graus, conservadores: usa o maior |lat| para o lado em longitude.
+            lat_abs_max = float(max(np.abs(cell_lat).max(), np.abs(point_lat).max()))
+            m_per_deg = EARTH_RADIUS_M * pi / 180.0
+            cell_y = radius_m / m_per_deg * (1.0 + HASH_CELL_MARGIN)
+            cell_x = radius_m / (m_per_deg * max(0.01, cos(radians(lat_abs_max)))) * (1.0 + HASH_CELL_MARGIN)
+
+            point_hash = GridHash(point_lon, point_lat, cell_x=cell_x, cell_y=cell_y)
+            cix, ciy = point_hash.keys_for(cell_lon, cell_lat)
+
+        order = np.lexsort((ciy, cix))
+        keys = np.column_stack((cix[order], ciy[order]))
+        uniq, starts = np.unique(keys, axis=0, return_index=True)
+        bounds = list(starts.tolist()) + [n_cells]
+
+        for b, (kx, ky) in enumerate(uniq.tolist()):
+            candidates = point_hash.neighbors(int(kx), int(ky))
+            if candidates.size == 0:
+                continue
+
+            cells = order[bounds[b]:bounds[b + 1]]
+            rows_per_chunk = max(1, int(chunk_elements) // int(candidates.size))
+
+            for start in range(0, cells.size, rows_per_chunk):
+                block = cells[start:start + rows_per_chunk]
+
+                if projection_origin is not None:
+                    d = euclidean_matrix_m(
+                        cell_x_m[block],
+                        cell_y_m[block],
+                        point_x_m[candidates],
+                        point_y_m[candidates],
+                    )
+                else:
+                    d = haversine_matrix_m(
+                        cell_lat[block],
+                        cell_lon[block],
+                        point_lat[candidates],
+                        point_lon[candidates],
+                    )
+                w = kernel_weights(d, point_sigmas[candidates], z_max=z_max)
+                den = w.sum(axis=1)
+
+                r, c = np.nonzero(w)
+                rows_parts.append(block[r].astype(np.int32))
+                cols_parts.append(candidates[c].astype(np.int32))
+                data_parts.append(w[r, c] / den[r])
+
+    def _concat(parts: List[np.ndarray], dtype: Any) -> np.ndarray:
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+    return KernelWeightMatrix(
+        n_cells=n_cells,
+        n_points=n_points,
+        rows=_concat(rows_parts, np.int32),
+        cols=_concat(cols_parts, np.int32),
+        data=_concat(data_parts, float),
+    )
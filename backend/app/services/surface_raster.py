@@ -0,0 +1,279 @@
+"""
+surface_raster.py
+
+Formato compacto (raster) de persistência das superfícies de risco.
+
+Em vez de um FeatureCollection com um Polygon e várias propriedades por célula,
+a superfície é armazenada como:
+- especificação do grid (origem, passo, shape) => mesma GridSpec da máscara
+- índices (row-major) das células dentro do município
+- arrays por célula: risk_abs/risk_rel/risk_color_value (float32),
+  nível absoluto/relativo (uint8)
+- entradas da geração (v2): ICRA absoluto/relativo efetivo por ponto e o digest
+  do layout, usados pelo recálculo incremental do bucket seguinte
+
+Serializado com `np.savez_compressed` em uma coluna binária.
+O GeoJSON é materializado apenas quando um cliente pede (`to_geojson`,
+ou `iter_features` para servir em stream).
+
+Este módulo:
+- NÃO acessa banco
+- NÃO conhece modelos ORM
+- NÃO calcula kernel nem níveis (recebe prontos do serviço)
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from math import cos, radians
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from backend.app.services.surface_grid import GridSpec
+
+
+# =====================================================
+# CONSTANTES
+# =====================================================
+
+RASTER_FORMAT_VERSION: int = 2
+
+# Versões que `decode` ainda aceita (v1 não tem as entradas por ponto).
+_SUPPORTED_VERSIONS = (1, 2)
+
+# Códigos uint8 dos níveis de risco (ordem crescente de severidade).
+RISK_LEVELS: tuple = ("Baixo", "Moderado", "Alto", "Muito Alto")
+
+_LEVEL_CODES: Dict[str, int] = {name: code for code, name in enumerate(RISK_LEVELS)}
+
+
+class SurfaceRasterError(ValueError):
+    """Payload raster inválido ou incompatível."""
+
+
+# =====================================================
+# RASTER
+# =====================================================
+
+@dataclass(frozen=True)
+class SurfaceRaster:
+    """
+    Superfície de risco em formato raster esparso (somente células do município).
+    """
+
+    spec: GridSpec
+    n_rows: int
+    n_cols: int
+    grid_resolution_m: int
+    cell_index: np.ndarray  # uint32, índice row-major em (n_rows, n_cols)
+    risk_abs: np.ndarray  # float32
+    risk_rel: np.ndarray  # float32
+    color_value: np.ndarray  # float32
+    level_abs: np.ndarray  # uint8 (RISK_LEVELS)
+    level_rel: np.ndarray  # uint8 (RISK_LEVELS)
+
+    # Entradas da geração (ordem dos pontos do layout); None em rasters v1.
+    layout_digest: str = ""
+    point_icra_abs: Optional[np.ndarray] = None  # float64
+    point_icra_rel: Optional[np.ndarray] = None  # float64
+
+    @property
+    def total_cells(self) -> int:
+        return int(self.cell_index.shape[0])
+
+    @property
+    def has_inputs(self) -> bool:
+        return bool(self.layout_digest) and self.point_icra_abs is not None and self.point_icra_rel is not None
+
+    # -------------------------------------------------
+    # SERIALIZAÇÃO
+    # -------------------------------------------------
+
+    def encode(self) -> bytes:
+        extra: Dict[str, np.ndarray] = {}
+        if self.has_inputs:
+            extra = {
+                "layout_digest": np.array([self.layout_digest]),
+                "point_icra_abs": np.asarray(self.point_icra_abs, dtype=np.float64),
+                "point_icra_rel": np.asarray(self.point_icra_rel, dtype=np.float64),
+            }
+
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            version=np.array([RASTER_FORMAT_VERSION], dtype=np.int32),
+            spec=np.array(
+                [
+                    self.spec.min_lat,
+                    self.spec.min_lon,
+                    self.spec.max_lat,
+                    self.spec.max_lon,
+                    self.spec.step_lat,
+                    self.spec.step_lon,
+                ],
+                dtype=np.float64,
+            ),
+            shape=np.array([self.n_rows, self.n_cols, self.grid_resolution_m], dtype=np.int64),
+            cell_index=self.cell_index,
+            risk_abs=self.risk_abs,
+            risk_rel=self.risk_rel,
+            color_value=self.color_value,
+            level_abs=self.level_abs,
+            level_rel=self.level_rel,
+            **extra,
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def decode(cls, data: bytes) -> "SurfaceRaster":
+        try:
+            with np.load(io.BytesIO(data), allow_pickle=False) as z:
+                version = int(z["version"][0])
+                if version not in _SUPPORTED_VERSIONS:
+                    raise SurfaceRasterError(f"Versão de raster não suportada: {version}")
+
+                spec_arr = z["spec"].tolist()
+                n_rows, n_cols, resolution_m = (int(v) for v in z["shape"].tolist())
+
+                return cls(
+                    spec=GridSpec(*spec_arr),
+                    n_rows=n_rows,
+                    n_cols=n_cols,
+                    grid_resolution_m=resolution_m,
+                    cell_index=z["cell_index"],
+                    risk_abs=z["risk_abs"],
+                    risk_rel=z["risk_rel"],
+                    color_value=z["color_value"],
+                    level_abs=z["level_abs"],
+                    level_rel=z["level_rel"],
+                    layout_digest=str(z["layout_digest"][0]) if "layout_digest" in z.files else "",
+                    point_icra_abs=z["point_icra_abs"] if "point_icra_abs" in z.files else None,
+                    point_icra_rel=z["point_icra_rel"] if "point_icra_rel" in z.files else None,
+                )
+        except SurfaceRasterError:
+            raise
+        except Exception as e:
+            raise SurfaceRasterError(f"Falha ao decodificar raster da superfície: {e}") from e
+
+    # -------------------------------------------------
+    # MATERIALIZAÇÃO
+    # -------------------------------------------------
+
+    def to_geojson(self) -> Dict[str, Any]:
+        """
+        Materializa o FeatureCollection de polígonos de células
+        (mesmo formato historicamente persistido em risk_surfaces.geojson).
+        """
+        return {
+            "type": "FeatureCollection",
+            "features": list(self.iter_features()),
+        }
+
+    def iter_features(self, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Features de `to_geojson` geradas sob demanda: os polígonos são
+        montados `chunk_size` células por vez, sem materializar a lista inteira.
+        """
+        resolution_m = int(self.grid_resolution_m)
+        step = max(1, int(chunk_size))
+
+        def _relative_color(rank: float) -> str:
+            rank = max(0.0, min(1.0, rank))
+            hue = (1.0 - rank) * 120.0
+            return f"hsl({hue:.2f}, 75%, 45%)"
+
+        for start in range(0, self.total_cells, step):
+            stop = min(start + step, self.total_cells)
+            for poly, risk_abs, risk_rel, color_value, level_abs, level_rel in zip(
+                self.cell_polygons(np.arange(start, stop)),
+                self.risk_abs[start:stop].tolist(),
+                self.risk_rel[start:stop].tolist(),
+                self.color_value[start:stop].tolist(),
+                self.level_abs[start:stop].tolist(),
+                self.level_rel[start:stop].tolist(),
+            ):
+                yield {
+                    "type": "Feature",
+                    "properties": {
+                        "risk_value": float(risk_abs),
+                        "risk_level": RISK_LEVELS[level_abs],
+                        "risk_value_relative": float(risk_rel),
+                        "risk_level_relative": RISK_LEVELS[level_rel],
+                        "risk_color_value": float(color_value),
+                        "color": _relative_color(float(color_value)),
+                        "color_basis": "risk_level_calibrated",
+                        "grid_resolution_m": resolution_m,
+                    },
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [poly],
+                    },
+                }
+
+    @property
+    def cell_step_lat(self) -> float:
+        """
+        Altura (graus) dos polígonos de célula.
+        """
+        return float(int(self.grid_resolution_m)) / 111_320.0
+
+    def cell_step_lon(self, min_lat: float) -> float:
+        """
+        Largura (graus) dos polígonos de célula da linha que começa em
+        `min_lat`: varia com a latitude da linha, não é o passo da GridSpec.
+        """
+        return float(int(self.grid_resolution_m)) / (
+            111_320.0 * max(0.1, cos(radians(min_lat + self.cell_step_lat / 2.0)))
+        )
+
+    def cell_polygons(self, positions: Optional[np.ndarray] = None) -> List[List[List[float]]]:
+        """
+        Anel (GeoJSON) de cada célula, na ordem de `cell_index`
+        ou apenas das posições informadas.
+        """
+        cell_index = self.cell_index if positions is None else self.cell_index[np.asarray(positions, dtype=np.int64)]
+        rows, cols = np.divmod(cell_index.astype(np.int64), self.n_cols)
+        min_lats = self.spec.row_edges()[rows].tolist()
+        min_lons = self.spec.col_edges()[cols].tolist()
+
+        step_lat = self.cell_step_lat
+
+        out: List[List[List[float]]] = []
+        for min_lat, min_lon in zip(min_lats, min_lons):
+            step_lon = self.cell_step_lon(min_lat)
+
+            max_lat = min_lat + step_lat
+            max_lon = min_lon + step_lon
+
+            out.append(
+                [
+                    [min_lon, min_lat],
+                    [max_lon, min_lat],
+                    [max_lon, max_lat],
+                    [min_lon, max_lat],
+                    [min_lon, min_lat],
+                ]
+            )
+        return out
+
+
+def level_codes(levels: Sequence[str]) -> np.ndarray:
+    return np.array([_LEVEL_CODES[v] for v in levels], dtype=np.uint8)
+
+
+def materialize_surface_geojson(
+    geojson: Optional[Dict[str, Any]],
+    raster: Optional[bytes],
+) -> Dict[str, Any]:
+    """
+    GeoJSON de uma superfície persistida:
+    - superfícies antigas => geojson armazenado
+    - superfícies novas => materializado a partir do raster
+    """
+    if geojson is not None:
+        return geojson
+    if raster is None:
+        raise SurfaceRasterError("Superfície sem geojson e sem raster.")
+    return SurfaceRaster.decode(raster).to_geojson()
@@ -0,0 +1,219 @@
+"""
+surface_stats.py
+
+Bloco compacto de estatísticas por célula, calculado na geração da superfície
+e persistido junto dela (risk_surfaces.stats).
+
+Permite que o módulo de analytics calcule as métricas territoriais sem
+materializar o GeoJSON nem projetar célula a célula:
+- ICRA absoluto por célula (clampado em [0, 1]) em ordem crescente
+- área (m², UTM) de cada célula, na mesma ordem => área de alto risco para
+  qualquer threshold via busca binária
+- contagem de células por nível (absoluto e relativo)
+- média / desvio padrão populacional / mediana / máximo
+
+A área de cada célula é a do mesmo polígono que `SurfaceRaster.to_geojson`
+materializa, projetado no fuso UTM do centro do grid (detecção reutilizada de
+analytics.spatial_ops). Sem shapely/pyproj, cai para resolução².
+
+Este módulo:
+- NÃO acessa banco
+- NÃO conhece modelos ORM
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from backend.app.services.surface_raster import RISK_LEVELS, SurfaceRaster
+
+try:
+    from shapely.geometry import box as shapely_box
+
+    from backend.app.analytics.spatial_ops import (
+        build_transformer_wgs84_to,
+        detect_utm_crs_for_geometry_wgs84,
+    )
+except Exception:
+    shapely_box = None
+    build_transformer_wgs84_to = None
+    detect_utm_crs_for_geometry_wgs84 = None
+
+
+STATS_FORMAT_VERSION: int = 1
+
+
+class SurfaceStatsError(ValueError):
+    """Payload de estatísticas inválido ou incompatível."""
+
+
+# =====================================================
+# ESTATÍSTICAS
+# =====================================================
+
+@dataclass(frozen=True)
+class SurfaceStats:
+    """
+    Estatísticas por célula de uma superfície (somente células do município).
+    """
+
+    icra_sorted: np.ndarray  # float32, crescente
+    cell_area_m2: np.ndarray  # float64, alinhado a icra_sorted
+    level_counts_abs: np.ndarray  # int64 (RISK_LEVELS)
+    level_counts_rel: np.ndarray  # int64 (RISK_LEVELS)
+    mean_icra: float
+    std_icra: float
+    median_icra: float
+    max_icra: float
+
+    @property
+    def total_cells(self) -> int:
+        return int(self.icra_sorted.shape[0])
+
+    def high_risk_slice(self, threshold: float) -> slice:
+        """
+        Células com ICRA >= threshold (sufixo do array ordenado).
+        """
+        start = int(np.searchsorted(self.icra_sorted.astype(float), float(threshold), side="left"))
+        return slice(start, self.total_cells)
+
+    def level_counts(self, basis: str = "absolute") -> dict:
+        counts = self.level_counts_abs if basis == "absolute" else self.level_counts_rel
+        return {name: int(c) for name, c in zip(RISK_LEVELS, counts.tolist())}
+
+    # -------------------------------------------------
+    # SERIALIZAÇÃO
+    # -------------------------------------------------
+
+    def encode(self) -> bytes:
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            version=np.array([STATS_FORMAT_VERSION], dtype=np.int32),
+            icra_sorted=self.icra_sorted,
+            cell_area_m2=self.cell_area_m2,
+            level_counts_abs=self.level_counts_abs,
+            level_counts_rel=self.level_counts_rel,
+            summary=np.array(
+                [self.mean_icra, self.std_icra, self.median_icra, self.max_icra],
+                dtype=np.float64,
+            ),
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def decode(cls, data: bytes) -> "SurfaceStats":
+        try:
+            with np.load(io.BytesIO(data), allow_pickle=False) as z:
+                version = int(z["version"][0])
+                if version != STATS_FORMAT_VERSION:
+                    raise SurfaceStatsError(f"Versão de estatísticas não suportada: {version}")
+
+                mean_icra, std_icra, median_icra, max_icra = (float(v) for v in z["summary"].tolist())
+                return cls(
+                    icra_sorted=z["icra_sorted"],
+                    cell_area_m2=z["cell_area_m2"],
+                    level_counts_abs=z["level_counts_abs"],
+                    level_counts_rel=z["level_counts_rel"],
+                    mean_icra=mean_icra,
+                    std_icra=std_icra,
+                    median_icra=median_icra,
+                    max_icra=max_icra,
+                )
+        except SurfaceStatsError:
+            raise
+        except Exception as e:
+            raise SurfaceStatsError(f"Falha ao decodificar estatísticas da superfície: {e}") from e
+
+
+def build_surface_stats(raster: SurfaceRaster) -> SurfaceStats:
+    """
+    Calcula as estatísticas a partir do raster recém-gerado.
+    """
+    icra = np.clip(raster.risk_abs.astype(np.float32), 0.0, 1.0)
+    order = np.argsort(icra, kind="stable")
+    icra_sorted = icra[order]
+    areas = cell_areas_m2(raster)[order]
+
+    values = icra_sorted.astype(float)
+    n = values.shape[0]
+
+    return SurfaceStats(
+        icra_sorted=icra_sorted,
+        cell_area_m2=areas,
+        level_counts_abs=np.bincount(raster.level_abs, minlength=len(RISK_LEVELS)).astype(np.int64),
+        level_counts_rel=np.bincount(raster.level_rel, minlength=len(RISK_LEVELS)).astype(np.int64),
+        mean_icra=float(values.mean()) if n else 0.0,
+        std_icra=float(values.std()) if n >= 2 else 0.0,
+        median_icra=float(np.median(values)) if n else 0.0,
+        max_icra=float(values[-1]) if n else 0.0,
+    )
+
+
+# =====================================================
+# ÁREA DAS CÉLULAS
+# =====================================================
+
+def cell_areas_m2(raster: SurfaceRaster) -> np.ndarray:
+    """
+    Área (m²) de cada célula, na ordem de `raster.cell_index`.
+    """
+    resolution_m = float(raster.grid_resolution_m)
+    n = raster.total_cells
+    if n == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    min_lat, min_lon, max_lat, max_lon = _cell_bounds(raster)
+
+    transformer = _utm_transformer(raster)
+    if transformer is None:
+        return np.full(n, resolution_m * resolution_m, dtype=np.float64)
+
+    # cantos no sentido do anel do GeoJSON: (min,min) (max,min) (max,max) (min,max)
+    xs = np.stack([min_lon, max_lon, max_lon, min_lon], axis=1)
+    ys = np.stack([min_lat, min_lat, max_lat, max_lat], axis=1)
+    px, py = transformer.transform(xs.ravel(), ys.ravel())
+    px = np.asarray(px, dtype=float).reshape(n, 4)
+    py = np.asarray(py, dtype=float).reshape(n, 4)
+
+    # shoelace
+    area = 0.5 * np.abs(
+        (px * np.roll(py, -1, axis=1)).sum(axis=1) - (py * np.roll(px, -1, axis=1)).sum(axis=1)
+    )
+    return area.astype(np.float64)
+
+
+def _cell_bounds(raster: SurfaceRaster) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Limites dos polígonos materializados por `SurfaceRaster.to_geojson`
+    (passo de longitude pela latitude central de cada célula).
+    """
+    rows, cols = np.divmod(raster.cell_index.astype(np.int64), raster.n_cols)
+    min_lat = raster.spec.row_edges()[rows]
+    min_lon = raster.spec.col_edges()[cols]
+
+    resolution_m = float(raster.grid_resolution_m)
+    step_lat = resolution_m / 111_320.0
+    step_lon = resolution_m / (111_320.0 * np.maximum(0.1, np.cos(np.radians(min_lat + step_lat / 2.0))))
+
+    return min_lat, min_lon, min_lat + step_lat, min_lon + step_lon
+
+
+def _utm_transformer(raster: SurfaceRaster):
+    """
+    Transformer WGS84 -> UTM do centro do grid, com a mesma detecção de fuso
+    do analytics (`detect_utm_crs_for_geometry_wgs84`). None sem shapely/pyproj.
+    """
+    if detect_utm_crs_for_geometry_wgs84 is None:
+        return None
+
+    spec = raster.spec
+    bbox = shapely_box(spec.min_lon, spec.min_lat, spec.max_lon, spec.max_lat)
+    try:
+        return build_transformer_wgs84_to(detect_utm_crs_for_geometry_wgs84(bbox))
+    except Exception:
+        return None
@@ -0,0 +1,166 @@
+"""
+surface_tiles.py
+
+Renderização de tiles raster (PNG, esquema XYZ / Web Mercator) a partir do
+raster compacto de uma superfície de risco.
+
+Este módulo:
+- NÃO acessa banco
+- NÃO conhece modelos ORM
+- NÃO mantém cache (o serviço decide o que cachear e por quanto tempo)
+
+Cada pixel recebe a cor da célula do grid que contém o seu centro
+(mesma paleta hsl do GeoJSON: verde -> vermelho por risk_color_value);
+pixels fora do município ficam transparentes.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from math import atan, degrees, pi, sinh
+from typing import Tuple
+
+import numpy as np
+
+from backend.app.services.surface_raster import SurfaceRaster
+
+
+# =====================================================
+# CONSTANTES
+# =====================================================
+
+TILE_SIZE: int = 256
+MAX_ZOOM: int = 22
+
+# Opacidade dos pixels dentro do município (0-255).
+TILE_ALPHA: int = 200
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class TileRequestError(ValueError):
+    """Coordenadas de tile inválidas."""
+
+
+# =====================================================
+# GEOMETRIA XYZ
+# =====================================================
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    (min_lat, min_lon, max_lat, max_lon) do tile XYZ.
+    """
+    validate_tile(z, x, y)
+    n = float(2 ** z)
+    min_lon = x / n * 360.0 - 180.0
+    max_lon = (x + 1) / n * 360.0 - 180.0
+    max_lat = degrees(atan(sinh(pi * (1.0 - 2.0 * y / n))))
+    min_lat = degrees(atan(sinh(pi * (1.0 - 2.0 * (y + 1) / n))))
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def validate_tile(z: int, x: int, y: int) -> None:
+    if not (0 <= z <= MAX_ZOOM):
+        raise TileRequestError(f"Zoom fora do intervalo [0, {MAX_ZOOM}]: {z}")
+    n = 2 ** z
+    if not (0 <= x < n and 0 <= y < n):
+        raise TileRequestError(f"Tile fora do intervalo para z={z}: x={x}, y={y}")
+
+
+def _pixel_centers(z: int, x: int, y: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = float(2 ** z)
+    offsets = (np.arange(size, dtype=float) + 0.5) / size
+
+    lons = (x + offsets) / n * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(pi * (1.0 - 2.0 * (y + offsets) / n))))
+    return lats, lons
+
+
+# =====================================================
+# RENDERIZAÇÃO
+# =====================================================
+
+def render_tile_png(raster: SurfaceRaster, z: int, x: int, y: int, size: int = TILE_SIZE) -> bytes:
+    """
+    Renderiza o tile (z, x, y) da superfície como PNG RGBA.
+    """
+    rgba = np.zeros((size, size, 4), dtype=np.uint8)
+
+    t_min_lat, t_min_lon, t_max_lat, t_max_lon = tile_bounds(z, x, y)
+    spec = raster.spec
+    g_max_lat = spec.min_lat + raster.n_rows * spec.step_lat
+    g_max_lon = spec.min_lon + raster.n_cols * spec.step_lon
+
+    intersects = not (
+        t_max_lat < spec.min_lat or t_min_lat > g_max_lat
+        or t_max_lon < spec.min_lon or t_min_lon > g_max_lon
+    )
+    if not intersects or raster.total_cells == 0:
+        return encode_png_rgba(rgba)
+
+    # Grid denso: posição no array de células (-1 = fora do município)
+    dense = np.full(raster.n_rows * raster.n_cols, -1, dtype=np.int64)
+    dense[raster.cell_index.astype(np.int64)] = np.arange(raster.total_cells, dtype=np.int64)
+    dense = dense.reshape(raster.n_rows, raster.n_cols)
+
+    lats, lons = _pixel_centers(z, x, y, size)
+    rows = np.floor((lats - spec.min_lat) / spec.step_lat).astype(np.int64)
+    cols = np.floor((lons - spec.min_lon) / spec.step_lon).astype(np.int64)
+    row_ok = (rows >= 0) & (rows < raster.n_rows)
+    col_ok = (cols >= 0) & (cols < raster.n_cols)
+
+    cell = np.full((size, size), -1, dtype=np.int64)
+    cell[np.ix_(row_ok, col_ok)] = dense[np.ix_(rows[row_ok], cols[col_ok])]
+
+    inside = cell >= 0
+    if inside.any():
+        rgb = color_values_to_rgb(raster.color_value.astype(float))
+        rgba[inside, :3] = rgb[cell[inside]]
+        rgba[inside, 3] = TILE_ALPHA
+
+    return encode_png_rgba(rgba)
+
+
+def color_values_to_rgb(color_values: np.ndarray) -> np.ndarray:
+    """
+    Paleta do GeoJSON (hsl((1 - v) * 120, 75%, 45%)) vetorizada, em uint8 (n, 3).
+    """
+    v = np.clip(np.asarray(color_values, dtype=float), 0.0, 1.0)
+    h = (1.0 - v) * 120.0
+    s, l = 0.75, 0.45
+
+    a = s * min(l, 1.0 - l)
+    channels = []
+    for n in (0.0, 8.0, 4.0):
+        k = (n + h / 30.0) % 12.0
+        channels.append(l - a * np.maximum(-1.0, np.minimum(np.minimum(k - 3.0, 9.0 - k), 1.0)))
+
+    return np.rint(np.stack(channels, axis=-1) * 255.0).astype(np.uint8)
+
+
+# =====================================================
+# PNG (zlib, sem dependências externas)
+# =====================================================
+
+def encode_png_rgba(rgba: np.ndarray) -> bytes:
+    height, width = int(rgba.shape[0]), int(rgba.shape[1])
+
+    # filtro 0 (None) no início de cada linha
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"".join(
+        (
+            _PNG_SIGNATURE,
+            _png_chunk(b"IHDR", ihdr),
+            _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(tag + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
@@ -7,6 +7,7 @@ Configuração central do Backend Core do projeto ClimaGyn.
 - Suporte a ambientes (dev/staging/prod)
 - Configuração de banco de dados (PostgreSQL)
 - Configuração de scheduler de risco
+- Configuração da superfície de risco (grid + kernel)
 - Configuração de provedores climáticos
 - Configuração da API de IA (ICRA)
 
@@ -89,10 +90,15 @@ class IASettings(BaseAppSettings):
 
     BASE_URL: str = Field(default="http://localhost:8501")
     PREDICT_ENDPOINT: str = Field(default="/icra/predict")
+    PREDICT_BATCH_ENDPOINT: str = Field(default="/icra/predict/batch")
     HEALTH_ENDPOINT: str = Field(default="/health")
 
     TIMEOUT_SECONDS: int = Field(default=30)
 
+    # Pontos por chamada a PREDICT_BATCH_ENDPOINT no ciclo do scheduler.
+    # 1 => uma chamada a PREDICT_ENDPOINT por ponto (comportamento antigo).
+    BATCH_SIZE: int = Field(default=256)
+
     MODEL_NAME: str = Field(default="ICRA")
     MODEL_VERSION: str = Field(default="v1.0")
 
@@ -118,6 +124,25 @@ class ClimateSettings(BaseAppSettings):
     CLIMATE_TIMEOUT_SECONDS: int = Field(default=20)
     CLIMATE_MAX_RETRIES: int = Field(default=2)
 
+    # Agrupamento exato de pontos no ciclo do scheduler: pontos cujo nó da grade
+    # do provedor é o mesmo (latitude/longitude da célula + elevação do downscaling,
+    # como a Open-Meteo reporta na resposta) compartilham uma única busca climática.
+    # Sem desvio nas features: nó igual => resposta igual. Os nós são aprendidos
+    # das respostas (cache em memória por processo): o primeiro ciclo busca todos
+    # os pontos; os seguintes, um por nó.
+    CLIMATE_COALESCE_BY_PROVIDER_NODE: bool = Field(default=True)
+    CLIMATE_NODE_CACHE_SIZE: int = Field(default=50_000)
+
+    # Localizações por requisição nas buscas em lote (lat/lon separadas por vírgula).
+    CLIMATE_BATCH_SIZE: int = Field(default=50)
+
+    # Cache persistente da série diária (tabela climate_daily): dias completos
+    # (sem valores nulos) anteriores a hoje - CLIMATE_FINAL_LAG_DAYS e ao último dia
+    # completo da resposta - CLIMATE_FINAL_LAG_DAYS são servidos do banco; só a cauda
+    # vai ao provedor.
+    CLIMATE_CACHE_ENABLED: bool = Field(default=True)
+    CLIMATE_FINAL_LAG_DAYS: int = Field(default=5)
+
     # OpenWeather 
     OPEN_WEATHER_BASE_URL: str = Field(
         default="https://api.openweathermap.org/data/2.5"
@@ -141,7 +166,75 @@ class RiskSettings(BaseAppSettings):
     SNAPSHOT_TTL_SECONDS: int = Field(default=10800)  
     SCHEDULER_ENABLED: bool = Field(default=True)
     FALLBACK_ON_DEMAND: bool = Field(default=True)
+
+    # Cálculo sob demanda concorrente do mesmo (ponto, ciclo) já é deduplicado
+    # no processo. True => também entre processos, via pg_advisory_xact_lock
+    # (somente PostgreSQL; ignorado em outros bancos).
+    ON_DEMAND_DB_LOCK: bool = Field(default=False)
+    HIGH_RISK_THRESHOLD: float = Field(default=0.7)
+
+    # Pontos calculados em paralelo no ciclo do scheduler (clima + IA são I/O de rede).
+    # 1 => sequencial. A persistência continua na thread do ciclo (uma sessão).
+    CYCLE_PARALLELISM: int = Field(default=8)
+
+    # Snapshots por INSERT ... ON CONFLICT DO UPDATE ao persistir o ciclo.
+    SNAPSHOT_UPSERT_CHUNK_SIZE: int = Field(default=500)
+
+# ==========================================================
+# SUPERFÍCIE DE RISCO (GRID + KERNEL)
+# ==========================================================
+
+class SurfaceSettings(BaseAppSettings):
+    """
+    Configurações da geração de superfícies de risco (grid + kernel adaptativo).
+    """
+
+    GRID_RESOLUTION_M: int = Field(default=350)
+    MAX_CELLS: int = Field(default=200_000)
+
+    KNN_K: int = Field(default=4)
+    SIGMA_MIN_M: int = Field(default=180)
+    SIGMA_MAX_M: int = Field(default=1200)
+    SIGMA_SCALE: float = Field(default=0.50)
+
     HIGH_RISK_THRESHOLD: float = Field(default=0.7)
+    T_BAIXO: float = Field(default=0.142)
+    T_MODERADO: float = Field(default=0.278)
+    T_ALTO: float = Field(default=0.426)
+
+    # Raio de truncamento do kernel em múltiplos de sigma (ex: 4.0).
+    # None => apenas o corte padrão z > 60 (~10.95 sigma), resultado idêntico ao kernel completo.
+    # Com truncamento, células sem ponto dentro do raio passam a valer 0.0 (ver
+    # surface_kernel.truncation_z_max): só usar com malha de pontos densa.
+    KERNEL_TRUNCATION_SIGMAS: Optional[float] = Field(default=None)
+
+    # Distâncias do kernel e do kNN em um referencial métrico local (equiretangular
+    # centrado no grid), calculadas como euclidianas em lote.
+    # Muda a superfície em relação à haversine (risk_abs até ~1e-3, alguns níveis
+    # e a área de alto risco): desligado até ser validado.
+    # False => haversine por par (resultado idêntico à versão original).
+    LOCAL_PROJECTION: bool = Field(default=False)
+
+    # Quantidade de layouts (grid + sigmas + matriz de pesos) mantidos em memória
+    LAYOUT_CACHE_SIZE: int = Field(default=8)
+
+    # Recálculo incremental no scheduler: só células no raio de pontos cujo ICRA
+    # (absoluto ou rank relativo) mudou mais que a tolerância em relação à superfície anterior.
+    # Só compensa com KERNEL_TRUNCATION_SIGMAS definido (ex: 3.0): no suporte padrão
+    # (~10.95 sigma, ~13 km) qualquer ponto alterado alcança quase todo o grid do
+    # município e o "incremental" recalcula praticamente tudo. Desligado por padrão.
+    INCREMENTAL_RECOMPUTE: bool = Field(default=False)
+    INCREMENTAL_ICRA_TOLERANCE: float = Field(default=0.005)
+
+    # Processos para gerar superfícies por município no scheduler.
+    # 0 => os.cpu_count(); 1 => sequencial (sem process pool).
+    GENERATION_WORKERS: int = Field(default=0)
+
+    # Quantidade de respostas GET /surface/{id} (JSON comprimido) mantidas em memória
+    RESPONSE_CACHE_SIZE: int = Field(default=32)
+
+    # Quantidade de tiles PNG (/surface/{id}/tiles/{z}/{x}/{y}) mantidos em memória
+    TILE_CACHE_SIZE: int = Field(default=2048)
 
 # ==========================================================
 # MAPA / PONTOS
@@ -206,6 +299,7 @@ class Settings:
     IA = IASettings()
     CLIMATE = ClimateSettings()
     RISK = RiskSettings()
+    SURFACE = SurfaceSettings()
     MAP = MapSettings()
     DATA = DataSettings()
     CORS = CORSSettings()
@@ -0,0 +1,80 @@
+"""
+db_metrics.py
+
+Contagem de round trips ao banco (statements + commits/rollbacks) feitos por
+uma thread durante um bloco de código. Usado para observabilidade do ciclo.
+
+Regras arquiteturais do projeto:
+- NÃO conhece modelos ORM
+- Conta apenas a thread que abriu o bloco (outras requisições/threads que
+  usam a mesma engine não entram na conta)
+- Nenhuma lógica de negócio deve existir aqui
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+
+class RoundTripCounter:
+    """
+    Contador preenchido por `count_round_trips`.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    @property
+    def value(self) -> Optional[int]:
+        return self.count
+
+
+class _NullCounter(RoundTripCounter):
+    """Sessão sem engine (ex: testes com dublês): contagem indisponível."""
+
+    @property
+    def value(self) -> Optional[int]:
+        return None
+
+
+@contextmanager
+def count_round_trips(session: Any) -> Iterator[RoundTripCounter]:
+    """
+    with count_round_trips(db) as rt:
+        ...
+    rt.value  # None se não foi possível instrumentar a sessão
+    """
+    try:
+        engine = session.get_bind()
+    except Exception:
+        engine = None
+
+    if not isinstance(engine, (Engine, Connection)):
+        yield _NullCounter()
+        return
+
+    counter = RoundTripCounter()
+    thread_id = threading.get_ident()
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread_id:
+            counter.count += 1
+
+    def _on_transaction_end(conn):
+        if threading.get_ident() == thread_id:
+            counter.count += 1
+
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    event.listen(engine, "commit", _on_transaction_end)
+    event.listen(engine, "rollback", _on_transaction_end)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+        event.remove(engine, "commit", _on_transaction_end)
+        event.remove(engine, "rollback", _on_transaction_end)
@@ -0,0 +1,141 @@
+"""
+json_stream.py
+
+Serialização JSON incremental + compressão HTTP (gzip/brotli) para payloads
+grandes (ex: FeatureCollection da superfície de risco).
+
+Dependências opcionais:
+- orjson  => encoder rápido (fallback: json da stdlib, saída compacta)
+- brotli  => Content-Encoding "br" (fallback: gzip da stdlib)
+
+Regras arquiteturais do projeto:
+- Módulo puro: NÃO acessa banco, NÃO conhece FastAPI
+- Nenhuma lógica de negócio deve existir aqui
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+
+# Quantidade de features serializadas por chunk do stream.
+FEATURES_PER_CHUNK: int = 500
+
+
+# =====================================================
+# ENCODER
+# =====================================================
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def iter_envelope_with_feature_collection(
+    envelope: Dict[str, Any],
+    key: str,
+    feature_collection: Dict[str, Any],
+    features_per_chunk: int = FEATURES_PER_CHUNK,
+) -> Iterator[bytes]:
+    """
+    Serializa `envelope` com `envelope[key] = feature_collection` em pedaços,
+    sem montar o JSON inteiro em memória: as features saem em lotes.
+
+    `feature_collection["features"]` pode ser um iterável preguiçoso
+    (ex: SurfaceRaster.iter_features), consumido lote a lote.
+    """
+    head = dumps({k: v for k, v in envelope.items() if k != key})
+    fc_meta = {k: v for k, v in feature_collection.items() if k != "features"}
+    features = iter(feature_collection.get("features") or ())
+
+    # '{...envelope' + ',"<key>":{...meta' + ',"features":['
+    prefix = head[:-1]
+    if len(head) > 2:
+        prefix += b","
+    prefix += dumps(key) + b":" + dumps(fc_meta)[:-1]
+    if fc_meta:
+        prefix += b","
+    prefix += b'"features":['
+    yield prefix
+
+    step = max(1, int(features_per_chunk))
+    first = True
+    while True:
+        batch = list(islice(features, step))
+        if not batch:
+            break
+        chunk = b",".join(dumps(f) for f in batch)
+        yield chunk if first else (b"," + chunk)
+        first = False
+
+    yield b"]}}"
+
+
+# =====================================================
+# CONTENT-ENCODING
+# =====================================================
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Escolhe "br" | "gzip" | "identity" a partir do header Accept-Encoding.
+    """
+    accepted: List[str] = []
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.append(token)
+
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def iter_compressed(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """
+    Comprime o stream de chunks de forma incremental.
+    """
+    if encoding == "identity":
+        yield from chunks
+        return
+
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli não está instalado.")
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            out = compressor.process(chunk)
+            if out:
+                yield out
+        yield compressor.finish()
+        return
+
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 => container gzip
+        for chunk in chunks:
+            out = compressor.compress(chunk)
+            if out:
+                yield out
+        yield compressor.flush()
+        return
+
+    raise ValueError(f"Content-Encoding não suportado: {encoding}")
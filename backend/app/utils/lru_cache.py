@@ -0,0 +1,70 @@
+"""
+lru_cache.py
+
+Cache em memória (LRU) thread-safe para artefatos caros e reaproveitáveis
+entre requisições/ciclos do backend.
+
+Regras arquiteturais do projeto:
+- Cache é local ao processo (cada worker mantém o seu)
+- Chaves devem conter tudo que invalida o valor (ex: updated_at, hash de entrada, config)
+- Nenhuma lógica de negócio deve existir aqui
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Cache LRU simples com limite por quantidade de entradas.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(0, int(maxsize))
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: K, factory: Callable[[], V]) -> V:
+        """
+        Retorna o valor em cache ou calcula via `factory` e armazena.
+        O cálculo ocorre fora do lock (chamadas concorrentes podem calcular em paralelo).
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        value = factory()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,78 @@
+"""
+single_flight.py
+
+Deduplicação de chamadas concorrentes ("single flight"): enquanto uma chamada
+para uma chave está em andamento, as demais chamadas com a mesma chave esperam
+por ela e recebem o mesmo resultado (ou a mesma exceção), em vez de repetir
+o trabalho.
+
+Regras arquiteturais do projeto:
+- Escopo local ao processo (cada worker mantém o seu)
+- NÃO é cache: terminada a chamada, a chave é liberada
+- Esperas bloqueiam a thread: usar a partir de código síncrono (threadpool)
+- Nenhuma lógica de negócio deve existir aqui
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _Call(Generic[V]):
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Optional[V] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Registro de chamadas em andamento por chave.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[K, _Call[V]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: K, fn: Callable[[], V]) -> Tuple[V, bool]:
+        """
+        Executa `fn` uma única vez por chave entre chamadas concorrentes.
+
+        Retorna (valor, leader): leader=True para quem executou `fn`;
+        False para quem apenas esperou. Exceção de `fn` é propagada a todos.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, False
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.value, True
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,247 @@
+"""
+spatial_index.py
+
+Índices espaciais (KD-tree e hash espacial em grid) para consultas de
+vizinhos mais próximos (kNN) e por raio.
+
+Regras arquiteturais do projeto:
+- Módulo puro: NÃO acessa banco, NÃO conhece modelos ORM
+- Coordenadas geográficas (lat/lon) devem ser convertidas antes da indexação
+  (ex: `unit_sphere_xyz`, onde a ordem por distância euclidiana (corda)
+  é a mesma da distância haversine)
+- Nenhuma lógica de negócio deve existir aqui
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# =====================================================
+# CONVERSÕES
+# =====================================================
+
+def unit_sphere_xyz(lat_deg: np.ndarray, lon_deg: np.ndarray) -> np.ndarray:
+    """
+    Converte lat/lon (graus) para coordenadas cartesianas na esfera unitária (n, 3).
+
+    A distância euclidiana entre dois pontos (corda) é monotônica em relação à
+    distância de grande círculo, então o kNN por corda é o mesmo kNN por haversine:
+        arco = 2 * asin(corda / 2)
+    """
+    lat = np.radians(np.asarray(lat_deg, dtype=float))
+    lon = np.radians(np.asarray(lon_deg, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+# =====================================================
+# KD-TREE
+# =====================================================
+
+@dataclass
+class _Node:
+    start: int
+    end: int
+    lo: np.ndarray
+    hi: np.ndarray
+    left: Optional[int] = None
+    right: Optional[int] = None
+
+
+class KDTree:
+    """
+    KD-tree estático sobre pontos em R^d.
+
+    - Construção O(n log n) por divisão na mediana da dimensão de maior extensão
+    - Folhas avaliadas em lote com NumPy
+    - Poda por distância mínima até a caixa envolvente de cada nó
+    """
+
+    def __init__(self, coords: np.ndarray, leaf_size: int = 16) -> None:
+        data = np.asarray(coords, dtype=float)
+        if data.ndim != 2:
+            raise ValueError("coords deve ter formato (n, d).")
+
+        self.data = data
+        self.leaf_size = max(1, int(leaf_size))
+        self._order = np.arange(data.shape[0])
+        self._nodes: List[_Node] = []
+
+        if data.shape[0] > 0:
+            self._build()
+
+    def __len__(self) -> int:
+        return int(self.data.shape[0])
+
+    # -------------------------------------------------
+    # CONSTRUÇÃO
+    # -------------------------------------------------
+
+    def _build(self) -> None:
+        root = self._new_node(0, self.data.shape[0])
+        stack = [root]
+
+        while stack:
+            node_id = stack.pop()
+            node = self._nodes[node_id]
+            size = node.end - node.start
+            if size <= self.leaf_size:
+                continue
+
+            dim = int(np.argmax(node.hi - node.lo))
+            idx = self._order[node.start:node.end]
+            mid = size // 2
+            part = np.argpartition(self.data[idx, dim], mid)
+            self._order[node.start:node.end] = idx[part]
+
+            split = node.start + mid
+            node.left = self._new_node(node.start, split)
+            node.right = self._new_node(split, node.end)
+            stack.append(node.left)
+            stack.append(node.right)
+
+    def _new_node(self, start: int, end: int) -> int:
+        pts = self.data[self._order[start:end]]
+        self._nodes.append(_Node(start=start, end=end, lo=pts.min(axis=0), hi=pts.max(axis=0)))
+        return len(self._nodes) - 1
+
+    # -------------------------------------------------
+    # CONSULTAS
+    # -------------------------------------------------
+
+    def query(
+        self,
+        x: np.ndarray,
+        k: int,
+        exclude_index: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna (distâncias, índices) dos k vizinhos mais próximos de `x`,
+        ordenados por distância crescente.
+
+        exclude_index: índice (no array original) a ignorar, ex: o próprio ponto.
+        """
+        k = int(k)
+        if k <= 0 or not self._nodes:
+            return np.zeros(0, dtype=float), np.zeros(0, dtype=int)
+
+        q = np.asarray(x, dtype=float)
+        best: List[Tuple[float, int]] = []  # max-heap via distância negativa (d², idx)
+        frontier: List[Tuple[float, int]] = [(0.0, 0)]
+
+        while frontier:
+            bound, node_id = heapq.heappop(frontier)
+            if len(best) == k and bound > -best[0][0]:
+                break
+
+            node = self._nodes[node_id]
+            if node.left is None or node.right is None:
+                idx = self._order[node.start:node.end]
+                d2 = ((self.data[idx] - q) ** 2).sum(axis=1)
+                for dist2, i in zip(d2.tolist(), idx.tolist()):
+                    if exclude_index is not None and i == exclude_index:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist2, i))
+                    elif dist2 < -best[0][0]:
+                        heapq.heapreplace(best, (-dist2, i))
+                continue
+
+            for child_id in (node.left, node.right):
+                child = self._nodes[child_id]
+                gap = np.maximum(0.0, np.maximum(child.lo - q, q - child.hi))
+                child_bound = float((gap * gap).sum())
+                if len(best) < k or child_bound <= -best[0][0]:
+                    heapq.heappush(frontier, (child_bound, child_id))
+
+        ordered = sorted((-neg_d2, i) for neg_d2, i in best)
+        dists = np.sqrt(np.array([d2 for d2, _ in ordered], dtype=float))
+        indices = np.array([i for _, i in ordered], dtype=int)
+        return dists, indices
+
+    def query_radius(self, x: np.ndarray, radius: float) -> np.ndarray:
+        """
+        Retorna os índices de todos os pontos a distância <= radius de `x`.
+        """
+        if not self._nodes:
+            return np.zeros(0, dtype=int)
+
+        q = np.asarray(x, dtype=float)
+        r2 = float(radius) * float(radius)
+        out: List[np.ndarray] = []
+        stack = [0]
+
+        while stack:
+            node = self._nodes[stack.pop()]
+            gap = np.maximum(0.0, np.maximum(node.lo - q, q - node.hi))
+            if float((gap * gap).sum()) > r2:
+                continue
+
+            if node.left is None or node.right is None:
+                idx = self._order[node.start:node.end]
+                d2 = ((self.data[idx] - q) ** 2).sum(axis=1)
+                out.append(idx[d2 <= r2])
+                continue
+
+            stack.append(node.left)
+            stack.append(node.right)
+
+        if not out:
+            return np.zeros(0, dtype=int)
+        return np.sort(np.concatenate(out))
+
+
+# =====================================================
+# HASH ESPACIAL (GRID UNIFORME)
+# =====================================================
+
+class GridHash:
+    """
+    Hash espacial uniforme em 2D: agrupa pontos em baldes retangulares
+    de lado (cell_x, cell_y).
+
+    Com baldes de lado >= raio de busca, todos os vizinhos a até `raio`
+    de qualquer posição estão no bloco 3x3 de baldes ao redor dela.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, cell_x: float, cell_y: float) -> None:
+        if cell_x <= 0 or cell_y <= 0:
+            raise ValueError("cell_x e cell_y devem ser positivos.")
+
+        self.cell_x = float(cell_x)
+        self.cell_y = float(cell_y)
+
+        ix, iy = self.keys_for(x, y)
+        self._buckets: Dict[Tuple[int, int], np.ndarray] = {}
+
+        if ix.size:
+            order = np.lexsort((iy, ix))
+            keys = np.column_stack((ix[order], iy[order]))
+            uniq, starts = np.unique(keys, axis=0, return_index=True)
+            bounds = list(starts.tolist()) + [order.size]
+            for b, (kx, ky) in enumerate(uniq.tolist()):
+                self._buckets[(int(kx), int(ky))] = order[bounds[b]:bounds[b + 1]]
+
+    def keys_for(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ix = np.floor(np.asarray(x, dtype=float) / self.cell_x).astype(np.int64)
+        iy = np.floor(np.asarray(y, dtype=float) / self.cell_y).astype(np.int64)
+        return ix, iy
+
+    def neighbors(self, ix: int, iy: int, ring: int = 1) -> np.ndarray:
+        """
+        Índices dos pontos nos (2*ring+1)² baldes centrados em (ix, iy).
+        """
+        parts = [
+            self._buckets[(ix + dx, iy + dy)]
+            for dx in range(-ring, ring + 1)
+            for dy in range(-ring, ring + 1)
+            if (ix + dx, iy + dy) in self._buckets
+        ]
+        if not parts:
+            return np.zeros(0, dtype=int)
+        return np.sort(np.concatenate(parts))
@@ -0,0 +1,154 @@
+"""
+test_climate_service_batch.py
+
+Buscas em lote do ClimateService (várias localizações por requisição):
+- get_daily_series_batch x get_daily_series por localização
+- get_intraday_snapshot_batch x get_intraday_snapshot por localização
+- resposta de uma localização (objeto) x várias (lista)
+- ordem das localizações preservada entre blocos de CLIMATE_BATCH_SIZE
+
+Este teste:
+- NÃO usa banco (sem cache persistente)
+- NÃO chama a Open-Meteo real (requests.Session falsa)
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from backend.app.services.climate_service import ClimateService, ClimateServiceError
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+BATCH_SIZE = 3
+N_LOCATIONS = 8  # 3 blocos: 3 + 3 + 2
+START_DATE = date(2025, 12, 1)
+END_DATE = date(2026, 2, 28)
+REFERENCE_TS = datetime(2026, 2, 27, 14, 20, tzinfo=timezone.utc)
+
+
+class _Response:
+    def __init__(self, body):
+        self.status_code = 200
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        return None
+
+
+def _value(lat: float, lon: float, t: datetime, scale: float) -> float:
+    """Valor determinístico por localização e instante."""
+    return round((abs(lat) * 7.0 + abs(lon) * 3.0 + t.timestamp() / 3600.0) % 11.0 * scale, 3)
+
+
+class _OpenMeteo:
+    """
+    Open-Meteo falsa: daily/hourly nas datas pedidas, um objeto por
+    localização (objeto único se houver uma). Registra os parâmetros das chamadas.
+    """
+
+    def __init__(self, drop_last: bool = False) -> None:
+        self.calls = []
+        self.drop_last = drop_last
+
+    def get(self, url, params, timeout):
+        self.calls.append(dict(params))
+        lats = [float(v) for v in str(params["latitude"]).split(",")]
+        lons = [float(v) for v in str(params["longitude"]).split(",")]
+        start = date.fromisoformat(params["start_date"])
+        end = date.fromisoformat(params["end_date"])
+
+        payloads = []
+        for lat, lon in zip(lats, lons):
+            payload = {"latitude": lat, "longitude": lon, "elevation": 750.0}
+            if "daily" in params:
+                days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+                moments = [datetime(d.year, d.month, d.day, tzinfo=timezone.utc) for d in days]
+                payload["daily"] = {
+                    "time": [d.isoformat() for d in days],
+                    "precipitation_sum": [_value(lat, lon, t, 1.0) for t in moments],
+                    "temperature_2m_mean": [20.0 + _value(lat, lon, t, 0.5) for t in moments],
+                    "apparent_temperature_mean": [21.0 + _value(lat, lon, t, 0.5) for t in moments],
+                }
+            if "hourly" in params:
+                first = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+                hours = [first + timedelta(hours=h) for h in range(((end - start).days + 1) * 24)]
+                payload["hourly"] = {
+                    "time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours],
+                    "precipitation": [_value(lat, lon, h, 0.1) for h in hours],
+                    "temperature_2m": [18.0 + _value(lat, lon, h, 1.0) for h in hours],
+                    "apparent_temperature": [19.0 + _value(lat, lon, h, 1.0) for h in hours],
+                }
+            payloads.append(payload)
+
+        if self.drop_last:
+            payloads = payloads[:-1]
+        return _Response(payloads[0] if len(payloads) == 1 else payloads)
+
+
+def _service(provider: _OpenMeteo) -> ClimateService:
+    service = ClimateService(store=None)
+    service._session = provider
+    service.batch_size = BATCH_SIZE
+    return service
+
+
+def _locations(n: int = N_LOCATIONS):
+    return [(-16.60 - i * 0.031, -49.20 - i * 0.017) for i in range(n)]
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_daily_series_batch_matches_single_location_calls():
+    provider = _OpenMeteo()
+    service = _service(provider)
+    locations = _locations()
+
+    batch = service.get_daily_series_batch(locations, START_DATE, END_DATE)
+
+    # uma requisição por bloco de BATCH_SIZE localizações
+    assert len(provider.calls) == -(-N_LOCATIONS // BATCH_SIZE)
+    assert provider.calls[0]["latitude"].count(",") == BATCH_SIZE - 1
+
+    single = [service.get_daily_series(lat, lon, START_DATE, END_DATE) for lat, lon in locations]
+    assert batch == single
+
+
+def test_intraday_snapshot_batch_matches_single_location_calls():
+    provider = _OpenMeteo()
+    service = _service(provider)
+    locations = _locations()
+
+    batch = service.get_intraday_snapshot_batch(locations, REFERENCE_TS, window_hours=3)
+    single = [service.get_intraday_snapshot(lat, lon, REFERENCE_TS, window_hours=3) for lat, lon in locations]
+
+    assert batch == single
+    # localizações diferentes => resumos diferentes (ordem verificável)
+    assert len({tuple(s.values()) for s in batch}) == N_LOCATIONS
+
+
+def test_single_location_batch_accepts_object_response():
+    provider = _OpenMeteo()
+    service = _service(provider)
+    (lat, lon), = _locations(1)
+
+    daily = service.get_daily_series_batch([(lat, lon)], START_DATE, END_DATE)
+    intraday = service.get_intraday_snapshot_batch([(lat, lon)], REFERENCE_TS)
+
+    assert daily == [service.get_daily_series(lat, lon, START_DATE, END_DATE)]
+    assert intraday == [service.get_intraday_snapshot(lat, lon, REFERENCE_TS)]
+
+
+def test_batch_rejects_response_with_missing_locations():
+    service = _service(_OpenMeteo(drop_last=True))
+
+    with pytest.raises(ClimateServiceError):
+        service.get_daily_series_batch(_locations(), START_DATE, END_DATE)
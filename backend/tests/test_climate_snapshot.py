@@ -0,0 +1,223 @@
+"""
+test_climate_snapshot.py
+
+Requisição combinada diária + horária do ClimateService
+(get_climate_snapshot / get_climate_snapshot_batch):
+- mesmo resultado que get_daily_series + get_intraday_snapshot separados
+- janela diária que atravessa a fronteira archive/forecast (referência hoje)
+- parte horária limitada às 48h do resumo (start_hour/end_hour no forecast;
+  archive com lacuna diária longa => requisições diária e horária separadas)
+- ordem das localizações preservada no lote
+
+Este teste:
+- NÃO usa banco (sem cache persistente)
+- NÃO chama a Open-Meteo real (requests.Session falsa)
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from backend.app.services.climate_service import ClimateService
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+BATCH_SIZE = 3
+N_LOCATIONS = 7
+HISTORY_DAYS = 90
+WINDOW_HOURS = 3
+
+
+class _Response:
+    def __init__(self, body):
+        self.status_code = 200
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        return None
+
+
+def _value(lat: float, lon: float, t: datetime, scale: float) -> float:
+    """Valor determinístico por localização e instante (igual nos dois endpoints)."""
+    return round((abs(lat) * 7.0 + abs(lon) * 3.0 + t.timestamp() / 3600.0) % 11.0 * scale, 3)
+
+
+class _OpenMeteo:
+    """
+    Open-Meteo falsa. Daily em start_date..end_date; hourly em
+    start_hour..end_hour quando informados (forecast), senão nos dias de
+    start_date..end_date. Registra (url, parâmetros, horas devolvidas).
+    """
+
+    def __init__(self, with_hourly: bool = True) -> None:
+        self.calls = []
+        self.with_hourly = with_hourly
+
+    def get(self, url, params, timeout):
+        lats = [float(v) for v in str(params["latitude"]).split(",")]
+        lons = [float(v) for v in str(params["longitude"]).split(",")]
+        start = date.fromisoformat(params["start_date"])
+        end = date.fromisoformat(params["end_date"])
+
+        if "start_hour" in params:
+            first = datetime.fromisoformat(params["start_hour"]).replace(tzinfo=timezone.utc)
+            last = datetime.fromisoformat(params["end_hour"]).replace(tzinfo=timezone.utc)
+        else:
+            first = datetime.combine(start, time(0), timezone.utc)
+            last = datetime.combine(end, time(23), timezone.utc)
+        hours = [first + timedelta(hours=h) for h in range(int((last - first).total_seconds() // 3600) + 1)]
+
+        self.calls.append((url, dict(params), len(hours) if "hourly" in params else 0))
+
+        payloads = []
+        for lat, lon in zip(lats, lons):
+            payload = {"latitude": lat, "longitude": lon, "elevation": 750.0}
+            if "daily" in params:
+                days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+                moments = [datetime.combine(d, time(0), timezone.utc) for d in days]
+                payload["daily"] = {
+                    "time": [d.isoformat() for d in days],
+                    "precipitation_sum": [_value(lat, lon, t, 1.0) for t in moments],
+                    "temperature_2m_mean": [20.0 + _value(lat, lon, t, 0.5) for t in moments],
+                    "apparent_temperature_mean": [21.0 + _value(lat, lon, t, 0.5) for t in moments],
+                }
+            if "hourly" in params and self.with_hourly:
+                payload["hourly"] = {
+                    "time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours],
+                    "precipitation": [_value(lat, lon, h, 0.1) for h in hours],
+                    "temperature_2m": [18.0 + _value(lat, lon, h, 1.0) for h in hours],
+                    "apparent_temperature": [19.0 + _value(lat, lon, h, 1.0) for h in hours],
+                }
+            payloads.append(payload)
+
+        return _Response(payloads[0] if len(payloads) == 1 else payloads)
+
+
+def _service(provider: _OpenMeteo) -> ClimateService:
+    service = ClimateService(store=None)
+    service._session = provider
+    service.batch_size = BATCH_SIZE
+    return service
+
+
+def _locations(n: int = N_LOCATIONS):
+    return [(-16.60 - i * 0.031, -49.20 - i * 0.017) for i in range(n)]
+
+
+def _separate(service, lat, lon, start_date, end_date, reference_ts):
+    return (
+        service.get_daily_series(lat, lon, start_date, end_date),
+        service.get_intraday_snapshot(lat, lon, reference_ts, WINDOW_HOURS),
+    )
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_forecast_snapshot_crossing_archive_boundary_is_one_limited_request():
+    provider = _OpenMeteo()
+    service = _service(provider)
+    (lat, lon), = _locations(1)
+
+    today = date.today()
+    reference_ts = datetime.combine(today, time(14, 20), timezone.utc)
+    start_date = today - timedelta(days=HISTORY_DAYS)
+
+    for end_date in (today, today - timedelta(days=1)):
+        provider.calls.clear()
+        snapshot = service.get_climate_snapshot(lat, lon, start_date, end_date, reference_ts, WINDOW_HOURS)
+
+        # uma única requisição ao forecast, com a janela diária inteira
+        (url, params, hourly_count), = provider.calls
+        assert url == service.base_forecast_url
+        assert params["start_date"] == start_date.isoformat()
+        assert params["end_date"] == today.isoformat()
+
+        # parte horária restrita a ontem 00:00 .. hoje 23:00
+        assert params["start_hour"] == f"{(today - timedelta(days=1)).isoformat()}T00:00"
+        assert params["end_hour"] == f"{today.isoformat()}T23:00"
+        assert hourly_count == 48
+
+        series, intraday = snapshot
+        assert [item["date"] for item in series] == [
+            start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
+        ]
+        assert snapshot == _separate(service, lat, lon, start_date, end_date, reference_ts)
+
+
+def test_archive_snapshot_with_long_window_splits_daily_and_hourly():
+    provider = _OpenMeteo()
+    service = _service(provider)
+    (lat, lon), = _locations(1)
+
+    reference_ts = datetime.combine(date.today() - timedelta(days=10), time(9), timezone.utc)
+    end_date = reference_ts.date()
+    start_date = end_date - timedelta(days=HISTORY_DAYS)
+
+    snapshot = service.get_climate_snapshot(lat, lon, start_date, end_date, reference_ts, WINDOW_HOURS)
+
+    # diária (90 dias) e horária (48h) separadas, ambas no archive
+    daily_call, hourly_call = provider.calls
+    assert daily_call[0] == hourly_call[0] == service.base_archive_url
+    assert "hourly" not in daily_call[1]
+    assert "daily" not in hourly_call[1]
+    assert hourly_call[2] == 48
+
+    assert snapshot == _separate(service, lat, lon, start_date, end_date, reference_ts)
+
+
+def test_archive_snapshot_with_short_window_is_one_request():
+    provider = _OpenMeteo()
+    service = _service(provider)
+    (lat, lon), = _locations(1)
+
+    reference_ts = datetime.combine(date.today() - timedelta(days=10), time(9), timezone.utc)
+    end_date = reference_ts.date()
+    start_date = end_date - timedelta(days=1)
+
+    snapshot = service.get_climate_snapshot(lat, lon, start_date, end_date, reference_ts, WINDOW_HOURS)
+
+    (url, params, hourly_count), = provider.calls
+    assert url == service.base_archive_url
+    assert "daily" in params and "start_hour" not in params
+    assert hourly_count == 48
+
+    assert snapshot == _separate(service, lat, lon, start_date, end_date, reference_ts)
+
+
+def test_snapshot_batch_preserves_location_order():
+    provider = _OpenMeteo()
+    service = _service(provider)
+    locations = _locations()
+
+    today = date.today()
+    reference_ts = datetime.combine(today, time(14, 20), timezone.utc)
+    start_date = today - timedelta(days=HISTORY_DAYS)
+
+    batch = service.get_climate_snapshot_batch(locations, start_date, today, reference_ts, WINDOW_HOURS)
+
+    assert len(provider.calls) == -(-N_LOCATIONS // BATCH_SIZE)
+    assert batch == [
+        service.get_climate_snapshot(lat, lon, start_date, today, reference_ts, WINDOW_HOURS)
+        for lat, lon in locations
+    ]
+    assert len({tuple(intraday.values()) for _, intraday in batch}) == N_LOCATIONS
+
+
+def test_snapshot_without_hourly_keeps_daily_series():
+    service = _service(_OpenMeteo(with_hourly=False))
+    (lat, lon), = _locations(1)
+
+    today = date.today()
+    reference_ts = datetime.combine(today, time(14, 20), timezone.utc)
+    start_date = today - timedelta(days=HISTORY_DAYS)
+
+    series, intraday = service.get_climate_snapshot(lat, lon, start_date, today, reference_ts, WINDOW_HOURS)
+
+    assert intraday is None
+    assert series == service.get_daily_series(lat, lon, start_date, today)
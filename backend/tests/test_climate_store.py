@@ -0,0 +1,180 @@
+"""
+test_climate_store.py
+
+Cache persistente da série diária (ClimateDailyStore + ClimateService):
+- dias com variáveis nulas na resposta não são gravados (nem como 0.0)
+- dias no atraso do provedor (horizonte da resposta) não são gravados
+- leitura em lote (load_many) igual à leitura por localização
+- falhas de banco são registradas no log e viram "cache vazio"
+
+Este teste:
+- Usa SQLite em arquivo temporário (sem Postgres)
+- NÃO chama a Open-Meteo real (sessão HTTP falsa)
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import backend.app.models  # noqa: F401  (registra as tabelas no Base)
+from backend.app.database import Base
+from backend.app.models.climate_daily import ClimateDaily
+from backend.app.services.climate_service import ClimateService
+from backend.app.services.climate_store import ClimateDailyStore
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+FINAL_LAG_DAYS = 5
+HISTORY_DAYS = 30
+LAT, LON = -16.6869, -49.2648
+
+
+class _Response:
+    def __init__(self, body):
+        self.status_code = 200
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        return None
+
+
+class _DailyProvider:
+    """
+    Open-Meteo falsa (uma localização): valores por dia; `null_days` vêm nulos
+    e os últimos `provider_delay_days` da resposta também (atraso do archive).
+    """
+
+    def __init__(self, null_days=(), provider_delay_days=0):
+        self.null_days = set(null_days)
+        self.provider_delay_days = provider_delay_days
+
+    def get(self, url, params, timeout):
+        start = date.fromisoformat(params["start_date"])
+        end = date.fromisoformat(params["end_date"])
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        last_available = end - timedelta(days=self.provider_delay_days)
+
+        def value(d, v):
+            return None if d in self.null_days or d > last_available else v
+
+        return _Response(
+            {
+                "latitude": LAT,
+                "longitude": LON,
+                "elevation": 749.0,
+                "daily": {
+                    "time": [d.isoformat() for d in days],
+                    "precipitation_sum": [value(d, float(d.day % 4)) for d in days],
+                    "temperature_2m_mean": [value(d, 24.0) for d in days],
+                    "apparent_temperature_mean": [value(d, 25.0) for d in days],
+                },
+            }
+        )
+
+
+def _store(tmp_path) -> ClimateDailyStore:
+    engine = create_engine(f"sqlite:///{tmp_path / 'climate.db'}")
+    Base.metadata.create_all(engine)
+    return ClimateDailyStore(session_factory=sessionmaker(bind=engine), final_lag_days=FINAL_LAG_DAYS)
+
+
+def _stored_days(store: ClimateDailyStore):
+    with store._session_factory() as session:
+        return {row.day: row for row in session.query(ClimateDaily).all()}
+
+
+def _window():
+    today = datetime.now(timezone.utc).date()
+    return today - timedelta(days=HISTORY_DAYS), today - timedelta(days=1)
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_null_days_are_not_stored(tmp_path):
+    store = _store(tmp_path)
+    start, end = _window()
+    null_day = start + timedelta(days=3)
+
+    service = ClimateService(store=store)
+    service._session = _DailyProvider(null_days=[null_day])
+    series = service.get_daily_series(LAT, LON, start, end)
+
+    stored = _stored_days(store)
+    cutoff = min(store.final_before(), end - timedelta(days=FINAL_LAG_DAYS))
+
+    # a série devolvida mantém o contrato (nulo => 0.0), mas o dia não é gravado
+    assert next(item for item in series if item["date"] == null_day)["precipitacao_total_mm"] == 0.0
+    assert null_day not in stored
+    assert set(stored) == {d for d in (item["date"] for item in series) if d < cutoff and d != null_day}
+
+    # próxima leitura: o dia nulo volta ao provedor
+    assert service._first_missing_day(store.load(LAT, LON, start, end), start, end) == null_day
+
+
+def test_days_within_provider_delay_are_not_stored(tmp_path):
+    store = _store(tmp_path)
+    start, end = _window()
+    delay = 4  # archive: últimos dias ainda nulos
+
+    service = ClimateService(store=store)
+    service._session = _DailyProvider(provider_delay_days=delay)
+    service.get_daily_series(LAT, LON, start, end)
+
+    last_complete = end - timedelta(days=delay)
+    horizon = last_complete - timedelta(days=FINAL_LAG_DAYS)
+
+    assert max(_stored_days(store)) == horizon - timedelta(days=1)
+    assert horizon < store.final_before()
+
+
+def test_load_many_matches_load(tmp_path):
+    store = _store(tmp_path)
+    start, end = _window()
+    locations = [(LAT, LON), (LAT + 0.01, LON), (LAT, LON + 0.01)]
+
+    service = ClimateService(store=store)
+    service._session = _DailyProvider()
+    for lat, lon in locations[:2]:
+        service.get_daily_series(lat, lon, start, end)
+
+    many = store.load_many(locations + [locations[0]], start, end)
+
+    assert len(many) == len(locations) + 1
+    assert many[0] and many[1] and not many[2]
+    assert many[3] == many[0]
+    for (lat, lon), known in zip(locations, many):
+        assert known == store.load(lat, lon, start, end)
+
+
+def test_database_errors_are_logged(caplog):
+    def _broken_session():
+        raise RuntimeError("banco indisponível")
+
+    store = ClimateDailyStore(session_factory=_broken_session, final_lag_days=FINAL_LAG_DAYS)
+    start, end = _window()
+    series = [
+        {
+            "date": start,
+            "precipitacao_total_mm": 1.0,
+            "temperatura_media_2m_C": 24.0,
+            "temperatura_aparente_media_2m_C": 25.0,
+        }
+    ]
+
+    with caplog.at_level(logging.WARNING, logger="climagyn.backend.climate_store"):
+        assert store.save(LAT, LON, series, {start, end}) == 0
+        assert store.load_many([(LAT, LON)], start, end) == [{}]
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("gravar" in m for m in messages)
+    assert any("ler" in m for m in messages)
@@ -0,0 +1,65 @@
+"""
+test_feature_builder_batch.py
+
+Equivalência de FeatureBuilder.build_features_batch (matriz de pontos, somas
+acumuladas) com FeatureBuilder.build_features aplicado ponto a ponto.
+
+Este teste:
+- NÃO usa banco
+- NÃO chama clima nem IA
+- Compara valores bit a bit, na ordem FEATURE_ORDER
+"""
+
+from datetime import date
+
+import numpy as np
+
+from backend.app.services.feature_builder import FEATURE_ORDER, TODAY_COLUMNS, FeatureBuilder
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+N_POINTS = 40
+TARGET_DATE = date(2026, 2, 17)
+
+# Históricos mais curtos e mais longos que as janelas (médias móveis / lags)
+HISTORY_LENGTHS = (0, 1, 6, 29, 30, 90, 120)
+
+
+def _random_inputs(history_len: int, seed: int):
+    rng = np.random.default_rng(seed)
+    today = rng.gamma(0.5, 8.0, (N_POINTS, len(TODAY_COLUMNS)))
+    today[:4, 0] = 0.0  # dias secos
+    precip = rng.gamma(0.3, 10.0, (N_POINTS, history_len))
+    precip[:3] = 0.0  # históricos sem chuva
+    temp = rng.normal(24.0, 3.0, (N_POINTS, history_len))
+    return today, precip, temp
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_build_features_batch_matches_scalar():
+    builder = FeatureBuilder()
+
+    for seed, history_len in enumerate(HISTORY_LENGTHS):
+        today, precip, temp = _random_inputs(history_len, seed)
+
+        batch = builder.build_features_batch(today, precip, temp, TARGET_DATE)
+        assert batch.shape == (N_POINTS, len(FEATURE_ORDER))
+
+        for i in range(N_POINTS):
+            scalar = builder.build_features(
+                dict(zip(TODAY_COLUMNS, today[i].tolist())),
+                {
+                    "precipitacao_total_mm": precip[i].tolist(),
+                    "temperatura_media_2m_C": temp[i].tolist(),
+                },
+                TARGET_DATE,
+            )
+            expected = [float(scalar[name]) for name in FEATURE_ORDER]
+
+            assert batch[i].tolist() == expected, (history_len, i)
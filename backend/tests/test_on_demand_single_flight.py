@@ -0,0 +1,140 @@
+"""
+test_on_demand_single_flight.py
+
+Deduplicação (single flight) do cálculo sob demanda de um ponto:
+requisições concorrentes para o mesmo (ponto, ciclo) executam o pipeline
+uma única vez e cada uma recebe o snapshot na PRÓPRIA sessão.
+
+Este teste:
+- Usa SQLite em arquivo temporário (engine própria)
+- NÃO chama clima nem IA reais (dublês mínimos)
+- NÃO depende de FastAPI
+"""
+
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, object_session, sessionmaker
+
+import backend.app.models  # noqa: F401  (registra todas as tabelas no Base)
+from backend.app.database import Base
+from backend.app.models.point import Point
+from backend.app.repositories.risk_repository import RiskRepository
+from backend.app.services import risk_orchestrator
+from backend.app.services.risk_orchestrator import RiskOrchestrator
+from backend.app.utils.single_flight import SingleFlight
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+POINT_ID = "SF-001"
+TIMEOUT_SECONDS = 10
+
+
+class _RecordingFlight(SingleFlight):
+    """SingleFlight que sinaliza quando a segunda chamada (seguidora) entra."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+        self.follower_entered = threading.Event()
+
+    def do(self, key, fn):
+        self.calls += 1
+        if self.calls >= 2:
+            self.follower_entered.set()
+        return super().do(key, fn)
+
+
+class _BlockingClimate:
+    """Segura o líder até a seguidora estar esperando o mesmo voo."""
+
+    def __init__(self, flight: _RecordingFlight) -> None:
+        self.flight = flight
+        self.runs = 0
+
+    def get_daily_series(self, **kwargs):
+        self.runs += 1
+        assert self.flight.follower_entered.wait(TIMEOUT_SECONDS)
+        return []
+
+
+class _Response:
+    status_code = 200
+    text = ""
+
+    def json(self):
+        return {"icra": 0.42, "nivel_risco": "alto", "confianca": "Alta"}
+
+
+class _Http:
+    def post(self, url, json, timeout):
+        return _Response()
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_concurrent_on_demand_shares_one_computation(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'single_flight.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    SessionTest = sessionmaker(bind=engine, expire_on_commit=False, class_=Session)
+
+    with SessionTest() as db:
+        db.add(Point(id=POINT_ID, name="Ponto", latitude=-16.68, longitude=-49.25, active=True))
+        db.commit()
+
+    flight = _RecordingFlight()
+    monkeypatch.setattr(risk_orchestrator, "_ON_DEMAND_FLIGHTS", flight)
+    climate = _BlockingClimate(flight)
+    reference_ts = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    results = {}
+    errors = []
+
+    def _call(name: str) -> None:
+        try:
+            _compute(name)
+        except Exception as e:
+            errors.append((name, repr(e)))
+
+    def _compute(name: str) -> None:
+        with SessionTest() as db:
+            orchestrator = RiskOrchestrator(
+                RiskRepository(db),
+                climate_service=climate,
+                http_session=_Http(),
+            )
+            snapshot = orchestrator.get_or_compute_point_snapshot(db, POINT_ID, reference_ts=reference_ts)
+            results[name] = (snapshot, object_session(snapshot) is db, snapshot.icra)
+
+    leader = threading.Thread(target=_call, args=("leader",))
+    leader.start()
+    # a seguidora só entra depois do líder estar calculando
+    while climate.runs == 0 and leader.is_alive():
+        threading.Event().wait(0.01)
+    follower = threading.Thread(target=_call, args=("follower",))
+    follower.start()
+
+    leader.join(TIMEOUT_SECONDS)
+    follower.join(TIMEOUT_SECONDS)
+
+    assert errors == []
+    assert climate.runs == 1
+    assert set(results) == {"leader", "follower"}
+
+    leader_snapshot, leader_own_session, _ = results["leader"]
+    follower_snapshot, follower_own_session, follower_icra = results["follower"]
+
+    assert leader_own_session
+    assert follower_own_session
+    assert follower_snapshot is not leader_snapshot
+    assert follower_snapshot.id == leader_snapshot.id
+    assert follower_icra == 0.42
@@ -0,0 +1,315 @@
+"""
+test_risk_cycle.py
+
+Ciclo do scheduler (RiskOrchestrator.compute_all_points_for_cycle):
+- clima pré-buscado em lote e chamada em lote à IA indisponível ou com
+  falha (conexão, status, JSON, quantidade): a IA por ponto roda no pool do ciclo
+- agrupamento de pontos pelo nó da grade reportado pelo provedor climático
+
+Este teste:
+- NÃO usa banco (repositório em memória; lista de pontos injetada)
+- NÃO chama clima nem IA reais (dublês mínimos)
+- Verifica ordem dos resultados, isolamento de falhas, o campo `parallelism`
+  e que o agrupamento por nó não altera as features
+"""
+
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.services import climate_service
+from backend.app.services.climate_service import ClimateService
+from backend.app.services.risk_orchestrator import RiskOrchestrator
+from backend.app.utils.lru_cache import LRUCache
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+REFERENCE_TS = datetime(2026, 1, 10, 12, tzinfo=timezone.utc)
+N_POINTS = 8
+PARALLELISM = 3
+FAILING_POINT = "C003"
+ICRA_CALL_SECONDS = 0.05
+
+
+class _MemoryRepo:
+    def __init__(self) -> None:
+        self.saved = []
+
+    def get_point_ids_by_bucket(self, snapshot_timestamp):
+        return set()
+
+    def upsert_snapshots(self, snapshots, chunk_size=500):
+        self.saved.extend(snapshots)
+        return len(snapshots)
+
+    def save_snapshot(self, snapshot):
+        self.saved.append(snapshot)
+        return snapshot
+
+
+class _BatchClimate:
+    """Clima em lote: série diária constante por localização, sem intradiário."""
+
+    def __init__(self) -> None:
+        self.batch_calls = 0
+
+    def get_daily_series_batch(self, locations, start_date, end_date):
+        raise AssertionError("o ciclo deve usar get_climate_snapshot_batch")
+
+    def get_climate_snapshot_batch(self, locations, start_date, end_date, reference_ts, window_hours=3):
+        self.batch_calls += 1
+        days = (end_date - start_date).days + 1
+        series = [
+            {
+                "date": start_date + timedelta(days=i),
+                "precipitacao_total_mm": float(i % 7),
+                "temperatura_media_2m_C": 24.0,
+                "temperatura_aparente_media_2m_C": 25.0,
+            }
+            for i in range(days)
+        ]
+        return [(list(series), None) for _ in locations]
+
+
+class _Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.text = str(body)
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _IcraWithoutBatch:
+    """
+    IA sem o endpoint de lote (404). Por ponto: devolve um ICRA derivado do id,
+    falha para FAILING_POINT e registra a concorrência observada.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.batch_calls = 0
+        self.point_calls = 0
+
+    def post(self, url, json, timeout):
+        if "itens" in json:
+            with self.lock:
+                self.batch_calls += 1
+            return _Response(404, {"detail": "Not Found"})
+
+        with self.lock:
+            self.point_calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(ICRA_CALL_SECONDS)
+            if json["ponto"] == FAILING_POINT:
+                return _Response(500, {"detail": "erro interno"})
+            return _Response(
+                200,
+                {"icra": int(json["ponto"][1:]) / 100.0, "nivel_risco": "baixo", "confianca": "Alta"},
+            )
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class _IcraBatchFailing:
+    """
+    IA cuja chamada em lote falha do jeito `failure`; por ponto responde normalmente.
+    """
+
+    def __init__(self, failure: str) -> None:
+        self.failure = failure
+        self.point_calls = 0
+
+    def post(self, url, json, timeout):
+        if "itens" not in json:
+            self.point_calls += 1
+            return _Response(200, {"icra": 0.4, "nivel_risco": "moderado", "confianca": "Alta"})
+
+        if self.failure == "connection":
+            raise ConnectionError("conexão recusada")
+        if self.failure == "status":
+            return _Response(503, {"detail": "indisponível"})
+        if self.failure == "json":
+            return _Response(200, {"inesperado": []})
+        # "count": um resultado a menos que os itens
+        return _Response(200, {"total": 1, "resultados": [{"icra": 0.4}]})
+
+
+class _OpenMeteoByNode:
+    """
+    Open-Meteo falsa: cada coordenada cai no nó (lat, lon arredondadas a 0.1°,
+    elevação fixa) e os dados dependem só do nó. Registra as localizações pedidas.
+    """
+
+    def __init__(self) -> None:
+        self.locations = []
+
+    def get(self, url, params, timeout):
+        lats = [float(v) for v in str(params["latitude"]).split(",")]
+        lons = [float(v) for v in str(params["longitude"]).split(",")]
+        self.locations.extend(zip(lats, lons))
+
+        payloads = []
+        for lat, lon in zip(lats, lons):
+            node_lat, node_lon = round(lat, 1), round(lon, 1)
+            payload = {"latitude": node_lat, "longitude": node_lon, "elevation": 749.0}
+            if "daily" in params:
+                start = date.fromisoformat(params["start_date"])
+                end = date.fromisoformat(params["end_date"])
+                days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+                payload["daily"] = {
+                    "time": [d.isoformat() for d in days],
+                    "precipitation_sum": [abs(node_lat * node_lon) % 5 + d.toordinal() % 7 for d in days],
+                    "temperature_2m_mean": [20.0 + abs(node_lat) % 3] * len(days),
+                    "apparent_temperature_mean": [21.0] * len(days),
+                }
+            payloads.append(payload)
+
+        return _Response(200, payloads[0] if len(payloads) == 1 else payloads)
+
+
+class _IcraBatch:
+    def __init__(self) -> None:
+        self.features = {}
+
+    def post(self, url, json, timeout):
+        for item in json.get("itens", [json]):
+            self.features[item["ponto"]] = item["features"]
+        results = [
+            {"icra": 0.5, "nivel_risco": "moderado", "confianca": "Alta"}
+            for _ in json.get("itens", [json])
+        ]
+        return _Response(200, {"total": len(results), "resultados": results})
+
+
+def _points():
+    return [
+        SimpleNamespace(id=f"C{i:03d}", latitude=-16.6 - i * 0.01, longitude=-49.2 - i * 0.01)
+        for i in range(N_POINTS)
+    ]
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_cycle_runs_per_point_icra_fallback_in_pool():
+    repo = _MemoryRepo()
+    climate = _BatchClimate()
+    http = _IcraWithoutBatch()
+
+    orchestrator = RiskOrchestrator(repo, climate_service=climate, http_session=http)
+    points = _points()
+    orchestrator.list_points = lambda db, only_active=True: points
+
+    summary = orchestrator.compute_all_points_for_cycle(
+        None, reference_ts=REFERENCE_TS, parallelism=PARALLELISM
+    )
+
+    # clima em uma requisição; lote da IA tentado uma vez e ignorado
+    assert climate.batch_calls == 1
+    assert http.batch_calls == 1
+    assert http.point_calls == N_POINTS
+
+    # IA por ponto em paralelo, limitada ao pool
+    assert 1 < http.max_active <= PARALLELISM
+    assert summary["parallelism"] == PARALLELISM
+
+    # falha isolada no ponto problemático
+    assert summary["created"] == N_POINTS - 1
+    assert summary["failed_count"] == 1
+    assert summary["failed"][0]["point_id"] == FAILING_POINT
+
+    # ordem dos pontos preservada
+    expected = [p.id for p in points if p.id != FAILING_POINT]
+    assert [s.point_id for s in repo.saved] == expected
+    assert [s.icra for s in repo.saved] == [int(pid[1:]) / 100.0 for pid in expected]
+
+
+@pytest.mark.parametrize("failure", ["connection", "status", "json", "count"])
+def test_cycle_falls_back_to_per_point_icra_when_batch_fails(failure):
+    repo = _MemoryRepo()
+    http = _IcraBatchFailing(failure)
+    orchestrator = RiskOrchestrator(repo, climate_service=_BatchClimate(), http_session=http)
+    points = _points()
+    orchestrator.list_points = lambda db, only_active=True: points
+
+    summary = orchestrator.compute_all_points_for_cycle(
+        None, reference_ts=REFERENCE_TS, parallelism=PARALLELISM
+    )
+
+    assert http.point_calls == N_POINTS
+    assert summary["created"] == N_POINTS
+    assert summary["failed_count"] == 0
+    assert [s.point_id for s in repo.saved] == [p.id for p in points]
+
+
+def test_cycle_parallelism_is_bounded_by_pending_points():
+    orchestrator = RiskOrchestrator(
+        _MemoryRepo(), climate_service=_BatchClimate(), http_session=_IcraWithoutBatch()
+    )
+    points = _points()[:2]
+    orchestrator.list_points = lambda db, only_active=True: points
+
+    summary = orchestrator.compute_all_points_for_cycle(
+        None, reference_ts=REFERENCE_TS, parallelism=16
+    )
+
+    assert summary["parallelism"] == 2
+    assert summary["created"] == 2
+
+
+def test_cycle_coalesces_points_on_the_same_provider_node(monkeypatch):
+    monkeypatch.setattr(climate_service, "_PROVIDER_NODES", LRUCache(maxsize=100))
+
+    provider = _OpenMeteoByNode()
+    service = ClimateService(store=None)
+    service._session = provider
+
+    # P0 e P1 caem no mesmo nó (-16.6, -49.2); P2 em outro
+    points = [
+        SimpleNamespace(id="P0", latitude=-16.61, longitude=-49.21),
+        SimpleNamespace(id="P1", latitude=-16.62, longitude=-49.22),
+        SimpleNamespace(id="P2", latitude=-16.91, longitude=-49.51),
+    ]
+
+    def _cycle(reference_ts):
+        provider.locations.clear()
+        http = _IcraBatch()
+        orchestrator = RiskOrchestrator(_MemoryRepo(), climate_service=service, http_session=http)
+        orchestrator.coalesce_climate = True
+        orchestrator.list_points = lambda db, only_active=True: points
+        summary = orchestrator.compute_all_points_for_cycle(None, reference_ts=reference_ts, parallelism=2)
+        return summary, set(provider.locations), http.features
+
+    # 1º ciclo: nós desconhecidos => busca todos os pontos e aprende os nós
+    first, first_locations, _ = _cycle(REFERENCE_TS)
+    assert first["created"] == len(points)
+    assert first["climate_requests_coalesced"] == 0
+    assert first_locations == {(p.latitude, p.longitude) for p in points}
+
+    # 2º ciclo: um ponto por nó
+    second, second_locations, features = _cycle(REFERENCE_TS + timedelta(hours=1))
+    assert second["climate_requests_coalesced"] == 1
+    assert second["created"] == len(points)
+    assert second_locations == {(-16.61, -49.21), (-16.91, -49.51)}
+
+    # sem aproximação: P1 recebe exatamente o que receberia sozinho
+    assert features["P1"] == features["P0"]
+    assert features["P2"] != features["P0"]
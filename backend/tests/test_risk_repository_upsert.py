@@ -0,0 +1,136 @@
+"""
+test_risk_repository_upsert.py
+
+Persistência em massa dos snapshots do ciclo (RiskRepository):
+- upsert_snapshots insere linhas novas e, em conflito de
+  (point_id, snapshot_timestamp), atualiza as existentes
+- get_point_ids_by_bucket devolve exatamente os ids gravados no bucket
+
+Este teste:
+- Usa SQLite em arquivo temporário (ON CONFLICT nativo, sem Postgres)
+- NÃO chama clima nem IA
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import backend.app.models  # noqa: F401  (registra as tabelas no Base)
+from backend.app.database import Base
+from backend.app.models.point import Point
+from backend.app.models.risk_snapshot import RiskSnapshot
+from backend.app.repositories.risk_repository import RiskRepository
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+N_POINTS = 7
+CHUNK_SIZE = 2  # vários INSERTs por chamada
+BUCKET = datetime(2026, 1, 10, 12, tzinfo=timezone.utc)
+NEXT_BUCKET = BUCKET + timedelta(hours=3)
+
+
+def _session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'risk.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    db.add_all(
+        Point(id=f"P{i:03d}", name=f"Ponto {i}", latitude=-16.6 - i * 0.01, longitude=-49.2, active=True)
+        for i in range(N_POINTS)
+    )
+    db.commit()
+    return db
+
+
+def _snapshot(point_id: str, bucket: datetime, icra: float, source: str = "scheduled") -> RiskSnapshot:
+    return RiskSnapshot(
+        point_id=point_id,
+        snapshot_timestamp=bucket,
+        icra=icra,
+        icra_std=0.01,
+        nivel_risco="Baixo" if icra < 0.5 else "Alto",
+        confianca="Alta",
+        chuva_dia=icra * 10.0,
+        chuva_30d=icra * 5.0,
+        chuva_90d=icra * 2.0,
+        valid_until=bucket + timedelta(hours=3),
+        source=source,
+    )
+
+
+def _rows(db):
+    stmt = select(RiskSnapshot).order_by(RiskSnapshot.point_id, RiskSnapshot.snapshot_timestamp)
+    return {(s.point_id, s.snapshot_timestamp.replace(tzinfo=None)): s for s in db.execute(stmt).scalars()}
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_upsert_inserts_then_updates_on_conflict(tmp_path):
+    db = _session(tmp_path)
+    repo = RiskRepository(db)
+
+    first = [_snapshot(f"P{i:03d}", BUCKET, icra=0.1 * i) for i in range(5)]
+    assert repo.upsert_snapshots(first, chunk_size=CHUNK_SIZE) == 5
+
+    before = _rows(db)
+    assert len(before) == 5
+    ids_before = {key: s.id for key, s in before.items()}
+    computed_before = {key: s.computed_at for key, s in before.items()}
+    db.expire_all()
+
+    # P000..P002 já existem no bucket (atualiza); P005/P006 são novos
+    second = [_snapshot(f"P{i:03d}", BUCKET, icra=0.9, source="on_demand") for i in (0, 1, 2, 5, 6)]
+    assert repo.upsert_snapshots(second, chunk_size=CHUNK_SIZE) == 5
+
+    after = _rows(db)
+    assert db.execute(select(func.count()).select_from(RiskSnapshot)).scalar_one() == N_POINTS
+    for i in range(N_POINTS):
+        key = (f"P{i:03d}", BUCKET.replace(tzinfo=None))
+        row = after[key]
+        if i in (0, 1, 2, 5, 6):
+            assert row.icra == 0.9
+            assert row.nivel_risco == "Alto"
+            assert row.chuva_dia == 9.0
+            assert row.source == "on_demand"
+        else:
+            assert row.icra == 0.1 * i
+            assert row.source == "scheduled"
+
+    # conflito atualiza a linha existente (mesmo id, computed_at original)
+    for key, row_id in ids_before.items():
+        assert after[key].id == row_id
+        assert after[key].computed_at == computed_before[key]
+
+
+def test_upsert_keeps_last_duplicate_in_same_call(tmp_path):
+    db = _session(tmp_path)
+    repo = RiskRepository(db)
+
+    snapshots = [_snapshot("P000", BUCKET, icra=0.2), _snapshot("P000", BUCKET, icra=0.7)]
+    assert repo.upsert_snapshots(snapshots, chunk_size=CHUNK_SIZE) == 1
+
+    (row,) = _rows(db).values()
+    assert row.icra == 0.7
+
+
+def test_point_ids_by_bucket_are_exactly_the_saved_ids(tmp_path):
+    db = _session(tmp_path)
+    repo = RiskRepository(db)
+
+    in_bucket = {"P001", "P003", "P004"}
+    in_next = {"P000", "P003"}
+    repo.upsert_snapshots(
+        [_snapshot(pid, BUCKET, icra=0.3) for pid in sorted(in_bucket)]
+        + [_snapshot(pid, NEXT_BUCKET, icra=0.4) for pid in sorted(in_next)],
+        chunk_size=CHUNK_SIZE,
+    )
+
+    assert repo.get_point_ids_by_bucket(BUCKET) == in_bucket
+    assert repo.get_point_ids_by_bucket(NEXT_BUCKET) == in_next
+    assert repo.get_point_ids_by_bucket(NEXT_BUCKET + timedelta(hours=3)) == set()
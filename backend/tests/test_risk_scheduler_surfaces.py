@@ -0,0 +1,195 @@
+"""
+test_risk_scheduler_surfaces.py
+
+Geração de superfícies do bucket pelo scheduler (services/risk_scheduler.py):
+- _generate_surface_worker chamado direto: sessão própria, superfície
+  gravada, resumo com total/recomputed_cells
+- falha do município volta no resultado (o worker nunca propaga exceção)
+- _ensure_surfaces_for_bucket com pool "spawn" de 2 processos: uma
+  superfície por município com pontos, município sem pontos é pulado
+
+Este teste:
+- Usa SQLite em arquivo temporário (DATABASE_URL herdado pelos processos filhos)
+- Snapshots do bucket gravados direto (NÃO chama clima nem IA)
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import backend.app.models  # noqa: F401  (registra as tabelas no Base)
+from backend.app.database import Base
+from backend.app.models.municipality import Municipality
+from backend.app.models.point import Point
+from backend.app.models.risk_snapshot import RiskSnapshot
+from backend.app.models.risk_surface import RiskSurface
+from backend.app.repositories.risk_repository import RiskRepository
+from backend.app.services import risk_scheduler
+from backend.app.settings import settings
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+BUCKET = datetime(2026, 1, 10, 12, tzinfo=timezone.utc)
+N_POINTS = 12
+POOL_WORKERS = 2
+
+# (min_lat, min_lon, max_lat, max_lon) de cada recorte (~5 km)
+BBOXES = [
+    (-16.72, -49.30, -16.67, -49.25),
+    (-16.67, -49.25, -16.62, -49.20),
+]
+
+
+def _ring(bbox):
+    min_lat, min_lon, max_lat, max_lon = bbox
+    return [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+
+
+@pytest.fixture
+def db_url(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'scheduler.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    SessionTest = sessionmaker(bind=engine, expire_on_commit=False)
+
+    rng = np.random.default_rng(23)
+    with SessionTest() as db:
+        municipalities = [
+            Municipality(
+                name=f"Recorte {i}",
+                active=True,
+                geojson={"type": "Polygon", "coordinates": [_ring(bbox)]},
+                bbox_min_lat=bbox[0],
+                bbox_min_lon=bbox[1],
+                bbox_max_lat=bbox[2],
+                bbox_max_lon=bbox[3],
+            )
+            for i, bbox in enumerate(BBOXES)
+        ]
+        without_points = Municipality(
+            name="Sem pontos",
+            active=True,
+            geojson={"type": "Polygon", "coordinates": [_ring(BBOXES[0])]},
+            bbox_min_lat=BBOXES[0][0],
+            bbox_min_lon=BBOXES[0][1],
+            bbox_max_lat=BBOXES[0][2],
+            bbox_max_lon=BBOXES[0][3],
+        )
+        db.add_all(municipalities + [without_points])
+        db.commit()
+
+        snapshots = []
+        for municipality, (min_lat, min_lon, max_lat, max_lon) in zip(municipalities, BBOXES):
+            for j in range(N_POINTS):
+                point_id = f"M{municipality.id}P{j:03d}"
+                db.add(
+                    Point(
+                        id=point_id,
+                        name=point_id,
+                        municipality_id=municipality.id,
+                        latitude=float(rng.uniform(min_lat, max_lat)),
+                        longitude=float(rng.uniform(min_lon, max_lon)),
+                        active=True,
+                    )
+                )
+                icra = float(rng.uniform(0.0, 1.0))
+                snapshots.append(
+                    RiskSnapshot(
+                        point_id=point_id,
+                        snapshot_timestamp=BUCKET,
+                        icra=icra,
+                        icra_std=0.01,
+                        nivel_risco="Baixo" if icra < 0.5 else "Alto",
+                        confianca="Alta",
+                        chuva_dia=0.0,
+                        chuva_30d=0.0,
+                        chuva_90d=0.0,
+                        valid_until=BUCKET + timedelta(hours=3),
+                        source="scheduled",
+                    )
+                )
+        db.commit()
+        RiskRepository(db).upsert_snapshots(snapshots)
+
+    # worker no próprio processo usa a sessão de teste; filhos "spawn" leem DATABASE_URL
+    monkeypatch.setattr(risk_scheduler, "SessionLocal", SessionTest)
+    monkeypatch.setenv("DATABASE_URL", url)
+
+    yield {
+        "session": SessionTest,
+        "municipality_ids": [m.id for m in municipalities],
+        "without_points_id": without_points.id,
+    }
+    engine.dispose()
+
+
+def _surfaces(SessionTest):
+    with SessionTest() as db:
+        return {s.municipality_id: s for s in db.query(RiskSurface).all()}
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_worker_generates_and_saves_surface(db_url):
+    municipality_id = db_url["municipality_ids"][0]
+
+    result = risk_scheduler._generate_surface_worker(municipality_id, BUCKET, False)
+
+    assert result["ok"], result
+    assert result["municipality_id"] == municipality_id
+    assert result["total_cells"] > 0
+    assert result["recomputed_cells"] == result["total_cells"]
+
+    surfaces = _surfaces(db_url["session"])
+    assert set(surfaces) == {municipality_id}
+    assert surfaces[municipality_id].total_cells == result["total_cells"]
+    assert surfaces[municipality_id].raster is not None
+
+    # mesmo bucket, incremental: nenhum ponto mudou => nada a recalcular
+    again = risk_scheduler._generate_surface_worker(municipality_id, BUCKET, True)
+    assert again["ok"], again
+    assert again["total_cells"] == result["total_cells"]
+    assert again["recomputed_cells"] == 0
+    assert len(_surfaces(db_url["session"])) == 1
+
+
+def test_worker_returns_failure_instead_of_raising(db_url):
+    result = risk_scheduler._generate_surface_worker(db_url["without_points_id"], BUCKET, False)
+
+    assert result["ok"] is False
+    assert result["municipality_id"] == db_url["without_points_id"]
+    assert "RiskSurfaceServiceError" in result["error"]
+    assert _surfaces(db_url["session"]) == {}
+
+
+def test_bucket_surfaces_in_spawn_pool(db_url, monkeypatch):
+    monkeypatch.setattr(settings.SURFACE, "GENERATION_WORKERS", POOL_WORKERS)
+    monkeypatch.setattr(settings.SURFACE, "INCREMENTAL_RECOMPUTE", False)
+
+    scheduler = risk_scheduler.RiskScheduler()
+    try:
+        with db_url["session"]() as session:
+            scheduler._ensure_surfaces_for_bucket(
+                session=session,
+                repo=RiskRepository(session),
+                reference_ts=BUCKET,
+            )
+        assert scheduler._surface_pool is not None
+        assert scheduler._surface_pool._max_workers == POOL_WORKERS
+    finally:
+        scheduler.stop()
+
+    surfaces = _surfaces(db_url["session"])
+    assert set(surfaces) == set(db_url["municipality_ids"])
+    for surface in surfaces.values():
+        assert surface.total_cells > 0
+        assert surface.snapshot_timestamp.replace(tzinfo=timezone.utc) == BUCKET
+    assert scheduler._last_surface_reference_ts == BUCKET
@@ -0,0 +1,98 @@
+"""
+test_surface_grid.py
+
+Máscara dentro/fora do grid da superfície (services/surface_grid.py):
+- pack_mask/unpack_mask: ida e volta exata, inclusive com n_rows*n_cols
+  não múltiplo de 8
+- compute_grid_mask sem shapely (fallback por scanline) == com shapely,
+  para polígono com hole, MultiPolygon e polígono côncavo
+
+Este teste:
+- NÃO usa banco
+- Usa GridSpec.from_bbox na resolução padrão da superfície
+"""
+
+import numpy as np
+import pytest
+
+from backend.app.services import surface_grid
+from backend.app.services.surface_grid import GridSpec, compute_grid_mask, pack_mask, unpack_mask
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+RESOLUTION_M = 250
+BBOX = (-16.72, -49.30, -16.62, -49.20)  # (min_lat, min_lon, max_lat, max_lon)
+
+OUTER = [[-49.29, -16.71], [-49.21, -16.705], [-49.215, -16.63], [-49.285, -16.635], [-49.29, -16.71]]
+HOLE = [[-49.27, -16.69], [-49.23, -16.69], [-49.23, -16.65], [-49.27, -16.65], [-49.27, -16.69]]
+CONCAVE = [
+    [-49.295, -16.715], [-49.205, -16.715], [-49.205, -16.625], [-49.245, -16.625],
+    [-49.2505, -16.6703], [-49.258, -16.625], [-49.295, -16.625], [-49.295, -16.715],
+]
+
+GEOMETRIES = {
+    "polygon_with_hole": {"type": "Polygon", "coordinates": [OUTER, HOLE]},
+    "multipolygon": {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[-49.295, -16.715], [-49.275, -16.715], [-49.28, -16.63], [-49.295, -16.625], [-49.295, -16.715]]],
+            [
+                [[-49.265, -16.71], [-49.205, -16.71], [-49.21, -16.625], [-49.26, -16.63], [-49.265, -16.71]],
+                [[-49.25, -16.69], [-49.22, -16.69], [-49.22, -16.65], [-49.25, -16.65], [-49.25, -16.69]],
+            ],
+        ],
+    },
+    "concave": {"type": "Polygon", "coordinates": [CONCAVE]},
+}
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+@pytest.mark.parametrize("n_rows, n_cols", [(1, 1), (3, 5), (7, 9), (8, 8), (41, 37)])
+def test_pack_unpack_round_trip(n_rows, n_cols):
+    rng = np.random.default_rng(n_rows * 100 + n_cols)
+    for mask in (
+        rng.random((n_rows, n_cols)) < 0.5,
+        np.zeros((n_rows, n_cols), dtype=bool),
+        np.ones((n_rows, n_cols), dtype=bool),
+    ):
+        data = pack_mask(mask)
+
+        assert len(data) == -(-n_rows * n_cols // 8)
+        restored = unpack_mask(data, n_rows, n_cols)
+        assert restored.dtype == bool
+        assert restored.shape == (n_rows, n_cols)
+        assert np.array_equal(restored, mask)
+
+
+@pytest.mark.parametrize("name", sorted(GEOMETRIES))
+def test_scanline_fallback_matches_shapely(monkeypatch, name):
+    geometry = GEOMETRIES[name]
+    spec = GridSpec.from_bbox(BBOX, RESOLUTION_M)
+
+    with_shapely = compute_grid_mask(spec, geometry)
+
+    monkeypatch.setattr(surface_grid, "shapely", None)
+    fallback = compute_grid_mask(spec, geometry)
+
+    assert fallback.shape == with_shapely.shape == spec.shape
+    assert 0 < with_shapely.sum() < with_shapely.size
+    assert np.array_equal(fallback, with_shapely)
+
+
+def test_scanline_hole_excludes_cells():
+    spec = GridSpec.from_bbox(BBOX, RESOLUTION_M)
+    center_lats = spec.row_edges() + spec.step_lat / 2.0
+    center_lons = spec.col_edges() + spec.step_lon / 2.0
+
+    solid = surface_grid._scanline_mask(center_lats, center_lons, {"type": "Polygon", "coordinates": [OUTER]})
+    holed = surface_grid._scanline_mask(center_lats, center_lons, GEOMETRIES["polygon_with_hole"])
+    hole = surface_grid._scanline_mask(center_lats, center_lons, {"type": "Polygon", "coordinates": [HOLE]})
+
+    assert hole.any()
+    assert np.array_equal(holed, solid & ~hole)
@@ -0,0 +1,137 @@
+"""
+test_surface_incremental.py
+
+Equivalência do recálculo incremental da superfície (só as células no raio dos
+pontos cujo ICRA mudou) com o recálculo completo do mesmo bucket.
+
+Este teste:
+- NÃO usa banco (máscara do grid em memória)
+- NÃO depende de FastAPI
+- Usa RiskSurfaceService._generate_surface com entradas sintéticas
+"""
+
+from dataclasses import replace
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.app.services.risk_surface_service import RiskSurfaceService
+from backend.app.services.surface_raster import SurfaceRaster
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+N_POINTS = 150
+N_CHANGED = 3
+SNAPSHOT_TS = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# Recorte retangular (~38 km x 39 km) em torno de Goiânia
+MUNICIPALITY_RING = [
+    [-49.45, -16.85],
+    [-49.10, -16.85],
+    [-49.10, -16.50],
+    [-49.45, -16.50],
+    [-49.45, -16.85],
+]
+
+MAX_RISK_ABS_DIFF_EXACT = 1e-6  # risk_abs persistido em float32
+
+# Raio menor que o padrão (~10.95σ): os pontos alterados alcançam só parte do grid
+TRUNCATION_SIGMAS = 3.0
+
+
+class _MemoryGridMaskRepo:
+    def get_mask(self, **kwargs):
+        return None
+
+    def save_mask(self, mask):
+        return mask
+
+
+def _inputs(seed: int):
+    rng = np.random.default_rng(seed)
+    municipality = SimpleNamespace(
+        id=1,
+        active=True,
+        geojson={"type": "Polygon", "coordinates": [MUNICIPALITY_RING]},
+        updated_at=SNAPSHOT_TS,
+    )
+    points = [
+        SimpleNamespace(id=f"P{i:04d}", latitude=float(lat), longitude=float(lon))
+        for i, (lat, lon) in enumerate(
+            zip(rng.uniform(-16.80, -16.55, N_POINTS), rng.uniform(-49.40, -49.15, N_POINTS))
+        )
+    ]
+    snapshots = [
+        SimpleNamespace(point_id=p.id, icra=float(v))
+        for p, v in zip(points, rng.uniform(0.0, 1.0, N_POINTS))
+    ]
+    return municipality, points, snapshots
+
+
+def _next_bucket(snapshots, seed: int, noise: float):
+    """
+    Próximo bucket: ruído pequeno em todos os pontos e mudança grande em alguns.
+    """
+    rng = np.random.default_rng(seed)
+    icra = np.array([s.icra for s in snapshots])
+    icra = np.clip(icra + rng.uniform(-noise, noise, icra.size), 0.0, 1.0)
+    changed = rng.choice(icra.size, N_CHANGED, replace=False)
+    icra[changed] = rng.uniform(0.0, 1.0, N_CHANGED)
+    return [SimpleNamespace(point_id=s.point_id, icra=float(v)) for s, v in zip(snapshots, icra)]
+
+
+def _service(tolerance: float) -> RiskSurfaceService:
+    service = RiskSurfaceService(None, None, None, grid_mask_repo=_MemoryGridMaskRepo())
+    service.cfg = replace(
+        service.cfg,
+        incremental_icra_tolerance=tolerance,
+        kernel_truncation_sigmas=TRUNCATION_SIGMAS,
+    )
+    return service
+
+
+def _incremental_and_full(service: RiskSurfaceService, noise: float):
+    municipality, points, snapshots = _inputs(seed=31)
+    previous = service._generate_surface(municipality, points, snapshots, SNAPSHOT_TS, "auto")
+    following = _next_bucket(snapshots, seed=32, noise=noise)
+
+    incremental = service._generate_surface(
+        municipality, points, following, SNAPSHOT_TS, "auto", previous=previous
+    )
+    full = service._generate_surface(municipality, points, following, SNAPSHOT_TS, "auto")
+    return incremental, full
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_incremental_recompute_matches_full_recompute():
+    service = _service(tolerance=0.0)
+    incremental, full = _incremental_and_full(service, noise=0.0)
+
+    a = SurfaceRaster.decode(incremental.raster)
+    b = SurfaceRaster.decode(full.raster)
+    diff = np.abs(a.risk_abs.astype(float) - b.risk_abs.astype(float))
+
+    assert 0 < incremental.recomputed_cells < full.total_cells * 0.8
+    assert np.array_equal(a.cell_index, b.cell_index)
+    assert diff.max() < MAX_RISK_ABS_DIFF_EXACT
+    assert np.array_equal(a.level_abs, b.level_abs)
+
+
+def test_incremental_recompute_error_bounded_by_tolerance():
+    tolerance = 0.005
+    service = _service(tolerance=tolerance)
+    incremental, full = _incremental_and_full(service, noise=tolerance / 2.0)
+
+    a = SurfaceRaster.decode(incremental.raster)
+    b = SurfaceRaster.decode(full.raster)
+    diff = np.abs(a.risk_abs.astype(float) - b.risk_abs.astype(float))
+
+    assert incremental.recomputed_cells < full.total_cells
+    assert diff.max() <= tolerance + MAX_RISK_ABS_DIFF_EXACT
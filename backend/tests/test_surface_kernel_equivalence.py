@@ -0,0 +1,161 @@
+"""
+test_surface_kernel_equivalence.py
+
+Equivalência do kernel vetorizado com a implementação escalar original:
+- matriz esparsa (hash espacial + blocos) x kernel denso (todas as células x
+  todos os pontos, haversine por par, corte z = d²/(2σ²) > 60)
+- superfície gerada x fixture produzida pela implementação escalar original
+  (`_kernel_risk_at` célula a célula em `_generate_surface`), em
+  fixtures/surface_kernel_baseline.json
+
+Este teste:
+- NÃO usa banco (máscara do grid em memória)
+- NÃO depende de FastAPI
+"""
+
+import json
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.app.services.risk_surface_service import RiskSurfaceService
+from backend.app.services.surface_kernel import (
+    KERNEL_Z_MAX,
+    build_kernel_weight_matrix,
+    haversine_matrix_m,
+)
+from backend.app.services.surface_raster import RISK_LEVELS, SurfaceRaster
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+# Recorte do tamanho de Goiânia (~55 km de lado)
+CENTER_LAT = -16.68
+CENTER_LON = -49.25
+HALF_SPAN_DEG = 0.25
+
+MAX_RISK_ABS_DIFF = 1e-9
+
+BASELINE_FIXTURE = Path(__file__).parent / "fixtures" / "surface_kernel_baseline.json"
+MAX_BASELINE_DIFF = 1e-6  # risk_abs/risk_rel persistidos em float32
+
+
+class _MemoryGridMaskRepo:
+    def get_mask(self, **kwargs):
+        return None
+
+    def save_mask(self, mask):
+        return mask
+
+
+def _random_coords(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    lat = CENTER_LAT + rng.uniform(-HALF_SPAN_DEG, HALF_SPAN_DEG, n)
+    lon = CENTER_LON + rng.uniform(-HALF_SPAN_DEG, HALF_SPAN_DEG, n)
+    return lat, lon
+
+
+def _dense_reference(cell_lat, cell_lon, point_lat, point_lon, sigmas, icra):
+    """
+    Kernel denso: média ponderada por exp(-d²/(2σ²)) sobre todos os pontos;
+    células sem peso valem 0.0.
+    """
+    d = haversine_matrix_m(cell_lat, cell_lon, point_lat, point_lon)
+    z = d * d / (2.0 * sigmas[None, :] ** 2)
+    w = np.where(z <= KERNEL_Z_MAX, np.exp(-z), 0.0)
+
+    den = w.sum(axis=1)
+    num = w @ icra
+    risk = np.divide(num, den, out=np.zeros_like(num), where=den > 0.0)
+    return np.clip(risk, 0.0, 1.0)
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_sparse_kernel_matches_dense_haversine_kernel():
+    cell_lat, cell_lon = _random_coords(3000, seed=11)
+    point_lat, point_lon = _random_coords(150, seed=12)
+    sigmas = np.random.default_rng(13).uniform(180.0, 1200.0, point_lat.size)
+    icra = np.random.default_rng(14).uniform(0.0, 1.0, point_lat.size)
+
+    reference = _dense_reference(cell_lat, cell_lon, point_lat, point_lon, sigmas, icra)
+
+    # blocos pequenos de propósito: força vários chunks no caminho esparso
+    sparse = build_kernel_weight_matrix(
+        cell_lat,
+        cell_lon,
+        point_lat,
+        point_lon,
+        sigmas,
+        chunk_elements=20_000,
+    )
+
+    diff = np.abs(sparse.apply(icra) - reference)
+
+    assert diff.max() < MAX_RISK_ABS_DIFF
+
+
+def test_sparse_kernel_cells_without_weight_are_zero():
+    cell_lat, cell_lon = _random_coords(500, seed=21)
+    # um único ponto longe do recorte: nenhuma célula dentro do corte
+    point_lat = np.array([CENTER_LAT + 5.0])
+    point_lon = np.array([CENTER_LON + 5.0])
+    sigmas = np.array([500.0])
+
+    sparse = build_kernel_weight_matrix(cell_lat, cell_lon, point_lat, point_lon, sigmas)
+    reference = _dense_reference(cell_lat, cell_lon, point_lat, point_lon, sigmas, np.array([0.9]))
+
+    assert sparse.nnz == 0
+    assert np.array_equal(sparse.apply([0.9]), reference)
+
+
+def test_generated_surface_matches_scalar_baseline_fixture():
+    fixture = json.loads(BASELINE_FIXTURE.read_text(encoding="utf-8"))
+    snapshot_ts = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    municipality = SimpleNamespace(
+        id=1,
+        active=True,
+        geojson={"type": "Polygon", "coordinates": [fixture["municipality_ring"]]},
+        updated_at=snapshot_ts,
+    )
+    points = [
+        SimpleNamespace(id=point_id, latitude=lat, longitude=lon)
+        for point_id, lat, lon, _ in fixture["points"]
+    ]
+    snapshots = [
+        SimpleNamespace(point_id=point_id, icra=icra)
+        for point_id, _, _, icra in fixture["points"]
+    ]
+
+    # Mesmo referencial da implementação original: haversine, sem truncamento
+    service = RiskSurfaceService(None, None, None, grid_mask_repo=_MemoryGridMaskRepo())
+    service.cfg = replace(
+        service.cfg,
+        grid_resolution_m=fixture["grid_resolution_m"],
+        local_projection=False,
+        kernel_truncation_sigmas=None,
+    )
+    surface = service._generate_surface(municipality, points, snapshots, snapshot_ts, "auto")
+    raster = SurfaceRaster.decode(surface.raster)
+
+    assert surface.total_cells == fixture["total_cells"]
+    assert surface.kernel_sigma_m == fixture["kernel_sigma_m"]
+    assert surface.high_risk_area_m2 == fixture["high_risk_area_m2"]
+
+    baseline = {(round(c[0], 9), round(c[1], 9)): c for c in fixture["cells"]}
+    for i, ring in enumerate(raster.cell_polygons()):
+        min_lon, min_lat = ring[0]
+        expected = baseline[(round(min_lat, 9), round(min_lon, 9))]
+
+        assert abs(float(raster.risk_abs[i]) - expected[2]) < MAX_BASELINE_DIFF
+        assert abs(float(raster.risk_rel[i]) - expected[3]) < MAX_BASELINE_DIFF
+        assert RISK_LEVELS[raster.level_abs[i]] == expected[4]
+        assert RISK_LEVELS[raster.level_rel[i]] == expected[5]
@@ -0,0 +1,82 @@
+"""
+test_surface_projection.py
+
+Precisão do referencial métrico local (equiretangular) usado pelo motor de
+superfícies no lugar da haversine por par.
+
+Este teste:
+- NÃO usa banco
+- NÃO depende de FastAPI
+- Usa apenas o núcleo vetorizado (services/surface_kernel.py)
+"""
+
+import numpy as np
+
+from backend.app.services.surface_kernel import (
+    build_kernel_weight_matrix,
+    euclidean_matrix_m,
+    haversine_matrix_m,
+    local_projection_origin,
+    project_local_m,
+)
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+# Recorte do tamanho de Goiânia (~55 km de lado)
+CENTER_LAT = -16.68
+CENTER_LON = -49.25
+HALF_SPAN_DEG = 0.25
+
+MAX_RELATIVE_ERROR = 0.002  # 0,2%
+MAX_RISK_ABS_DIFF = 0.01
+
+
+def _random_coords(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    lat = CENTER_LAT + rng.uniform(-HALF_SPAN_DEG, HALF_SPAN_DEG, n)
+    lon = CENTER_LON + rng.uniform(-HALF_SPAN_DEG, HALF_SPAN_DEG, n)
+    return lat, lon
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_local_projection_distances_match_haversine():
+    lat, lon = _random_coords(300, seed=1)
+    origin = local_projection_origin(lat, lon)
+    x, y = project_local_m(lat, lon, origin)
+
+    local = euclidean_matrix_m(x, y, x, y)
+    reference = haversine_matrix_m(lat, lon, lat, lon)
+
+    far_enough = reference > 100.0
+    relative = np.abs(local[far_enough] - reference[far_enough]) / reference[far_enough]
+
+    print(f"\nerro relativo máximo: {relative.max():.6f}")
+    assert relative.max() < MAX_RELATIVE_ERROR
+
+
+def test_local_projection_kernel_matches_haversine_kernel():
+    cell_lat, cell_lon = _random_coords(2000, seed=2)
+    point_lat, point_lon = _random_coords(200, seed=3)
+    sigmas = np.random.default_rng(4).uniform(180.0, 1200.0, point_lat.size)
+    icra = np.random.default_rng(5).uniform(0.0, 1.0, point_lat.size)
+
+    reference = build_kernel_weight_matrix(cell_lat, cell_lon, point_lat, point_lon, sigmas)
+    local = build_kernel_weight_matrix(
+        cell_lat,
+        cell_lon,
+        point_lat,
+        point_lon,
+        sigmas,
+        projection_origin=local_projection_origin(cell_lat, cell_lon),
+    )
+
+    diff = np.abs(local.apply(icra) - reference.apply(icra))
+
+    print(f"\ndiferença máxima de risco por célula: {diff.max():.6f}")
+    assert diff.max() < MAX_RISK_ABS_DIFF
@@ -0,0 +1,156 @@
+"""
+test_surface_raster.py
+
+Formato raster da superfície (services/surface_raster.py):
+- v2: encode/decode preserva células e as entradas por ponto
+  (layout_digest, point_icra_abs/rel)
+- v1 (gravado antes das entradas por ponto) continua decodificável:
+  mesmas células/GeoJSON, sem entradas (has_inputs == False)
+- versão desconhecida ou payload corrompido => SurfaceRasterError
+
+Este teste:
+- NÃO usa banco
+- Superfície gerada por RiskSurfaceService._generate_surface (sem clima/IA)
+- Payload v1 montado à mão com o layout original do formato
+"""
+
+import io
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.app.models.municipality import Municipality
+from backend.app.services.risk_surface_service import RiskSurfaceService
+from backend.app.services.surface_raster import SurfaceRaster, SurfaceRasterError
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+BUCKET = datetime(2026, 1, 10, 12, tzinfo=timezone.utc)
+N_POINTS = 20
+RING = [[-49.30, -16.72], [-49.20, -16.72], [-49.20, -16.62], [-49.30, -16.62], [-49.30, -16.72]]
+
+
+class _MemoryGridMaskRepo:
+    def get_mask(self, **kwargs):
+        return None
+
+    def save_mask(self, mask):
+        return mask
+
+
+@pytest.fixture(scope="module")
+def raster() -> SurfaceRaster:
+    municipality = Municipality(
+        id=1,
+        name="Recorte",
+        active=True,
+        geojson={"type": "Polygon", "coordinates": [RING]},
+        bbox_min_lat=-16.72,
+        bbox_min_lon=-49.30,
+        bbox_max_lat=-16.62,
+        bbox_max_lon=-49.20,
+    )
+    rng = np.random.default_rng(11)
+    points = [
+        SimpleNamespace(id=f"P{i:03d}", latitude=float(lat), longitude=float(lon))
+        for i, (lat, lon) in enumerate(zip(rng.uniform(-16.71, -16.63, N_POINTS), rng.uniform(-49.29, -49.21, N_POINTS)))
+    ]
+    snapshots = [SimpleNamespace(point_id=p.id, icra=float(v)) for p, v in zip(points, rng.uniform(0.0, 1.0, N_POINTS))]
+
+    service = RiskSurfaceService(None, None, None, grid_mask_repo=_MemoryGridMaskRepo())
+    surface = service._generate_surface(municipality, points, snapshots, BUCKET, "scheduled")
+    return SurfaceRaster.decode(surface.raster)
+
+
+def _encode(raster: SurfaceRaster, version: int, with_inputs: bool) -> bytes:
+    """Payload montado à mão: layout v1 sem `with_inputs`; `version` permite forjar o cabeçalho."""
+    extra = {}
+    if with_inputs:
+        extra = {
+            "layout_digest": np.array([raster.layout_digest]),
+            "point_icra_abs": raster.point_icra_abs,
+            "point_icra_rel": raster.point_icra_rel,
+        }
+
+    spec = raster.spec
+    buf = io.BytesIO()
+    np.savez_compressed(
+        buf,
+        version=np.array([version], dtype=np.int32),
+        spec=np.array(
+            [spec.min_lat, spec.min_lon, spec.max_lat, spec.max_lon, spec.step_lat, spec.step_lon],
+            dtype=np.float64,
+        ),
+        shape=np.array([raster.n_rows, raster.n_cols, raster.grid_resolution_m], dtype=np.int64),
+        cell_index=raster.cell_index,
+        risk_abs=raster.risk_abs,
+        risk_rel=raster.risk_rel,
+        color_value=raster.color_value,
+        level_abs=raster.level_abs,
+        level_rel=raster.level_rel,
+        **extra,
+    )
+    return buf.getvalue()
+
+
+def _assert_same_cells(a: SurfaceRaster, b: SurfaceRaster) -> None:
+    assert a.spec == b.spec
+    assert (a.n_rows, a.n_cols, a.grid_resolution_m) == (b.n_rows, b.n_cols, b.grid_resolution_m)
+    for name in ("cell_index", "risk_abs", "risk_rel", "color_value", "level_abs", "level_rel"):
+        assert np.array_equal(getattr(a, name), getattr(b, name)), name
+        assert getattr(a, name).dtype == getattr(b, name).dtype, name
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+def test_v2_round_trip_keeps_point_inputs(raster):
+    assert raster.has_inputs
+    assert raster.total_cells > 0
+
+    decoded = SurfaceRaster.decode(raster.encode())
+
+    _assert_same_cells(decoded, raster)
+    assert decoded.has_inputs
+    assert decoded.layout_digest == raster.layout_digest
+    assert np.array_equal(decoded.point_icra_abs, raster.point_icra_abs)
+    assert np.array_equal(decoded.point_icra_rel, raster.point_icra_rel)
+
+
+def test_v1_payload_decodes_without_inputs(raster):
+    decoded = SurfaceRaster.decode(_encode(raster, version=1, with_inputs=False))
+
+    _assert_same_cells(decoded, raster)
+    assert not decoded.has_inputs
+    assert decoded.layout_digest == ""
+    assert decoded.point_icra_abs is None and decoded.point_icra_rel is None
+    assert decoded.to_geojson() == raster.to_geojson()
+
+    # regravado no formato atual continua sem entradas
+    reencoded = SurfaceRaster.decode(decoded.encode())
+    _assert_same_cells(reencoded, raster)
+    assert not reencoded.has_inputs
+
+
+def test_hand_built_v2_matches_encoder(raster):
+    decoded = SurfaceRaster.decode(_encode(raster, version=2, with_inputs=True))
+
+    _assert_same_cells(decoded, raster)
+    assert decoded.has_inputs
+
+
+@pytest.mark.parametrize("version", [0, 3])
+def test_unsupported_version_is_rejected(raster, version):
+    with pytest.raises(SurfaceRasterError, match=str(version)):
+        SurfaceRaster.decode(_encode(raster, version=version, with_inputs=False))
+
+
+def test_corrupted_payload_is_rejected(raster):
+    with pytest.raises(SurfaceRasterError):
+        SurfaceRaster.decode(raster.encode()[:64])
@@ -0,0 +1,332 @@
+"""
+test_surface_routes.py
+
+Rotas de leitura da superfície persistida (routes/surface.py):
+- tiles: PNG só colorido dentro do grid do município, tiles vazios
+  transparentes, z/x/y inválidos => 400
+- isobands: cada nível é exatamente a união das células do GeoJSON daquele nível
+- diff: aliases `from`/`to`, bucket anterior por padrão e tolerância
+
+Este teste:
+- Usa SQLite em arquivo temporário (get_db sobrescrito)
+- Superfícies geradas por RiskSurfaceService._generate_surface (sem clima/IA)
+- Usa apenas o router de superfície em uma aplicação FastAPI mínima
+"""
+
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from math import asinh, floor, pi, radians, tan
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import shapely
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from shapely.geometry import Polygon, shape
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import backend.app.models  # noqa: F401  (registra as tabelas no Base)
+from backend.app.database import Base, get_db
+from backend.app.models.municipality import Municipality
+from backend.app.models.risk_surface import RiskSurface
+from backend.app.routes.surface import router
+from backend.app.services.risk_surface_service import RiskSurfaceService
+from backend.app.services.surface_raster import RISK_LEVELS, SurfaceRaster
+from backend.app.services.surface_tiles import MAX_ZOOM, TILE_SIZE
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+BUCKET_FROM = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+BUCKET_TO = BUCKET_FROM + timedelta(hours=3)
+
+# Recorte retangular (~11 km) em torno de Goiânia
+RING = [
+    [-49.30, -16.72],
+    [-49.20, -16.72],
+    [-49.20, -16.62],
+    [-49.30, -16.62],
+    [-49.30, -16.72],
+]
+N_POINTS = 30
+TILE_ZOOM = 12
+MAX_ISOBAND_AREA_DIFF = 1e-3  # fração da área: só as frestas entre células da mesma linha
+
+
+class _MemoryGridMaskRepo:
+    def get_mask(self, **kwargs):
+        return None
+
+    def save_mask(self, mask):
+        return mask
+
+
+def _icras(seed: int):
+    return np.random.default_rng(seed).uniform(0.0, 1.0, N_POINTS)
+
+
+@pytest.fixture
+def env(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'surface.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    SessionTest = sessionmaker(bind=engine, expire_on_commit=False)
+
+    rng = np.random.default_rng(5)
+    points = [
+        SimpleNamespace(id=f"P{i:03d}", latitude=float(lat), longitude=float(lon))
+        for i, (lat, lon) in enumerate(zip(rng.uniform(-16.71, -16.63, N_POINTS), rng.uniform(-49.29, -49.21, N_POINTS)))
+    ]
+
+    with SessionTest() as db:
+        municipality = Municipality(
+            name="Recorte",
+            active=True,
+            geojson={"type": "Polygon", "coordinates": [RING]},
+            bbox_min_lat=-16.72,
+            bbox_min_lon=-49.30,
+            bbox_max_lat=-16.62,
+            bbox_max_lon=-49.20,
+        )
+        empty = Municipality(
+            name="Sem superfície",
+            active=True,
+            geojson={"type": "Polygon", "coordinates": [RING]},
+            bbox_min_lat=-16.72,
+            bbox_min_lon=-49.30,
+            bbox_max_lat=-16.62,
+            bbox_max_lon=-49.20,
+        )
+        db.add_all([municipality, empty])
+        db.commit()
+
+        service = RiskSurfaceService(None, None, None, grid_mask_repo=_MemoryGridMaskRepo())
+        for bucket, seed in ((BUCKET_FROM, 1), (BUCKET_TO, 2)):
+            snapshots = [SimpleNamespace(point_id=p.id, icra=float(v)) for p, v in zip(points, _icras(seed))]
+            db.add(service._generate_surface(municipality, points, snapshots, bucket, "scheduled"))
+        db.commit()
+
+    def _get_db():
+        with SessionTest() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = _get_db
+
+    return SimpleNamespace(
+        client=TestClient(app),
+        municipality_id=municipality.id,
+        empty_id=empty.id,
+        session=SessionTest,
+    )
+
+
+def _raster(env, bucket: datetime) -> SurfaceRaster:
+    with env.session() as db:
+        surface = (
+            db.query(RiskSurface)
+            .filter(RiskSurface.municipality_id == env.municipality_id)
+            .filter(RiskSurface.snapshot_timestamp == bucket)
+            .one()
+        )
+        return SurfaceRaster.decode(surface.raster)
+
+
+def _tile_of(lat: float, lon: float, z: int):
+    n = 2 ** z
+    x = int(floor((lon + 180.0) / 360.0 * n))
+    y = int(floor((1.0 - asinh(tan(radians(lat))) / pi) / 2.0 * n))
+    return x, y
+
+
+def _decode_png_rgba(png: bytes) -> np.ndarray:
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, idat, width, height = 8, b"", 0, 0
+    while pos < len(png):
+        (length,) = struct.unpack(">I", png[pos:pos + 4])
+        tag = png[pos + 4:pos + 8]
+        data = png[pos + 8:pos + 8 + length]
+        if tag == b"IHDR":
+            width, height = struct.unpack(">II", data[:8])
+        elif tag == b"IDAT":
+            idat += data
+        pos += 12 + length
+    raw = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(height, width * 4 + 1)
+    return raw[:, 1:].reshape(height, width, 4)
+
+
+def _pixel_centers(z: int, x: int, y: int):
+    n = float(2 ** z)
+    offsets = (np.arange(TILE_SIZE, dtype=float) + 0.5) / TILE_SIZE
+    lons = (x + offsets) / n * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(pi * (1.0 - 2.0 * (y + offsets) / n))))
+    return lats, lons
+
+
+# =====================================================
+# TESTES — TILES
+# =====================================================
+
+def test_tile_is_colored_only_inside_the_surface_grid(env):
+    x, y = _tile_of(-16.67, -49.25, TILE_ZOOM)
+
+    response = env.client.get(
+        f"/surface/{env.municipality_id}/tiles/{TILE_ZOOM}/{x}/{y}",
+        params={"reference_ts": BUCKET_TO.isoformat()},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["x-surface-reference-ts"].startswith("2026-01-10T12:00:00")
+
+    rgba = _decode_png_rgba(response.content)
+    assert rgba.shape == (TILE_SIZE, TILE_SIZE, 4)
+
+    raster = _raster(env, BUCKET_TO)
+    spec = raster.spec
+    lats, lons = _pixel_centers(TILE_ZOOM, x, y)
+    in_lat = (lats >= spec.min_lat) & (lats < spec.min_lat + raster.n_rows * spec.step_lat)
+    in_lon = (lons >= spec.min_lon) & (lons < spec.min_lon + raster.n_cols * spec.step_lon)
+    in_grid = in_lat[:, None] & in_lon[None, :]
+
+    colored = rgba[:, :, 3] > 0
+    assert colored.any()
+    assert not (colored & ~in_grid).any()
+
+
+def test_tile_outside_the_surface_is_transparent(env):
+    x, y = _tile_of(48.85, 2.35, TILE_ZOOM)  # longe do município
+
+    response = env.client.get(f"/surface/{env.municipality_id}/tiles/{TILE_ZOOM}/{x}/{y}")
+
+    assert response.status_code == 200
+    assert not _decode_png_rgba(response.content)[:, :, 3].any()
+
+
+@pytest.mark.parametrize(
+    "z, x, y",
+    [
+        (MAX_ZOOM + 1, 0, 0),
+        (-1, 0, 0),
+        (3, 8, 0),
+        (3, 0, 8),
+        (3, -1, 0),
+    ],
+)
+def test_invalid_tile_is_rejected(env, z, x, y):
+    response = env.client.get(f"/surface/{env.municipality_id}/tiles/{z}/{x}/{y}")
+
+    assert response.status_code == 400
+
+
+def test_tile_without_surface_is_not_found(env):
+    x, y = _tile_of(-16.67, -49.25, TILE_ZOOM)
+
+    response = env.client.get(f"/surface/{env.empty_id}/tiles/{TILE_ZOOM}/{x}/{y}")
+
+    assert response.status_code == 404
+
+
+# =====================================================
+# TESTES — ISOBANDAS
+# =====================================================
+
+@pytest.mark.parametrize("basis", ["absolute", "relative"])
+def test_isobands_are_the_union_of_same_level_cells(env, basis):
+    response = env.client.get(f"/surface/{env.municipality_id}/isobands", params={"basis": basis})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["basis"] == basis
+
+    raster = _raster(env, BUCKET_TO)
+    levels = raster.level_abs if basis == "absolute" else raster.level_rel
+    polygons = raster.cell_polygons()
+
+    features = body["geojson"]["features"]
+    assert sum(f["properties"]["cells"] for f in features) == raster.total_cells
+    assert [f["properties"]["risk_level_code"] for f in features] == sorted(set(levels.tolist()))
+
+    for feature in features:
+        code = feature["properties"]["risk_level_code"]
+        assert feature["properties"]["risk_level"] == RISK_LEVELS[code]
+
+        cells = shapely.union_all([Polygon(polygons[i]) for i in np.flatnonzero(levels == code)])
+        band = shape(feature["geometry"])
+
+        # bordas externas coincidem com as das células do GeoJSON
+        assert band.bounds == pytest.approx(cells.bounds, abs=1e-12)
+        assert band.symmetric_difference(cells).area <= MAX_ISOBAND_AREA_DIFF * cells.area
+
+
+def test_isobands_reject_invalid_basis(env):
+    response = env.client.get(f"/surface/{env.municipality_id}/isobands", params={"basis": "median"})
+
+    assert response.status_code == 400
+
+
+# =====================================================
+# TESTES — DIFF
+# =====================================================
+
+def test_diff_accepts_from_and_to_aliases(env):
+    explicit = env.client.get(
+        f"/surface/{env.municipality_id}/diff",
+        params={"from": BUCKET_FROM.isoformat(), "to": BUCKET_TO.isoformat()},
+    )
+    default = env.client.get(f"/surface/{env.municipality_id}/diff")
+    only_to = env.client.get(f"/surface/{env.municipality_id}/diff", params={"to": BUCKET_TO.isoformat()})
+
+    assert explicit.status_code == default.status_code == only_to.status_code == 200
+
+    body = explicit.json()
+    assert body["from_ts"].startswith("2026-01-10T09:00:00")
+    assert body["to_ts"].startswith("2026-01-10T12:00:00")
+    assert body["stats"]["compared_cells"] > 0
+
+    # sem `from`: bucket anterior ao `to` (ou à superfície mais recente)
+    assert default.json() == body
+    assert only_to.json() == body
+
+
+def test_diff_tolerance_filters_cells(env):
+    def _diff(tolerance: float):
+        response = env.client.get(
+            f"/surface/{env.municipality_id}/diff",
+            params={"from": BUCKET_FROM.isoformat(), "tolerance": tolerance},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    loose, strict = _diff(0.0), _diff(0.1)
+
+    assert strict["stats"]["tolerance"] == 0.1
+    assert 0 < strict["stats"]["changed_cells"] < loose["stats"]["changed_cells"]
+    assert len(strict["geojson"]["features"]) == strict["stats"]["changed_cells"]
+
+    for feature in strict["geojson"]["features"]:
+        props = feature["properties"]
+        assert abs(props["delta"]) > 0.1 or props["risk_level_from"] != props["risk_level_to"]
+
+
+def test_diff_rejects_out_of_range_tolerance(env):
+    response = env.client.get(f"/surface/{env.municipality_id}/diff", params={"tolerance": 1.5})
+
+    assert response.status_code == 422
+
+
+def test_diff_with_unknown_from_bucket_is_not_found(env):
+    response = env.client.get(
+        f"/surface/{env.municipality_id}/diff",
+        params={"from": (BUCKET_FROM - timedelta(days=1)).isoformat()},
+    )
+
+    assert response.status_code == 404
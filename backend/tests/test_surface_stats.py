@@ -0,0 +1,173 @@
+"""
+test_surface_stats.py
+
+Estatísticas persistidas da superfície (services/surface_stats.py) no
+TerritorialMetricsService._aggregate_surface:
+- caminho rápido (risk_surfaces.stats) == agregação célula a célula do
+  GeoJSON materializado, para a mesma máscara de grid
+- vale para vários thresholds de alto risco (busca binária x laço)
+- stats ausente/corrompido => cai para o GeoJSON
+
+Este teste:
+- NÃO usa banco (repositórios de máscara falsos)
+- Superfície gerada por RiskSurfaceService._generate_surface (sem clima/IA)
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.app.analytics.territorial_metrics_service import TerritorialMetricsService
+from backend.app.models.municipality import Municipality
+from backend.app.services.risk_surface_service import RiskSurfaceService
+from backend.app.services.surface_stats import SurfaceStats
+
+
+# =====================================================
+# CONFIGURAÇÕES DO TESTE
+# =====================================================
+
+BUCKET = datetime(2026, 1, 10, 12, tzinfo=timezone.utc)
+N_POINTS = 25
+
+# Polígono irregular: células de borda entram/saem pela máscara
+RING = [
+    [-49.30, -16.72],
+    [-49.22, -16.71],
+    [-49.20, -16.66],
+    [-49.24, -16.62],
+    [-49.27, -16.65],
+    [-49.30, -16.63],
+    [-49.30, -16.72],
+]
+THRESHOLDS = [0.0, 0.3, 0.5, 0.7, 0.95, 1.0]
+REL_TOL = 1e-6  # shoelace em UTM x área do shapely: só ruído de ponto flutuante
+
+
+class _MemoryGridMaskRepo:
+    def get_mask(self, **kwargs):
+        return None
+
+    def save_mask(self, mask):
+        return mask
+
+
+class _CurrentGridMaskRepo:
+    """Máscara vigente com a mesma quantidade de células da superfície."""
+
+    def __init__(self, inside_cells: int) -> None:
+        self.inside_cells = inside_cells
+
+    def get_mask(self, **kwargs):
+        return SimpleNamespace(inside_cells=self.inside_cells)
+
+
+@pytest.fixture(scope="module")
+def generated():
+    municipality = Municipality(
+        id=1,
+        name="Recorte",
+        active=True,
+        geojson={"type": "Polygon", "coordinates": [RING]},
+        bbox_min_lat=-16.72,
+        bbox_min_lon=-49.30,
+        bbox_max_lat=-16.62,
+        bbox_max_lon=-49.20,
+        updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    rng = np.random.default_rng(17)
+    points = [
+        SimpleNamespace(id=f"P{i:03d}", latitude=float(lat), longitude=float(lon))
+        for i, (lat, lon) in enumerate(zip(rng.uniform(-16.71, -16.63, N_POINTS), rng.uniform(-49.29, -49.21, N_POINTS)))
+    ]
+    snapshots = [SimpleNamespace(point_id=p.id, icra=float(v)) for p, v in zip(points, rng.uniform(0.0, 1.0, N_POINTS))]
+
+    service = RiskSurfaceService(None, None, None, grid_mask_repo=_MemoryGridMaskRepo())
+    surface = service._generate_surface(municipality, points, snapshots, BUCKET, "scheduled")
+    assert surface.stats is not None
+    return municipality, surface
+
+
+def _metrics_service(surface, threshold: float) -> TerritorialMetricsService:
+    service = TerritorialMetricsService(None, high_risk_threshold=threshold)
+    service.grid_masks = _CurrentGridMaskRepo(int(surface.total_cells))
+    return service
+
+
+def _without_stats(surface, stats=None):
+    """Mesma superfície com `stats` trocado (None => caminho do GeoJSON)."""
+    return SimpleNamespace(
+        snapshot_timestamp=surface.snapshot_timestamp,
+        grid_resolution_m=surface.grid_resolution_m,
+        total_cells=surface.total_cells,
+        geojson=surface.geojson,
+        raster=surface.raster,
+        stats=stats,
+    )
+
+
+# =====================================================
+# TESTES
+# =====================================================
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_stats_path_matches_geojson_aggregation(generated, threshold):
+    municipality, surface = generated
+
+    fast = _metrics_service(surface, threshold)._aggregate_surface(municipality, surface)
+    slow = _metrics_service(surface, threshold)._aggregate_surface(municipality, _without_stats(surface))
+
+    assert fast.method == "surface_stats"
+    assert slow.method == "grid_mask"
+
+    assert fast.total_cells == slow.total_cells == surface.total_cells
+    assert fast.used_cells == slow.used_cells
+    assert fast.high_risk_cells == slow.high_risk_cells
+    assert fast.total_area_m2 == pytest.approx(slow.total_area_m2, rel=REL_TOL)
+    assert fast.high_risk_area_m2 == pytest.approx(slow.high_risk_area_m2, rel=REL_TOL, abs=1e-6)
+    assert fast.cell_area_m2 == pytest.approx(slow.cell_area_m2, rel=REL_TOL)
+    assert fast.icra_values == pytest.approx(sorted(slow.icra_values), abs=1e-6)
+
+
+def test_summary_from_stats_matches_geojson(generated):
+    municipality, surface = generated
+    service = _metrics_service(surface, 0.7)
+
+    summaries = []
+    for s in (surface, _without_stats(surface)):
+        agg = service._aggregate_surface(municipality, s)
+        summaries.append(
+            service._build_surface_summary(
+                icra_values=agg.icra_values,
+                total_area_m2=agg.total_area_m2,
+                high_risk_area_m2=agg.high_risk_area_m2,
+                total_cells=agg.used_cells,
+                high_risk_cells=agg.high_risk_cells,
+            )
+        )
+
+    fast, slow = summaries
+    assert fast.keys() == slow.keys()
+    for key, value in slow.items():
+        assert fast[key] == pytest.approx(value, rel=1e-6, abs=1e-6), key
+
+
+def test_corrupted_stats_fall_back_to_geojson(generated):
+    municipality, surface = generated
+    service = _metrics_service(surface, 0.7)
+
+    agg = service._aggregate_surface(municipality, _without_stats(surface, stats=b"not-a-stats-payload"))
+
+    assert agg.method == "grid_mask"
+    assert agg.used_cells == surface.total_cells
+
+
+def test_stats_cells_follow_the_raster(generated):
+    _, surface = generated
+    stats = SurfaceStats.decode(surface.stats)
+
+    assert stats.total_cells == surface.total_cells
+    assert np.all(np.diff(stats.icra_sorted) >= 0)
+    assert int(stats.level_counts_abs.sum()) == int(stats.level_counts_rel.sum()) == surface.total_cells